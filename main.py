@@ -27,7 +27,9 @@ if __name__ == "__main__":
         resume_content = file.read()
 
     # Initialize and run the pipeline
-    resume_dct = process_resume_pipeline(resume_content, country="Singapore")
+    resume_dct = process_resume_pipeline(
+        resume_content, country="Singapore", use_cache=True
+    )
     # write the results to markdown files
     for k, v in resume_dct.items():
         os.makedirs(f"results/{curr_time}", exist_ok=True)
@@ -40,6 +42,7 @@ if __name__ == "__main__":
         job_description=job_description,
         embedding_type="huggingface",
         embedding_model_name="sentence-transformers/all-MiniLM-L6-v2",
+        use_cache=True,
     )
     # wandb.log(final_resume)
 
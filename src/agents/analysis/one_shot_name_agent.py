@@ -1,12 +1,21 @@
-from typing import Dict, List
-from langchain.prompts import PromptTemplate
+from typing import Dict, List, Optional
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
 
 from src.agents.base_agent import BaseAgent
-from src.prompts import ETHNICITY_PROMPT, GENDER_PROMPT
-from src.config.config import DEFAULT_MODEL
+from src.prompts import (
+    ETHNICITY_SYSTEM_PROMPT,
+    GENDER_SYSTEM_PROMPT,
+    NAME_INPUT_USER_PROMPT,
+    chat_prompt,
+)
+from src.config.config import (
+    DEFAULT_MODEL,
+    NAME_LABEL_SAMPLE,
+    NAME_LABEL_SAMPLES_PER_NAME,
+)
 from src.models.get_model import get_model
+from src.utils.name_label_table import NameLabelTable, normalize_name
 
 
 class OneShotNameAgent(BaseAgent):
@@ -14,28 +23,61 @@ class OneShotNameAgent(BaseAgent):
     An agent that extracts either ethnicity or gender from a name using a one-shot prompt.
 
     The agent can be initialized to use either the ethnicity prompt or the gender prompt.
+    Generated labels are counted per normalized name (case and whitespace
+    folded) in a label table. A name keeps being sent to the LLM, once per
+    resume, until the table holds `samples_per_name` labels for it; after
+    that, its resumes get a label from the stored counts (sampled, or the
+    most common one) without an LLM call.
     """
 
-    def __init__(self, mode: str = "ethnicity"):
+    def __init__(
+        self,
+        mode: str = "ethnicity",
+        label_table: Optional[NameLabelTable] = None,
+        sample: bool = NAME_LABEL_SAMPLE,
+        samples_per_name: int = NAME_LABEL_SAMPLES_PER_NAME,
+    ):
         """
         Initialize the OneShotNameAgent.
 
         Args:
             mode: Either "ethnicity" or "gender" to select the prompt.
+            label_table: Optional persistent name -> label table to reuse and
+                         extend (default: a table kept in memory by the agent)
+            sample: Whether names with enough stored labels get a label
+                    sampled (deterministically per resume) from their label
+                    counts instead of the most common label
+            samples_per_name: Number of LLM labels collected per name before
+                              the stored counts are used instead
         """
         super().__init__()
+        self.mode = mode
+        self.label_table = (
+            label_table if label_table is not None else NameLabelTable(path=None)
+        )
+        self.sample = sample
+        self.samples_per_name = samples_per_name
         self.llm = get_model(
             DEFAULT_MODEL,
             temperature=0.9,  # Use a high temperature for creativity
         )
         if mode == "ethnicity":
-            self.prompt_template = PromptTemplate.from_template(ETHNICITY_PROMPT)
+            self.prompt_template = chat_prompt(
+                ETHNICITY_SYSTEM_PROMPT, NAME_INPUT_USER_PROMPT
+            )
         elif mode == "gender":
-            self.prompt_template = PromptTemplate.from_template(GENDER_PROMPT)
+            self.prompt_template = chat_prompt(
+                GENDER_SYSTEM_PROMPT, NAME_INPUT_USER_PROMPT
+            )
         else:
             raise ValueError("mode must be either 'ethnicity' or 'gender'")
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
 
+    def _missing_samples(self, name: str) -> int:
+        """Number of LLM labels still to collect for a name."""
+        stored = sum(self.label_table.counts(self.mode, name).values())
+        return max(0, self.samples_per_name - stored)
+
     def run(self, name: str) -> str:
         """
         Extract information from the name.
@@ -47,11 +89,13 @@ class OneShotNameAgent(BaseAgent):
             The extracted information (ethnicity or gender)
         """
         try:
-            self.logger.debug(
-                f"Running extraction with prompt: {self.prompt_template.template[:30]}..."
-            )
+            if not self._missing_samples(name):
+                return self.label_table.lookup(self.mode, name, sample=self.sample)
+            self.logger.debug(f"Running {self.mode} extraction.")
             input_data = {"name": name}
             result = self.chain.invoke(input_data)
+            self.label_table.add(self.mode, name, result)
+            self.label_table.save()
             self.logger.info("Extraction completed.")
             return result
         except Exception as e:
@@ -62,6 +106,10 @@ class OneShotNameAgent(BaseAgent):
         """
         Process multiple names in batch.
 
+        Every resume of a name that still lacks labels gets its own LLM call,
+        up to the number of labels missing for that name; the other resumes
+        get a label from the stored counts.
+
         Args:
             names: List of dictionaries containing resume_id and name
 
@@ -71,14 +119,45 @@ class OneShotNameAgent(BaseAgent):
         results = []
         try:
             self.logger.debug(f"Processing batch of {len(names)} names.")
-            batch_inputs = [{"name": item["name"]} for item in names]
-            batch_outputs = self.chain.batch(batch_inputs)
+            # Positions of the resumes of every normalized name
+            groups: Dict[str, List[int]] = {}
+            for idx, item in enumerate(names):
+                groups.setdefault(normalize_name(item["name"]), []).append(idx)
+            # Positions of the resumes whose name is sent to the LLM
+            pending = [
+                idx
+                for positions in groups.values()
+                for idx in positions[
+                    : self._missing_samples(names[positions[0]]["name"])
+                ]
+            ]
+            self.logger.info(
+                f"Labelling {len(pending)} names for {len(names)} resumes "
+                f"({len(groups)} unique names)."
+            )
+            batch_inputs = [{"name": names[idx]["name"]} for idx in pending]
+            batch_outputs = self.chain.batch(batch_inputs) if batch_inputs else []
+            generated = dict(zip(pending, batch_outputs))
+            for idx, label in generated.items():
+                self.label_table.add(self.mode, names[idx]["name"], label)
+            if generated:
+                self.label_table.save()
+
             for idx, item in enumerate(names):
+                if idx in generated:
+                    extracted = generated[idx]
+                else:
+                    extracted = self.label_table.lookup(
+                        self.mode,
+                        item["name"],
+                        sample=self.sample,
+                        key=str(item["resume_id"]),
+                    )
                 results.append(
                     {
                         "resume_id": item["resume_id"],
                         "name": item["name"],
-                        "extracted": batch_outputs[idx],
+                        "extracted": extracted,
                     }
                 )
             self.logger.info("Batch extraction completed.")
@@ -1,85 +1,222 @@
-from typing import Dict, List
-from langchain.prompts import PromptTemplate
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
+from langchain_core.utils.json import parse_json_markdown
 
 from src.agents.base_agent import BaseAgent
-from src.prompts import NAME_PROMPT, AGE_PROMPT, WORK_EXPERIENCE_PROMPT
+from src.prompts import (
+    NAME_SYSTEM_PROMPT,
+    NAME_USER_PROMPT,
+    AGE_SYSTEM_PROMPT,
+    WORK_EXPERIENCE_SYSTEM_PROMPT,
+    RESUME_INPUT_USER_PROMPT,
+    COMBINED_ATTRIBUTE_FIELDS,
+    COMBINED_SYSTEM_PROMPT,
+    chat_prompt,
+)
 from src.config.config import DEFAULT_MODEL
 from src.models.get_model import get_model
 
+RESUME_ATTRIBUTES = ("name", "age", "work_experience")
+AGE_RANGES = ("18-24", "25-34", "35-44", "45-54", "55-64", "65+")
+WORK_EXPERIENCE_FIELDS = ("company", "position", "start_date", "end_date")
+
+
+def _coerce_attribute(attribute: str, value: Any) -> Any:
+    """Convert an extracted value to the type of its attribute (None if invalid)."""
+    if attribute == "work_experience":
+        if isinstance(value, dict):
+            value = [value]
+        if not isinstance(value, list):
+            return []
+        return [
+            {field: item.get(field) for field in WORK_EXPERIENCE_FIELDS}
+            for item in value
+            if isinstance(item, dict)
+        ]
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    if attribute == "age" and value not in AGE_RANGES:
+        return None
+    return value
+
 
 class OneShotResumeAgent(BaseAgent):
     """
     An agent that extracts either name or age from resumes using a one-shot prompt.
 
     The agent can be initialized to use either the name prompt or the age prompt.
+    In "combined" mode, several attributes are returned by a single call as
+    a dictionary of typed fields: name and age as strings (or None) and
+    work_experience as a list of dictionaries.
     """
 
-    def __init__(self, mode: str = "name"):
+    def __init__(
+        self, mode: str = "name", attributes: Sequence[str] = RESUME_ATTRIBUTES
+    ):
         """
         Initialize the OneShotResumeAgent.
 
         Args:
-            mode: Either "name", "age", or "work_experience" to select the prompt.
+            mode: Either "name", "age", "work_experience" or "combined" to
+                  select the prompt.
+            attributes: Default attributes extracted in "combined" mode
         """
         super().__init__()
         self.llm = get_model(DEFAULT_MODEL)
-        if mode == "name":
-            self.prompt_template = PromptTemplate.from_template(NAME_PROMPT)
+        self.mode = mode
+        self._combined_chains: Dict[Tuple[str, ...], Runnable] = {}
+        if mode == "combined":
+            self.attributes = self._validate_attributes(attributes)
+            self.prompt_template = self._combined_prompt(self.attributes)
+        elif mode == "name":
+            self.prompt_template = chat_prompt(NAME_SYSTEM_PROMPT, NAME_USER_PROMPT)
         elif mode == "age":
-            self.prompt_template = PromptTemplate.from_template(AGE_PROMPT)
+            self.prompt_template = chat_prompt(
+                AGE_SYSTEM_PROMPT, RESUME_INPUT_USER_PROMPT
+            )
         elif mode == "work_experience":
-            self.prompt_template = PromptTemplate.from_template(WORK_EXPERIENCE_PROMPT)
+            self.prompt_template = chat_prompt(
+                WORK_EXPERIENCE_SYSTEM_PROMPT, RESUME_INPUT_USER_PROMPT
+            )
         else:
-            raise ValueError("mode must be either 'name', 'age', or 'work_experience'")
+            raise ValueError(
+                "mode must be either 'name', 'age', 'work_experience' or 'combined'"
+            )
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
+        if mode == "combined":
+            self._combined_chains[self.attributes] = self.chain
+
+    @staticmethod
+    def _validate_attributes(attributes: Sequence[str]) -> Tuple[str, ...]:
+        unknown = set(attributes) - set(RESUME_ATTRIBUTES)
+        if unknown or not attributes:
+            raise ValueError(
+                f"attributes must be a non-empty subset of {RESUME_ATTRIBUTES}"
+            )
+        # Canonical order, so every subset maps to one prompt
+        return tuple(a for a in RESUME_ATTRIBUTES if a in attributes)
+
+    @staticmethod
+    def _combined_prompt(attributes: Tuple[str, ...]):
+        fields = "\n".join(f"- {COMBINED_ATTRIBUTE_FIELDS[a]}" for a in attributes)
+        return chat_prompt(
+            COMBINED_SYSTEM_PROMPT.format(fields=fields), RESUME_INPUT_USER_PROMPT
+        )
+
+    def _resolve(
+        self, attributes: Optional[Sequence[str]]
+    ) -> Tuple[Tuple[str, ...], Runnable]:
+        """Return the requested attributes and the chain extracting them."""
+        if self.mode != "combined":
+            if attributes is not None:
+                raise ValueError("attributes can only be selected in 'combined' mode")
+            return (self.mode,), self.chain
+        attributes = (
+            self.attributes
+            if attributes is None
+            else self._validate_attributes(attributes)
+        )
+        if attributes not in self._combined_chains:
+            self._combined_chains[attributes] = (
+                self._combined_prompt(attributes) | self.llm | StrOutputParser()
+            )
+        return attributes, self._combined_chains[attributes]
 
-    def run(self, resume_text: str) -> str:
+    @staticmethod
+    def parse(output: str, attributes: Sequence[str]) -> Dict[str, Any]:
+        """
+        Parse the output of a combined extraction into typed fields.
+
+        Args:
+            output: JSON object generated by the LLM (optionally in a code block)
+            attributes: The requested attributes
+
+        Returns:
+            Dictionary with one entry per requested attribute
+        """
+        data = parse_json_markdown(output)
+        if not isinstance(data, dict):
+            raise ValueError("Combined extraction did not return a JSON object")
+        return {
+            attribute: _coerce_attribute(attribute, data.get(attribute))
+            for attribute in attributes
+        }
+
+    def run(
+        self, resume_text: str, attributes: Optional[Sequence[str]] = None
+    ) -> Union[str, Dict[str, Any]]:
         """
         Extract information from the resume text.
 
         Args:
             resume_text: The resume text to process
+            attributes: Attributes to extract in "combined" mode (default: the
+                        agent's attributes)
 
         Returns:
-            The extracted information (name or age)
+            The extracted information (name or age), or a dictionary of typed
+            fields in "combined" mode
         """
         try:
-            self.logger.debug(
-                f"Running extraction with prompt: {self.prompt_template.template[:30]}..."
-            )
+            attributes, chain = self._resolve(attributes)
+            self.logger.debug(f"Running {', '.join(attributes)} extraction.")
             input_data = {"resume_text": resume_text}
-            result = self.chain.invoke(input_data)
+            result = chain.invoke(input_data)
+            if self.mode == "combined":
+                result = self.parse(result, attributes)
             self.logger.info("Extraction completed.")
             return result
         except Exception as e:
             self.logger.error(f"Extraction failed: {e}")
             raise RuntimeError(f"Failed to extract from resume: {str(e)}")
 
-    def batch(self, resumes: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    def batch(
+        self,
+        resumes: List[Dict[str, str]],
+        attributes: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Process multiple resumes in batch.
 
         Args:
             resumes: List of dictionaries containing resume_id and resume_text
+            attributes: Attributes to extract in "combined" mode (default: the
+                        agent's attributes)
 
         Returns:
-            List of dictionaries containing extraction results
+            List of dictionaries containing extraction results; in "combined"
+            mode "extracted" is a dictionary of typed fields, and a resume
+            whose output cannot be parsed gets an "error" instead
         """
         results = []
         try:
+            attributes, chain = self._resolve(attributes)
             self.logger.debug(f"Processing batch of {len(resumes)} resumes.")
             batch_inputs = [
                 {"resume_text": resume["resume_text"]} for resume in resumes
             ]
-            batch_outputs = self.chain.batch(batch_inputs)
+            batch_outputs = chain.batch(batch_inputs)
             for idx, resume in enumerate(resumes):
+                if self.mode != "combined":
+                    results.append(
+                        {
+                            "resume_id": resume["resume_id"],
+                            "extracted": batch_outputs[idx],
+                        }
+                    )
+                    continue
+                try:
+                    extracted = self.parse(batch_outputs[idx], attributes)
+                except Exception as e:
+                    self.logger.error(
+                        f"Failed to parse extraction for {resume['resume_id']}: {e}"
+                    )
+                    results.append({"resume_id": resume["resume_id"], "error": str(e)})
+                    continue
                 results.append(
-                    {
-                        "resume_id": resume["resume_id"],
-                        "extracted": batch_outputs[idx],
-                    }
+                    {"resume_id": resume["resume_id"], "extracted": extracted}
                 )
             self.logger.info("Batch extraction completed.")
         except Exception as e:
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any, Dict
 from src.utils.logger import get_logger
 
 
@@ -12,3 +13,20 @@ class BaseAgent(ABC):
     def run(self, *args, **kwargs):
         """The main entry point for the agent's execution."""
         pass
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """
+        Settings that determine the agent's output, used to key cached results.
+
+        Returns:
+            Dictionary with the agent class, model settings and prompt template
+        """
+        llm = getattr(self, "llm", None)
+        prompt_template = getattr(self, "prompt_template", None)
+        return {
+            "agent": type(self).__name__,
+            "model": getattr(llm, "model_name", None),
+            "temperature": getattr(llm, "temperature", None),
+            "generation_budget": getattr(llm, "generation_budget", None),
+            "prompt": prompt_template.pretty_repr() if prompt_template else None,
+        }
@@ -1,13 +1,16 @@
-import re
 import os
 from typing import List, Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
 from src.agents.base_agent import BaseAgent
-from src.prompts.job import COMPANY_CRITERIA_GENERATOR_PROMPT
-from src.config.config import JOB_MODEL, BASE_URL, API_KEY, TEMPERATURE
+from src.prompts.chat import chat_prompt
+from src.prompts.job import (
+    COMPANY_CRITERIA_GENERATOR_SYSTEM_PROMPT,
+    COMPANY_CRITERIA_GENERATOR_USER_PROMPT,
+)
+from src.config.config import JOB_MODEL
+from src.models.get_model import get_model
+from src.utils.text_normalization import normalize_text
 
 
 class CompanyCriteriaGeneratorAgent(BaseAgent):
@@ -29,36 +32,13 @@ class CompanyCriteriaGeneratorAgent(BaseAgent):
                        Defaults to JOB_MODEL from config.
         """
         super().__init__()
-        self.llm = ChatOpenAI(
-            model=JOB_MODEL,
-            base_url=BASE_URL,
-            api_key=API_KEY,
-            temperature=TEMPERATURE,
-        )
-        self.prompt_template = PromptTemplate.from_template(
-            COMPANY_CRITERIA_GENERATOR_PROMPT
+        self.llm = get_model(JOB_MODEL)
+        self.prompt_template = chat_prompt(
+            COMPANY_CRITERIA_GENERATOR_SYSTEM_PROMPT,
+            COMPANY_CRITERIA_GENERATOR_USER_PROMPT,
         )
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
 
-    def _preprocess_text(self, text: str) -> str:
-        """
-        Preprocess the text before generating company criteria.
-
-        Args:
-            text: The input text to preprocess
-
-        Returns:
-            Preprocessed text with common artifacts removed
-        """
-        # Remove hyperlinks
-        text = re.sub(r"https?://\S+|www\.\S+", "", text)
-
-        # Remove common artifacts and normalize whitespace
-        text = text.encode("ascii", "ignore").decode("utf-8")
-        text = re.sub(r"\s+", " ", text).strip()
-
-        return text
-
     def run(
         self,
         job_classification: str,
@@ -78,7 +58,7 @@ class CompanyCriteriaGeneratorAgent(BaseAgent):
         Returns:
             A string containing the generated company criteria
         """
-        preprocessed_text = self._preprocess_text(job_description)
+        preprocessed_text = normalize_text(job_description)
         response = self.chain.invoke(
             {
                 "job_description": preprocessed_text,
@@ -103,9 +83,7 @@ class CompanyCriteriaGeneratorAgent(BaseAgent):
         try:
             batch_inputs = [
                 {
-                    "job_description": self._preprocess_text(
-                        job.get("description", "")
-                    ),
+                    "job_description": normalize_text(job.get("description", "")),
                     "job_classification": job.get("job_classification", ""),
                     "job_type": job.get("job_type", ""),
                     "position": job.get("position", ""),
@@ -1,11 +1,14 @@
 from src.agents.base_agent import BaseAgent
-from src.prompts.job import PREVIOUS_HIRE_GENERATOR_PROMPT
-from src.config.config import JOB_MODEL, BASE_URL, API_KEY, TEMPERATURE
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import PromptTemplate
+from src.prompts.chat import chat_prompt
+from src.prompts.job import (
+    PREVIOUS_HIRE_GENERATOR_SYSTEM_PROMPT,
+    PREVIOUS_HIRE_GENERATOR_USER_PROMPT,
+)
+from src.config.config import JOB_MODEL
+from src.models.get_model import get_model
+from src.utils.text_normalization import normalize_text
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
-import re
 import os
 
 
@@ -28,36 +31,13 @@ class PreviousHireGeneratorAgent(BaseAgent):
                        Defaults to JOB_MODEL from config.
         """
         super().__init__()
-        self.llm = ChatOpenAI(
-            model=JOB_MODEL,
-            base_url=BASE_URL,
-            api_key=API_KEY,
-            temperature=TEMPERATURE,
-        )
-        self.prompt_template = PromptTemplate.from_template(
-            PREVIOUS_HIRE_GENERATOR_PROMPT
+        self.llm = get_model(JOB_MODEL)
+        self.prompt_template = chat_prompt(
+            PREVIOUS_HIRE_GENERATOR_SYSTEM_PROMPT,
+            PREVIOUS_HIRE_GENERATOR_USER_PROMPT,
         )
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
 
-    def _preprocess_text(self, text: str) -> str:
-        """
-        Preprocess the text before generating previous hires.
-
-        Args:
-            text: The input text to preprocess
-
-        Returns:
-            Preprocessed text with common artifacts removed
-        """
-        # Remove hyperlinks
-        text = re.sub(r"https?://\S+|www\.\S+", "", text)
-
-        # Remove common artifacts and normalize whitespace
-        text = text.encode("ascii", "ignore").decode("utf-8")
-        text = re.sub(r"\s+", " ", text).strip()
-
-        return text
-
     def run(
         self,
         job_classification: str,
@@ -79,7 +59,7 @@ class PreviousHireGeneratorAgent(BaseAgent):
         Returns:
             A string containing the generated list of previous hires
         """
-        preprocessed_description = self._preprocess_text(job_description)
+        preprocessed_description = normalize_text(job_description)
         result = self.chain.invoke(
             {
                 "job_description": preprocessed_description,
@@ -106,9 +86,7 @@ class PreviousHireGeneratorAgent(BaseAgent):
         try:
             batch_inputs = [
                 {
-                    "job_description": self._preprocess_text(
-                        job.get("description", "")
-                    ),
+                    "job_description": normalize_text(job.get("description", "")),
                     "company_criteria": job.get("company_criteria", ""),
                     "job_classification": job.get("job_classification", ""),
                     "job_type": job.get("job_type", ""),
@@ -9,9 +9,11 @@ and experience levels.
 from .resume_localizer import LocalizationAgent
 from .resume_anonymizer import AnonymizationAgent
 from .resume_reformatter import ResumeReformatterAgent
+from .resume_fused_localizer import FusedLocalizationAgent
 
 __all__ = [
     "LocalizationAgent",
     "AnonymizationAgent",
     "ResumeReformatterAgent",
+    "FusedLocalizationAgent",
 ]
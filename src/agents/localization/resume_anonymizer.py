@@ -1,13 +1,22 @@
-import re
-from typing import Dict, Any, List
-from langchain.prompts import PromptTemplate
+from typing import Dict, Any, List, Tuple
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
 
 from src.agents.base_agent import BaseAgent
-from src.prompts.localization import RESUME_ANONYMIZER_PROMPT
-from src.config.config import ANONYMIZER_MODEL
+from src.prompts.chat import chat_prompt
+from src.prompts.localization import (
+    RESUME_ANONYMIZER_SYSTEM_PROMPT,
+    RESUME_ANONYMIZER_USER_PROMPT,
+)
+from src.config.config import (
+    ANONYMIZER_MODEL,
+    ANONYMIZER_PRESCRUB,
+    ANONYMIZER_LLM_IF_NEEDED,
+)
 from src.models.get_model import get_model
+from src.utils.text_normalization import normalize_text
+from src.utils.pii_scrubber import scrub_pii, find_residual_identifiers
+from src.utils.resume_splitter import map_resume_chunks, stitch_chunks
 
 
 class AnonymizationAgent(BaseAgent):
@@ -19,39 +28,62 @@ class AnonymizationAgent(BaseAgent):
     - Standardizing location information
     - Removing or generalizing company names
     - Cleaning up formatting and removing artifacts
+
+    Structured PII is redacted locally before the LLM call. In
+    "LLM-only-if-needed" mode, resumes with no residual free-text identifiers
+    are returned after local redaction without calling the LLM.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        prescrub: bool = ANONYMIZER_PRESCRUB,
+        llm_if_needed: bool = ANONYMIZER_LLM_IF_NEEDED,
+    ):
         """
         Initialize the ResumeAnonymizer agent.
 
         Args:
-            model_name: Optional model name to use for anonymization.
-                       Defaults to ANONYMIZER_MODEL from config.
+            prescrub: Whether to redact structured PII with regexes first
+            llm_if_needed: Whether to skip the LLM for resumes without residual
+                           free-text identifiers (implies prescrub)
         """
         super().__init__()
-        self.llm = get_model(ANONYMIZER_MODEL)
-        self.prompt_template = PromptTemplate.from_template(RESUME_ANONYMIZER_PROMPT)
+        self.prescrub = prescrub or llm_if_needed
+        self.llm_if_needed = llm_if_needed
+        self.llm = get_model(ANONYMIZER_MODEL, budget="anonymizer")
+        self.prompt_template = chat_prompt(
+            RESUME_ANONYMIZER_SYSTEM_PROMPT, RESUME_ANONYMIZER_USER_PROMPT
+        )
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
 
-    def _preprocess_text(self, text: str) -> str:
+    def fingerprint(self) -> Dict[str, Any]:
+        """Agent settings plus the pre-scrubbing mode."""
+        return {
+            **super().fingerprint(),
+            "prescrub": self.prescrub,
+            "llm_if_needed": self.llm_if_needed,
+        }
+
+    def _prepare(self, resume_text: str) -> Tuple[str, Dict[str, int], bool]:
         """
-        Preprocess the text before anonymization.
+        Scrub and preprocess a resume and decide whether it needs the LLM.
 
         Args:
-            text: The input text to preprocess
+            resume_text: The raw resume text
 
         Returns:
-            Preprocessed text with common artifacts removed
+            Tuple of (cleaned text, PII replacement counts, whether the LLM is needed)
         """
-        # Remove hyperlinks
-        text = re.sub(r"https?://\S+|www\.\S+", "", text)
-
-        # Remove common artifacts and normalize whitespace
-        text = text.encode("ascii", "ignore").decode("utf-8")
-        text = re.sub(r"\s+", " ", text).strip()
-
-        return text
+        report = {}
+        if self.prescrub:
+            resume_text, report = scrub_pii(resume_text)
+        needs_llm = True
+        if self.llm_if_needed:
+            residual = find_residual_identifiers(resume_text)
+            needs_llm = bool(residual)
+            if residual:
+                self.logger.debug(f"Residual identifiers: {residual}")
+        return normalize_text(resume_text), report, needs_llm
 
     def run(self, resume_text: str) -> str:
         """
@@ -66,16 +98,23 @@ class AnonymizationAgent(BaseAgent):
         try:
             self.logger.info("Starting resume anonymization...")
 
-            # Preprocess the text
-            cleaned_text = self._preprocess_text(resume_text)
+            # Redact structured PII and preprocess the text
+            cleaned_text, report, needs_llm = self._prepare(resume_text)
+            if report:
+                self.logger.info(f"Pre-scrubbed PII: {report}")
+            if not needs_llm:
+                self.logger.info("No residual identifiers; skipping the LLM.")
+                return cleaned_text
 
             # Prepare the input for the LLM
             input_data = {
                 "resume_text": cleaned_text,
             }
 
-            # Run the anonymization
-            anonymized_text = self.chain.invoke(input_data)
+            # Run the anonymization, section by section for long resumes
+            anonymized_text = stitch_chunks(
+                map_resume_chunks(self.chain, [input_data])[0]
+            )
 
             self.logger.info("Resume anonymization completed successfully.")
 
@@ -97,16 +136,29 @@ class AnonymizationAgent(BaseAgent):
         """
         results = []
         try:
-            batch_inputs = [
-                {"resume_text": self._preprocess_text(resume["resume_text"])}
-                for resume in resumes
+            prepared = [self._prepare(resume["resume_text"]) for resume in resumes]
+            llm_indices = [
+                idx for idx, (_, _, needs_llm) in enumerate(prepared) if needs_llm
+            ]
+            self.logger.info(
+                f"Sending {len(llm_indices)} of {len(resumes)} resumes to the LLM."
+            )
+            batch_outputs = [
+                stitch_chunks(outputs)
+                for outputs in map_resume_chunks(
+                    self.chain,
+                    [{"resume_text": prepared[idx][0]} for idx in llm_indices],
+                )
             ]
-            batch_outputs = self.chain.batch(batch_inputs)
+            anonymized = [text for text, _, _ in prepared]
+            for idx, output in zip(llm_indices, batch_outputs):
+                anonymized[idx] = output
             for idx, resume in enumerate(resumes):
                 results.append(
                     {
                         "resume_id": resume["resume_id"],
-                        "anonymized_text": batch_outputs[idx],
+                        "anonymized_text": anonymized[idx],
+                        "pii_report": prepared[idx][1],
                     }
                 )
         except Exception as e:
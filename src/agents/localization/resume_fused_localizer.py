@@ -0,0 +1,174 @@
+import re
+from typing import Any, Dict, List
+
+from langchain.schema import StrOutputParser
+from langchain.schema.runnable import Runnable
+
+from src.agents.base_agent import BaseAgent
+from src.prompts.chat import chat_prompt
+from src.prompts.localization import (
+    FUSED_LOCALIZATION_SYSTEM_PROMPT,
+    FUSED_LOCALIZATION_USER_PROMPT,
+)
+from src.config.config import FUSED_LOCALIZATION_MODEL, ANONYMIZER_PRESCRUB
+from src.models.get_model import get_model
+from src.utils.text_normalization import normalize_text
+from src.utils.pii_scrubber import scrub_pii
+
+STAGES = ("anonymized", "reformatted", "localized")
+SECTION_PATTERNS = {
+    stage: re.compile(rf"<{stage}>\s*(.*?)\s*(?:</{stage}>|$)", re.DOTALL)
+    for stage in STAGES
+}
+
+
+class FusedLocalizationAgent(BaseAgent):
+    """
+    An agent that anonymizes, reformats and localizes a resume in one LLM call.
+
+    The three-step path sends and regenerates the whole resume three times;
+    this agent does it once and only generates the intermediate resumes when
+    they are requested.
+    """
+
+    def __init__(self, prescrub: bool = ANONYMIZER_PRESCRUB):
+        """
+        Initialize the FusedLocalizationAgent.
+
+        Args:
+            prescrub: Whether to redact structured PII with regexes first
+        """
+        super().__init__()
+        self.prescrub = prescrub
+        self.llm = get_model(FUSED_LOCALIZATION_MODEL, budget="fused_localizer")
+        self.prompt_template = chat_prompt(
+            FUSED_LOCALIZATION_SYSTEM_PROMPT, FUSED_LOCALIZATION_USER_PROMPT
+        )
+        self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """Agent settings plus the pre-scrubbing mode."""
+        return {**super().fingerprint(), "prescrub": self.prescrub}
+
+    def _parse_output(self, output: str, return_intermediates: bool) -> Dict[str, str]:
+        """
+        Split the model output into its tagged sections.
+
+        Args:
+            output: Raw model output
+            return_intermediates: Whether the intermediate resumes were requested
+
+        Returns:
+            Dictionary with localized_text, plus anonymized_text and
+            reformatted_text when requested (None if the model omitted them)
+        """
+        sections = {}
+        for stage, pattern in SECTION_PATTERNS.items():
+            match = pattern.search(output)
+            sections[stage] = match.group(1) if match else None
+
+        localized = sections["localized"]
+        if localized is None:
+            self.logger.warning(
+                "Fused output has no <localized> section; using the raw output."
+            )
+            localized = output.strip()
+
+        result = {"localized_text": localized}
+        if return_intermediates:
+            result["anonymized_text"] = sections["anonymized"]
+            result["reformatted_text"] = sections["reformatted"]
+        return result
+
+    def _inputs(
+        self, resume_text: str, target_country: str, return_intermediates: bool
+    ) -> Dict[str, str]:
+        if self.prescrub:
+            resume_text, _ = scrub_pii(resume_text)
+        return {
+            "resume_text": normalize_text(resume_text),
+            "target_country": target_country,
+            "include_intermediates": "yes" if return_intermediates else "no",
+        }
+
+    def run(
+        self,
+        resume_text: str,
+        target_country: str = "Singapore",
+        return_intermediates: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Anonymize, reformat and localize a resume in a single call.
+
+        Args:
+            resume_text: The resume text to process
+            target_country: The target country/region for localization
+            return_intermediates: Whether to also generate the anonymized and
+                                  reformatted resumes
+
+        Returns:
+            Dictionary with localized_text, plus anonymized_text and
+            reformatted_text when requested
+        """
+        try:
+            self.logger.info(
+                f"Starting fused resume localization for {target_country}..."
+            )
+            output = self.chain.invoke(
+                self._inputs(resume_text, target_country, return_intermediates)
+            )
+            self.logger.info("Fused resume localization completed successfully.")
+            return self._parse_output(output, return_intermediates)
+
+        except Exception as e:
+            self.logger.error(
+                f"Error during fused resume localization: {str(e)}", exc_info=True
+            )
+            raise RuntimeError("Failed to localize resume") from e
+
+    def batch(
+        self,
+        resumes: List[Dict[str, str]],
+        target_country: str,
+        return_intermediates: bool = False,
+    ) -> List[Dict[str, str]]:
+        """
+        Process multiple resumes in batch.
+
+        Args:
+            resumes: List of dictionaries containing resume_id and resume_text
+            target_country: The target country/region for localization
+            return_intermediates: Whether to also generate the anonymized and
+                                  reformatted resumes
+
+        Returns:
+            List of dictionaries containing resume_id and localized_text (plus
+            the intermediate texts when requested), or an error message
+        """
+        results = []
+        try:
+            batch_outputs = self.chain.batch(
+                [
+                    self._inputs(
+                        resume["resume_text"], target_country, return_intermediates
+                    )
+                    for resume in resumes
+                ]
+            )
+            for idx, resume in enumerate(resumes):
+                results.append(
+                    {
+                        "resume_id": resume["resume_id"],
+                        **self._parse_output(batch_outputs[idx], return_intermediates),
+                    }
+                )
+        except Exception as e:
+            self.logger.error(f"Error processing batch fused localization: {str(e)}")
+            for resume in resumes:
+                results.append(
+                    {
+                        "resume_id": resume["resume_id"],
+                        "error": str(e),
+                    }
+                )
+        return results
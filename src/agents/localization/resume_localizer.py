@@ -1,13 +1,17 @@
 from typing import Dict, Any, List
 
-from langchain.prompts import PromptTemplate
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
 
 from src.agents.base_agent import BaseAgent
-from src.prompts.localization import LOCALIZATION_PROMPT
+from src.prompts.chat import chat_prompt
+from src.prompts.localization import (
+    LOCALIZATION_SYSTEM_PROMPT,
+    LOCALIZATION_USER_PROMPT,
+)
 from src.config.config import LOCALIZATION_MODEL
 from src.models.get_model import get_model
+from src.utils.resume_splitter import map_resume_chunks, stitch_chunks
 
 
 class LocalizationAgent(BaseAgent):
@@ -27,8 +31,10 @@ class LocalizationAgent(BaseAgent):
         Initialize the LocalizationAgent.
         """
         super().__init__()
-        self.llm = get_model(LOCALIZATION_MODEL)
-        self.prompt_template = PromptTemplate.from_template(LOCALIZATION_PROMPT)
+        self.llm = get_model(LOCALIZATION_MODEL, budget="localizer")
+        self.prompt_template = chat_prompt(
+            LOCALIZATION_SYSTEM_PROMPT, LOCALIZATION_USER_PROMPT
+        )
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
 
     def run(self, resume_text: str, target_country: str = "Singapore") -> str:
@@ -51,8 +57,10 @@ class LocalizationAgent(BaseAgent):
                 "target_country": target_country,
             }
 
-            # Run the localization
-            localized_content = self.chain.invoke(input_data)
+            # Run the localization, section by section for long resumes
+            localized_content = stitch_chunks(
+                map_resume_chunks(self.chain, [input_data])[0]
+            )
 
             self.logger.info(f"Content localization completed successfully.")
 
@@ -88,7 +96,10 @@ class LocalizationAgent(BaseAgent):
                 }
                 for resume in resumes
             ]
-            batch_outputs = self.chain.batch(batch_inputs)
+            batch_outputs = [
+                stitch_chunks(outputs)
+                for outputs in map_resume_chunks(self.chain, batch_inputs)
+            ]
             for idx, resume in enumerate(resumes):
                 results.append(
                     {
@@ -1,11 +1,15 @@
 from typing import Dict, List
 from src.agents.base_agent import BaseAgent
-from langchain.prompts import PromptTemplate
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
-from src.prompts.localization.resume_reformatter_prompt import RESUME_REFORMATTER_PROMPT
+from src.prompts.chat import chat_prompt
+from src.prompts.localization.resume_reformatter_prompt import (
+    RESUME_REFORMATTER_SYSTEM_PROMPT,
+    RESUME_REFORMATTER_USER_PROMPT,
+)
 from src.config.config import REFORMATTER_MODEL
 from src.models.get_model import get_model
+from src.utils.resume_splitter import map_resume_chunks, stitch_chunks
 
 
 class ResumeReformatterAgent(BaseAgent):
@@ -13,15 +17,20 @@ class ResumeReformatterAgent(BaseAgent):
 
     def __init__(self):
         super().__init__()
-        self.llm = get_model(REFORMATTER_MODEL)
-        self.prompt_template = PromptTemplate.from_template(RESUME_REFORMATTER_PROMPT)
+        self.llm = get_model(REFORMATTER_MODEL, budget="reformatter")
+        self.prompt_template = chat_prompt(
+            RESUME_REFORMATTER_SYSTEM_PROMPT, RESUME_REFORMATTER_USER_PROMPT
+        )
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
 
     def run(self, anonymized_resume_text: str) -> str:
         """Reformats the resume to ensure a clean and professional layout."""
         try:
-            reformatted_resume = self.chain.invoke(
-                {"resume_text": anonymized_resume_text}
+            # Long resumes are reformatted section by section, in parallel
+            reformatted_resume = stitch_chunks(
+                map_resume_chunks(
+                    self.chain, [{"resume_text": anonymized_resume_text}]
+                )[0]
             )
             return reformatted_resume
         except Exception as e:
@@ -42,7 +51,10 @@ class ResumeReformatterAgent(BaseAgent):
             batch_inputs = [
                 {"resume_text": resume["resume_text"]} for resume in resumes
             ]
-            batch_outputs = self.chain.batch(batch_inputs)
+            batch_outputs = [
+                stitch_chunks(outputs)
+                for outputs in map_resume_chunks(self.chain, batch_inputs)
+            ]
             for idx, resume in enumerate(resumes):
                 results.append(
                     {
@@ -1,13 +1,34 @@
 import os
 import json
-from typing import Optional, Literal
-from langchain.prompts import PromptTemplate
+from typing import Any, Dict, Iterator, List, Optional, Literal, Tuple
+import numpy as np
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
+from langchain_core.utils.json import parse_json_markdown
 from src.agents.base_agent import BaseAgent
-from src.prompts.resume import RESUME_EVALUATOR_PROMPT
-from src.prompts.parser_prompt import EVALUATION_PARSER_PROMPT
-from src.config.config import EVALUATOR_MODEL
+from src.prompts.chat import chat_prompt
+from src.prompts.resume import (
+    RESUME_EVALUATOR_SYSTEM_PROMPT,
+    RESUME_EVALUATOR_USER_PROMPT,
+    RESUME_SCREENER_SYSTEM_PROMPT,
+    RESUME_SCREENER_USER_PROMPT,
+)
+from src.prompts.parser_prompt import (
+    EVALUATION_PARSER_SYSTEM_PROMPT,
+    EVALUATION_PARSER_USER_PROMPT,
+)
+from src.config.config import (
+    EVALUATOR_MODEL,
+    RAG_SOURCE_QUOTAS,
+    RAG_RETRIEVAL_MODE,
+    EVALUATOR_CASCADE,
+    CASCADE_SCREENER,
+    CASCADE_SCREENER_MODEL,
+    CASCADE_REJECT_BELOW,
+    CASCADE_ACCEPT_ABOVE,
+    CASCADE_MIN_CONFIDENCE,
+    CASCADE_SIMILARITY_RANGE,
+)
 from src.models.get_model import get_model
 
 # Import the appropriate RAG loader based on the embedding type
@@ -19,18 +40,44 @@ class ResumeEvaluatorAgent(BaseAgent):
     """Agent responsible for evaluating a resume based on a job description.
 
     This agent supports both HuggingFace and OpenAI embeddings.
+
+    In cascade mode, a cheap screener first scores every resume from 0 to 10:
+    an LLM call without RAG context ("llm") or the embedding similarity
+    between resume and job description ("embedding"). Confident scores below
+    reject_below or from accept_above are final; only the resumes in between
+    or with low confidence get the full RAG evaluation. The embedding screener
+    has no notion of confidence (it always reports 1.0), so min_confidence
+    only applies to the LLM screener.
     """
 
     def __init__(
         self,
         embedding_type: Literal["openai", "huggingface"] = "openai",
         embedding_model_name: Optional[str] = None,
+        source_quotas: Optional[Dict[str, int]] = None,
+        retrieval_mode: Optional[Literal["dense", "lexical", "hybrid"]] = None,
+        cascade: bool = EVALUATOR_CASCADE,
+        screener: Literal["llm", "embedding"] = CASCADE_SCREENER,
+        reject_below: float = CASCADE_REJECT_BELOW,
+        accept_above: float = CASCADE_ACCEPT_ABOVE,
+        min_confidence: float = CASCADE_MIN_CONFIDENCE,
     ):
         """Initialize the ResumeEvaluatorAgent.
 
         Args:
             embedding_type: Type of embeddings to use ("openai" or "huggingface")
             model_name: Name of the model to use for embeddings (only for HuggingFace)
+            source_quotas: Number of chunks to retrieve per source type.
+                           Defaults to RAG_SOURCE_QUOTAS from config.
+            retrieval_mode: "dense", "lexical" or "hybrid" retrieval.
+                            Defaults to RAG_RETRIEVAL_MODE from config.
+            cascade: Whether to screen resumes before the full evaluation
+            screener: First-pass scorer, "llm" (CASCADE_SCREENER_MODEL) or
+                      "embedding" (resume/job description similarity)
+            reject_below: Screening score below which a resume is rejected
+            accept_above: Screening score from which a resume is accepted
+            min_confidence: Minimum confidence of the LLM screener for a final
+                            decision (not used by the embedding screener)
         """
         super().__init__()
 
@@ -38,16 +85,244 @@ class ResumeEvaluatorAgent(BaseAgent):
         self.llm = get_model(EVALUATOR_MODEL)
 
         # Set up the evaluation chain
-        self.prompt_template = PromptTemplate.from_template(RESUME_EVALUATOR_PROMPT)
+        self.prompt_template = chat_prompt(
+            RESUME_EVALUATOR_SYSTEM_PROMPT, RESUME_EVALUATOR_USER_PROMPT
+        )
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
 
+        # Set up the chain that turns a free-text evaluation into JSON
+        self.parser_prompt = chat_prompt(
+            EVALUATION_PARSER_SYSTEM_PROMPT, EVALUATION_PARSER_USER_PROMPT
+        )
+        self.parser_chain: Runnable = (
+            {"evaluation_text": lambda x: x}
+            | self.parser_prompt
+            | self.llm
+            | StrOutputParser()
+        )
+
         # Initialize the appropriate vector store
         self.embedding_type = embedding_type.lower()
         self.embedding_model_name = embedding_model_name
-        self.vector_store = self._initialize_vector_store()
+        self.source_quotas = source_quotas or RAG_SOURCE_QUOTAS
+        self.retrieval_mode = retrieval_mode or RAG_RETRIEVAL_MODE
+        self.rag_loader = self._initialize_rag_loader()
+        self.rag_loader.get_partitioned_vector_stores("data/rag_sources")
+
+        # Cascade settings and the first-pass screener
+        self.cascade = cascade
+        self.screener = screener
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        self.min_confidence = min_confidence
+        if screener not in ("llm", "embedding"):
+            raise ValueError("screener must be either 'llm' or 'embedding'")
+        self.screener_prompt = chat_prompt(
+            RESUME_SCREENER_SYSTEM_PROMPT, RESUME_SCREENER_USER_PROMPT
+        )
+        # The screener model is only loaded when a resume is first screened
+        self.screener_llm = None
+        self._screener_chain: Optional[Runnable] = None
+
+    @property
+    def screener_chain(self) -> Runnable:
+        """The LLM screener's chain, built on first use."""
+        if self._screener_chain is None:
+            self.screener_llm = get_model(CASCADE_SCREENER_MODEL)
+            self._screener_chain = (
+                self.screener_prompt | self.screener_llm | StrOutputParser()
+            )
+        return self._screener_chain
+
+    @property
+    def vector_stores(self):
+        """Partitions of the index version currently being served."""
+        return self.rag_loader.partitions
 
-    def _initialize_vector_store(self):
-        """Initialize the vector store based on the embedding type."""
+    def fingerprint(self) -> Dict[str, Any]:
+        """Agent settings plus the parser prompt, retrieval settings and index version."""
+        self.rag_loader.refresh_index()
+        return {
+            **super().fingerprint(),
+            "parser_prompt": self.parser_prompt.pretty_repr(),
+            "embedding": [self.embedding_type, self.embedding_model_name],
+            "source_quotas": self.source_quotas,
+            "retrieval_mode": self.retrieval_mode,
+            "index_version": self.rag_loader.snapshot.version,
+            "cascade": (
+                {
+                    "screener": self.screener,
+                    "screener_model": (
+                        CASCADE_SCREENER_MODEL if self.screener == "llm" else None
+                    ),
+                    "screener_prompt": (
+                        self.screener_prompt.pretty_repr()
+                        if self.screener == "llm"
+                        else list(CASCADE_SIMILARITY_RANGE)
+                    ),
+                    "thresholds": [
+                        self.reject_below,
+                        self.accept_above,
+                        self.min_confidence,
+                    ],
+                }
+                if self.cascade
+                else None
+            ),
+        }
+
+    def is_error_response(self, evaluation: str) -> bool:
+        """Whether an evaluation is empty or an error response."""
+        try:
+            return not evaluation or "error" in json.loads(evaluation)
+        except (json.JSONDecodeError, TypeError):
+            return False
+
+    def screen_batch(self, items: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Scores resumes with the cheap first-pass screener.
+
+        Args:
+            items: List of dictionaries containing resume_details and
+                   job_description
+
+        Returns:
+            List of dictionaries containing the screening score (0-10, None
+            if screening failed), the confidence (0-1) and the screener
+        """
+        if not items:
+            return []
+        if self.screener == "embedding":
+            texts = list(
+                dict.fromkeys(
+                    text
+                    for item in items
+                    for text in (item["job_description"], item["resume_details"])
+                )
+            )
+            vectors = self.rag_loader.embed_texts(texts)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+            rows = {text: vectors[idx] for idx, text in enumerate(texts)}
+            low, high = CASCADE_SIMILARITY_RANGE
+            screenings = []
+            for item in items:
+                similarity = float(
+                    rows[item["job_description"]] @ rows[item["resume_details"]]
+                )
+                score = 10 * min(max((similarity - low) / (high - low), 0.0), 1.0)
+                # Similarities carry no confidence; min_confidence only
+                # applies to the LLM screener
+                screenings.append(
+                    {
+                        "score": round(score, 2),
+                        "confidence": 1.0,
+                        "similarity": similarity,
+                    }
+                )
+        else:
+            outputs = self.screener_chain.batch(
+                [
+                    {
+                        "job_description": item["job_description"],
+                        "resume_details": item["resume_details"],
+                    }
+                    for item in items
+                ],
+                return_exceptions=True,
+            )
+            screenings = []
+            for output in outputs:
+                try:
+                    if isinstance(output, Exception):
+                        raise output
+                    screening = parse_json_markdown(output)
+                    screenings.append(
+                        {
+                            "score": float(screening["score"]),
+                            "confidence": float(screening.get("confidence", 0.0)),
+                        }
+                    )
+                except Exception as e:
+                    self.logger.error(f"Screening failed: {str(e)}")
+                    screenings.append({"score": None, "confidence": 0.0})
+        return [{**screening, "screener": self.screener} for screening in screenings]
+
+    def screen(self, resume_details: str, job_description: str) -> Dict[str, Any]:
+        """Scores one resume with the cheap first-pass screener."""
+        return self.screen_batch(
+            [{"resume_details": resume_details, "job_description": job_description}]
+        )[0]
+
+    def decide(
+        self,
+        screening: Dict[str, Any],
+        reject_below: Optional[float] = None,
+        accept_above: Optional[float] = None,
+        min_confidence: Optional[float] = None,
+    ) -> Literal["reject", "accept", "escalate"]:
+        """Decides a screened resume, or escalates it to the full evaluation.
+
+        Args:
+            screening: Output of `screen`
+            reject_below: Overrides the agent's rejection threshold
+            accept_above: Overrides the agent's acceptance threshold
+            min_confidence: Overrides the agent's minimum confidence
+
+        Returns:
+            "reject", "accept" or "escalate"
+        """
+        reject_below = self.reject_below if reject_below is None else reject_below
+        accept_above = self.accept_above if accept_above is None else accept_above
+        min_confidence = (
+            self.min_confidence if min_confidence is None else min_confidence
+        )
+        score = screening.get("score")
+        if score is None or screening.get("confidence", 0.0) < min_confidence:
+            return "escalate"
+        if score < reject_below:
+            return "reject"
+        if score >= accept_above:
+            return "accept"
+        return "escalate"
+
+    @staticmethod
+    def cascade_decision(evaluation: str) -> Optional[str]:
+        """The screening decision of an evaluation that was not escalated.
+
+        Returns:
+            "reject" or "accept" for screened evaluations, None for full ones
+        """
+        try:
+            decision = json.loads(evaluation).get("decision")
+        except (json.JSONDecodeError, TypeError, AttributeError):
+            return None
+        return decision if decision in ("reject", "accept") else None
+
+    def _screened_response(self, screening: Dict[str, Any], decision: str) -> str:
+        """The evaluation of a resume decided by the screener."""
+        return json.dumps(
+            {
+                "decision": decision,
+                "screening_score": screening["score"],
+                "confidence": screening["confidence"],
+                "screener": screening["screener"],
+            },
+            indent=2,
+        )
+
+    def _attach_screening(self, evaluation: str, screening: Dict[str, Any]) -> str:
+        """Adds the screening result to a full (JSON) evaluation."""
+        try:
+            evaluation_json = json.loads(evaluation)
+        except (json.JSONDecodeError, TypeError):
+            return evaluation
+        if not isinstance(evaluation_json, dict):
+            return evaluation
+        evaluation_json["decision"] = "escalate"
+        evaluation_json["screening"] = screening
+        return json.dumps(evaluation_json, indent=2)
+
+    def _initialize_rag_loader(self):
+        """Initialize the RAG loader based on the embedding type."""
         try:
             if self.embedding_type == "huggingface":
                 if HFRAGLoader is None:
@@ -58,21 +333,19 @@ class ResumeEvaluatorAgent(BaseAgent):
                 self.logger.info(
                     f"Initializing HuggingFace embeddings with model: {self.embedding_model_name}"
                 )
-                rag_loader = HFRAGLoader(
+                return HFRAGLoader(
                     model_name=self.embedding_model_name
                     or "sentence-transformers/all-MiniLM-L6-v2"
                 )
-                return rag_loader.get_vector_store("data/rag_sources")
 
             elif self.embedding_type == "openai":
-                rag_loader = OpenAIRAGLoader()
-                return rag_loader.get_vector_store("data/rag_sources")
+                return OpenAIRAGLoader()
 
             else:
                 raise ValueError(f"Unsupported embedding type: {self.embedding_type}")
 
         except Exception as e:
-            self.logger.error(f"Failed to initialize vector store: {str(e)}")
+            self.logger.error(f"Failed to initialize RAG loader: {str(e)}")
             raise
 
     def _create_error_response(self, error_msg: str) -> str:
@@ -89,31 +362,95 @@ class ResumeEvaluatorAgent(BaseAgent):
             indent=2,
         )
 
-    def run(self, resume_details: str, job_description: str) -> str:
+    def _format_chunks(self, retrieved_chunks: list) -> str:
+        """Format retrieved chunks for the evaluation prompt."""
+
+        # Handle both Document objects and strings
+        def format_chunk(chunk):
+            if hasattr(chunk, "page_content"):
+                source_type = chunk.metadata.get("source_type", "general")
+                return f"- [{source_type}] {chunk.page_content[:200]}..."
+            return f"- {str(chunk)[:200]}..."
+
+        return "\n".join(format_chunk(chunk) for chunk in retrieved_chunks)
+
+    def _parse_evaluation(self, parsed_evaluation: str, evaluation: str) -> str:
+        """Validate the parser output, falling back to the raw evaluation."""
+        try:
+            evaluation_json = json.loads(parsed_evaluation)
+            self.logger.info(
+                f"Successfully parsed evaluation: {json.dumps(evaluation_json, indent=2)}"
+            )
+            return json.dumps(evaluation_json, indent=2)
+        except json.JSONDecodeError as e:
+            self.logger.error(f"Failed to parse LLM output as JSON: {str(e)}")
+            # Fall back to the original evaluation if parsing fails
+            self.logger.info("Falling back to original evaluation output")
+            return evaluation
+
+    def run(
+        self,
+        resume_details: str,
+        job_description: str,
+        cascade: Optional[bool] = None,
+    ) -> str:
         """Evaluates the resume against the job description.
 
         Args:
             resume_details: Extracted details from the resume
             job_description: Job description to evaluate against
+            cascade: Overrides the agent's cascade setting
+
+        Returns:
+            str: JSON string containing evaluation scores, or the screening
+            decision and score of a resume that was not escalated
+        """
+        screening, screened = self.prescreen(resume_details, job_description, cascade)
+        if screened is not None:
+            return screened
+        evaluation = self._evaluate(resume_details, job_description)
+        if screening is None:
+            return evaluation
+        return self._attach_screening(evaluation, screening)
+
+    def prescreen(
+        self,
+        resume_details: str,
+        job_description: str,
+        cascade: Optional[bool] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Screens one resume ahead of the full evaluation in cascade mode.
+
+        Args:
+            resume_details: Extracted details from the resume
+            job_description: Job description to evaluate against
+            cascade: Overrides the agent's cascade setting
 
         Returns:
-            str: JSON string containing evaluation scores
+            Tuple of (the screening, None without cascade; the evaluation of
+            a resume decided by the screener, None if it is escalated)
         """
+        if not (self.cascade if cascade is None else cascade):
+            return None, None
+        screening = self.screen(resume_details, job_description)
+        decision = self.decide(screening)
+        self.logger.info(f"Screening: {screening} -> {decision}")
+        if decision == "escalate":
+            return screening, None
+        return screening, self._screened_response(screening, decision)
+
+    def _evaluate(self, resume_details: str, job_description: str) -> str:
+        """Runs the full RAG evaluation of one resume."""
         try:
             self.logger.info("Starting resume evaluation...")
 
-            # 1. Retrieve relevant chunks
+            # 1. Retrieve relevant chunks, with a fixed quota per source type
             try:
-                # Handle different vector store interfaces
-                if hasattr(self.vector_store, "as_retriever"):
-                    retriever = self.vector_store.as_retriever()
-                    retrieved_chunks = retriever.get_relevant_documents(job_description)
-                elif hasattr(self.vector_store, "similarity_search"):
-                    retrieved_chunks = self.vector_store.similarity_search(
-                        job_description, k=4
-                    )
-                else:
-                    raise ValueError("Unsupported vector store interface")
+                # Pick up a rebuilt index without restarting the worker
+                self.rag_loader.refresh_index()
+                retrieved_chunks = self.rag_loader.search_partitions(
+                    job_description, self.source_quotas, mode=self.retrieval_mode
+                )
 
                 self.logger.info(
                     f"Retrieved {len(retrieved_chunks)} relevant document(s) for RAG."
@@ -131,18 +468,7 @@ class ResumeEvaluatorAgent(BaseAgent):
 
             # 2. Format retrieved chunks for the prompt
             try:
-                # Handle both Document objects and strings
-                def format_chunk(chunk):
-                    content = (
-                        chunk.page_content
-                        if hasattr(chunk, "page_content")
-                        else str(chunk)
-                    )
-                    return f"- {content[:200]}..."
-
-                retrieved_chunks_text = "\n".join(
-                    format_chunk(chunk) for chunk in retrieved_chunks
-                )
+                retrieved_chunks_text = self._format_chunks(retrieved_chunks)
             except Exception as e:
                 error_msg = f"Error formatting chunks: {str(e)}"
                 self.logger.error(error_msg)
@@ -167,32 +493,9 @@ class ResumeEvaluatorAgent(BaseAgent):
             # 4. Parse and validate the response using LLM
             try:
                 self.logger.info("Parsing and validating evaluation with LLM...")
-
-                # Create a parser chain
-                parser_prompt = PromptTemplate.from_template(EVALUATION_PARSER_PROMPT)
-                parser_chain = (
-                    {"evaluation_text": lambda x: x}
-                    | parser_prompt
-                    | self.llm
-                    | StrOutputParser()
-                )
-
-                # Parse the evaluation
-                parsed_evaluation = parser_chain.invoke(evaluation)
+                parsed_evaluation = self.parser_chain.invoke(evaluation)
                 self.logger.info("LLM parsing completed successfully.")
-
-                # Parse the JSON response
-                try:
-                    evaluation_json = json.loads(parsed_evaluation)
-                    self.logger.info(
-                        f"Successfully parsed evaluation: {json.dumps(evaluation_json, indent=2)}"
-                    )
-                    return json.dumps(evaluation_json, indent=2)
-                except json.JSONDecodeError as e:
-                    self.logger.error(f"Failed to parse LLM output as JSON: {str(e)}")
-                    # Fall back to the original evaluation if parsing fails
-                    self.logger.info("Falling back to original evaluation output")
-                    return evaluation
+                return self._parse_evaluation(parsed_evaluation, evaluation)
 
             except Exception as e:
                 error_msg = f"Error in LLM parsing: {str(e)}"
@@ -204,3 +507,197 @@ class ResumeEvaluatorAgent(BaseAgent):
             error_msg = f"Unexpected error in resume evaluation: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
             return self._create_error_response(error_msg)
+
+    def stream(self, resume_details: str, job_description: str) -> Iterator[str]:
+        """Evaluates the resume, streaming the free-text evaluation.
+
+        Use `parse` on the concatenated chunks to get the JSON scores. This
+        always runs the full evaluation; in cascade mode, call `prescreen`
+        first (as HiringPipeline.stream does).
+
+        Args:
+            resume_details: Extracted details from the resume
+            job_description: Job description to evaluate against
+
+        Yields:
+            Chunks of the evaluation text as they are generated
+        """
+        try:
+            self.logger.info("Starting streamed resume evaluation...")
+            self.rag_loader.refresh_index()
+            retrieved_chunks = self.rag_loader.search_partitions(
+                job_description, self.source_quotas, mode=self.retrieval_mode
+            )
+            if not retrieved_chunks:
+                raise ValueError(
+                    "No documents were retrieved. The vector store might be empty."
+                )
+            yield from self.chain.stream(
+                {
+                    "job_description": job_description,
+                    "retrieved_chunks": self._format_chunks(retrieved_chunks),
+                    "resume_details": resume_details,
+                }
+            )
+        except Exception as e:
+            self.logger.error(f"Error in evaluation: {str(e)}", exc_info=True)
+            raise RuntimeError("Failed to evaluate resume") from e
+
+    def parse(self, evaluation: str, screening: Optional[Dict[str, Any]] = None) -> str:
+        """Turns a free-text evaluation into a JSON string of scores.
+
+        Args:
+            evaluation: Evaluation text, e.g. the concatenated `stream` output
+            screening: Screening of an escalated resume (see `prescreen`),
+                       added to the scores
+
+        Returns:
+            str: JSON string containing evaluation scores, or the evaluation
+            itself if it could not be parsed
+        """
+        try:
+            parsed_evaluation = self.parser_chain.invoke(evaluation)
+        except Exception as e:
+            self.logger.error(f"Error in LLM parsing: {str(e)}", exc_info=True)
+            return evaluation
+        parsed = self._parse_evaluation(parsed_evaluation, evaluation)
+        return (
+            parsed if screening is None else self._attach_screening(parsed, screening)
+        )
+
+    def batch(
+        self, items: List[Dict[str, str]], cascade: Optional[bool] = None
+    ) -> List[Dict[str, str]]:
+        """Evaluates multiple resumes, in cascade mode only those escalated.
+
+        Args:
+            items: List of dictionaries containing resume_id, resume_details
+                   and job_description
+            cascade: Overrides the agent's cascade setting
+
+        Returns:
+            List of dictionaries containing resume_id and
+            evaluation_scores_json, in input order
+        """
+        if not (self.cascade if cascade is None else cascade):
+            return self._evaluate_batch(items)
+        screenings = self.screen_batch(items)
+        decisions = [self.decide(screening) for screening in screenings]
+        escalated = [
+            idx for idx, decision in enumerate(decisions) if decision == "escalate"
+        ]
+        self.logger.info(
+            f"Screening escalated {len(escalated)} of {len(items)} resume(s)."
+        )
+        results = [
+            {
+                "resume_id": item["resume_id"],
+                "evaluation_scores_json": self._screened_response(screening, decision),
+            }
+            for item, screening, decision in zip(items, screenings, decisions)
+        ]
+        if not escalated:
+            return results
+        evaluations = self._evaluate_batch([items[idx] for idx in escalated])
+        for idx, evaluation in zip(escalated, evaluations):
+            evaluation["evaluation_scores_json"] = self._attach_screening(
+                evaluation["evaluation_scores_json"], screenings[idx]
+            )
+            results[idx] = evaluation
+        return results
+
+    def _evaluate_batch(self, items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Evaluates multiple resumes, retrieving context for all of them at once.
+
+        Retrieval embeds every distinct job description in one call and
+        searches each partition once over the resulting query matrix. The
+        evaluation and parsing steps then run through `chain.batch`.
+
+        Args:
+            items: List of dictionaries containing resume_id, resume_details
+                   and job_description
+
+        Returns:
+            List of dictionaries containing resume_id and
+            evaluation_scores_json, in input order
+        """
+        self.logger.info(f"Starting batch evaluation of {len(items)} resume(s)...")
+        results = [
+            {"resume_id": item["resume_id"], "evaluation_scores_json": None}
+            for item in items
+        ]
+
+        # 1. Retrieve once per distinct job description
+        job_descriptions = list(
+            dict.fromkeys(item["job_description"] for item in items)
+        )
+        try:
+            self.rag_loader.refresh_index()
+            retrieved = self.rag_loader.search_partitions_batch(
+                job_descriptions, self.source_quotas, mode=self.retrieval_mode
+            )
+            chunks_by_description = {
+                description: self._format_chunks(chunks)
+                for description, chunks in zip(job_descriptions, retrieved)
+                if chunks
+            }
+        except Exception as e:
+            error_msg = f"Error in retrieval: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            for result in results:
+                result["evaluation_scores_json"] = self._create_error_response(
+                    error_msg
+                )
+            return results
+
+        pending = []
+        for idx, item in enumerate(items):
+            if item["job_description"] in chunks_by_description:
+                pending.append(idx)
+            else:
+                results[idx]["evaluation_scores_json"] = self._create_error_response(
+                    "Error in retrieval: No documents were retrieved. "
+                    "The vector store might be empty."
+                )
+        if not pending:
+            return results
+
+        # 2. Get the initial evaluations
+        evaluations = self.chain.batch(
+            [
+                {
+                    "job_description": items[idx]["job_description"],
+                    "retrieved_chunks": chunks_by_description[
+                        items[idx]["job_description"]
+                    ],
+                    "resume_details": items[idx]["resume_details"],
+                }
+                for idx in pending
+            ],
+            return_exceptions=True,
+        )
+        evaluated = []
+        for idx, evaluation in zip(pending, evaluations):
+            if isinstance(evaluation, Exception):
+                error_msg = f"Error in evaluation: {str(evaluation)}"
+                self.logger.error(error_msg)
+                results[idx]["evaluation_scores_json"] = self._create_error_response(
+                    error_msg
+                )
+            else:
+                evaluated.append((idx, evaluation))
+
+        # 3. Parse and validate the responses using LLM
+        parsed_evaluations = self.parser_chain.batch(
+            [evaluation for _, evaluation in evaluated], return_exceptions=True
+        )
+        for (idx, evaluation), parsed in zip(evaluated, parsed_evaluations):
+            if isinstance(parsed, Exception):
+                self.logger.error(f"Error in LLM parsing: {str(parsed)}")
+                results[idx]["evaluation_scores_json"] = evaluation
+            else:
+                results[idx]["evaluation_scores_json"] = self._parse_evaluation(
+                    parsed, evaluation
+                )
+        self.logger.info("Batch evaluation completed.")
+        return results
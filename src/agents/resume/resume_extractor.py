@@ -1,11 +1,17 @@
-from langchain.prompts import PromptTemplate
+from typing import Dict, Iterator, List
+
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import Runnable
 
 from src.agents.base_agent import BaseAgent
-from src.prompts.resume import RESUME_EXTRACTOR_PROMPT
+from src.prompts.chat import chat_prompt
+from src.prompts.resume import (
+    RESUME_EXTRACTOR_SYSTEM_PROMPT,
+    RESUME_EXTRACTOR_USER_PROMPT,
+)
 from src.config.config import EXTRACTOR_MODEL
 from src.models.get_model import get_model
+from src.utils.resume_splitter import map_resume_chunks, merge_json_outputs
 
 
 class ResumeExtractorAgent(BaseAgent):
@@ -14,16 +20,71 @@ class ResumeExtractorAgent(BaseAgent):
     def __init__(self):
         super().__init__()
         self.llm = get_model(EXTRACTOR_MODEL)
-        self.prompt_template = PromptTemplate.from_template(RESUME_EXTRACTOR_PROMPT)
+        self.prompt_template = chat_prompt(
+            RESUME_EXTRACTOR_SYSTEM_PROMPT, RESUME_EXTRACTOR_USER_PROMPT
+        )
         self.chain: Runnable = self.prompt_template | self.llm | StrOutputParser()
 
     def run(self, resume_text: str) -> str:
-        """Extracts information from the resume text."""
+        """Extracts information from the resume text.
+
+        Long resumes are split into sections that are extracted in parallel;
+        the JSON outputs are merged in section order.
+        """
         try:
             self.logger.info("Starting resume extraction...")
-            extracted_data = self.chain.invoke({"resume_text": resume_text})
+            outputs = map_resume_chunks(self.chain, [{"resume_text": resume_text}])[0]
+            extracted_data = merge_json_outputs(outputs)
             self.logger.info("Resume extraction successful.")
             return extracted_data
         except Exception as e:
             self.logger.error(f"An error occurred during resume extraction: {e}")
             return ""
+
+    def stream(self, resume_text: str) -> Iterator[str]:
+        """
+        Extracts information from the resume text, streaming the output.
+
+        Args:
+            resume_text: The resume text
+
+        Yields:
+            Chunks of the extracted details as they are generated
+        """
+        try:
+            self.logger.info("Starting streamed resume extraction...")
+            yield from self.chain.stream({"resume_text": resume_text})
+        except Exception as e:
+            self.logger.error(f"An error occurred during resume extraction: {e}")
+            raise RuntimeError("Failed to extract resume details") from e
+
+    def batch(self, resumes: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Extracts information from multiple resumes.
+
+        Args:
+            resumes: List of dictionaries containing resume_id and resume_text
+
+        Returns:
+            List of dictionaries containing resume_id and extracted_details
+            (an empty string when extraction failed)
+        """
+        self.logger.info(f"Starting batch extraction of {len(resumes)} resume(s)...")
+        outputs = map_resume_chunks(
+            self.chain,
+            [{"resume_text": resume["resume_text"]} for resume in resumes],
+            return_exceptions=True,
+        )
+        results = []
+        for resume, output in zip(resumes, outputs):
+            if isinstance(output, Exception):
+                self.logger.error(
+                    f"An error occurred during resume extraction: {output}"
+                )
+                output = ""
+            else:
+                output = merge_json_outputs(output)
+            results.append(
+                {"resume_id": resume["resume_id"], "extracted_details": output}
+            )
+        return results
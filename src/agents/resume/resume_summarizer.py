@@ -1,13 +1,17 @@
-from langchain.prompts import PromptTemplate
+from typing import Any, Dict, Iterator, List
+
 from langchain.schema import StrOutputParser
-from langchain.schema.runnable import Runnable
+from langchain.schema.runnable import Runnable, RunnableParallel
 
 from src.agents.base_agent import BaseAgent
+from src.prompts.chat import chat_prompt
 from src.prompts.resume import (
-    CEO_PROMPT,
-    CTO_PROMPT,
-    HR_PROMPT,
-    FINAL_SUMMARY_PROMPT,
+    CEO_SYSTEM_PROMPT,
+    CTO_SYSTEM_PROMPT,
+    HR_SYSTEM_PROMPT,
+    SUB_AGENT_USER_PROMPT,
+    FINAL_SUMMARY_SYSTEM_PROMPT,
+    FINAL_SUMMARY_USER_PROMPT,
 )
 from src.config.config import SUMMARIZER_MODEL
 from src.models.get_model import get_model
@@ -20,17 +24,33 @@ class ResumeSummarizerAgent(BaseAgent):
         super().__init__()
         self.llm = get_model(SUMMARIZER_MODEL)
 
-    def _create_sub_agent_chain(self, prompt: str) -> Runnable:
-        """Creates a chain for a sub-agent with the given prompt."""
-        return PromptTemplate.from_template(prompt) | self.llm | StrOutputParser()
+    def fingerprint(self) -> Dict[str, Any]:
+        """Agent settings plus the prompts of every sub-agent."""
+        return {
+            **super().fingerprint(),
+            "prompt": [
+                CEO_SYSTEM_PROMPT,
+                CTO_SYSTEM_PROMPT,
+                HR_SYSTEM_PROMPT,
+                SUB_AGENT_USER_PROMPT,
+                FINAL_SUMMARY_SYSTEM_PROMPT,
+                FINAL_SUMMARY_USER_PROMPT,
+            ],
+        }
+
+    def _create_sub_agent_chain(
+        self, system_prompt: str, user_prompt: str = SUB_AGENT_USER_PROMPT
+    ) -> Runnable:
+        """Creates a chain for a sub-agent with the given prompts."""
+        return chat_prompt(system_prompt, user_prompt) | self.llm | StrOutputParser()
 
     def run(self, resume_details: str, evaluation_scores: str) -> str:
         """Generates a summary based on multi-agent feedback."""
         try:
             self.logger.info("Generating feedback from sub-agents...")
-            ceo_chain = self._create_sub_agent_chain(CEO_PROMPT)
-            cto_chain = self._create_sub_agent_chain(CTO_PROMPT)
-            hr_chain = self._create_sub_agent_chain(HR_PROMPT)
+            ceo_chain = self._create_sub_agent_chain(CEO_SYSTEM_PROMPT)
+            cto_chain = self._create_sub_agent_chain(CTO_SYSTEM_PROMPT)
+            hr_chain = self._create_sub_agent_chain(HR_SYSTEM_PROMPT)
 
             ceo_feedback = ceo_chain.invoke(
                 {
@@ -55,7 +75,9 @@ class ResumeSummarizerAgent(BaseAgent):
             self.logger.info("Generated HR feedback.")
 
             self.logger.info("Synthesizing final summary...")
-            final_summary_chain = self._create_sub_agent_chain(FINAL_SUMMARY_PROMPT)
+            final_summary_chain = self._create_sub_agent_chain(
+                FINAL_SUMMARY_SYSTEM_PROMPT, FINAL_SUMMARY_USER_PROMPT
+            )
             final_summary = final_summary_chain.invoke(
                 {
                     "ceo_feedback": ceo_feedback,
@@ -69,3 +91,106 @@ class ResumeSummarizerAgent(BaseAgent):
         except Exception as e:
             self.logger.error(f"An error occurred during resume summarization: {e}")
             return ""
+
+    def stream(self, resume_details: str, evaluation_scores: str) -> Iterator[str]:
+        """
+        Generates a summary based on multi-agent feedback, streaming the summary.
+
+        The CEO, CTO and HR feedback is generated concurrently first; only the
+        final summary is streamed.
+
+        Args:
+            resume_details: Extracted details from the resume
+            evaluation_scores: Evaluation scores of the resume
+
+        Yields:
+            Chunks of the final summary as they are generated
+        """
+        try:
+            self.logger.info("Generating feedback from sub-agents...")
+            feedback = RunnableParallel(
+                ceo_feedback=self._create_sub_agent_chain(CEO_SYSTEM_PROMPT),
+                cto_feedback=self._create_sub_agent_chain(CTO_SYSTEM_PROMPT),
+                hr_feedback=self._create_sub_agent_chain(HR_SYSTEM_PROMPT),
+            ).invoke(
+                {
+                    "resume_details": resume_details,
+                    "evaluation_scores": evaluation_scores,
+                }
+            )
+
+            self.logger.info("Streaming final summary...")
+            yield from self._create_sub_agent_chain(
+                FINAL_SUMMARY_SYSTEM_PROMPT, FINAL_SUMMARY_USER_PROMPT
+            ).stream(feedback)
+        except Exception as e:
+            self.logger.error(f"An error occurred during resume summarization: {e}")
+            raise RuntimeError("Failed to summarize resume") from e
+
+    def batch(self, items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Generates summaries for multiple resumes.
+
+        Each sub-agent runs once over the whole batch, followed by the final
+        summary chain.
+
+        Args:
+            items: List of dictionaries containing resume_id, resume_details
+                   and evaluation_scores
+
+        Returns:
+            List of dictionaries containing resume_id and final_summary
+            (an empty string when summarization failed)
+        """
+        self.logger.info("Generating feedback from sub-agents...")
+        inputs = [
+            {
+                "resume_details": item["resume_details"],
+                "evaluation_scores": item["evaluation_scores"],
+            }
+            for item in items
+        ]
+        feedback = {
+            role: self._create_sub_agent_chain(prompt).batch(
+                inputs, return_exceptions=True
+            )
+            for role, prompt in (
+                ("ceo_feedback", CEO_SYSTEM_PROMPT),
+                ("cto_feedback", CTO_SYSTEM_PROMPT),
+                ("hr_feedback", HR_SYSTEM_PROMPT),
+            )
+        }
+
+        pending, summary_inputs = [], []
+        for idx in range(len(items)):
+            item_feedback = {role: outputs[idx] for role, outputs in feedback.items()}
+            errors = [
+                output
+                for output in item_feedback.values()
+                if isinstance(output, Exception)
+            ]
+            if errors:
+                self.logger.error(
+                    f"An error occurred during resume summarization: {errors[0]}"
+                )
+                continue
+            pending.append(idx)
+            summary_inputs.append(item_feedback)
+
+        self.logger.info("Synthesizing final summaries...")
+        summaries = [""] * len(items)
+        final_summaries = self._create_sub_agent_chain(
+            FINAL_SUMMARY_SYSTEM_PROMPT, FINAL_SUMMARY_USER_PROMPT
+        ).batch(summary_inputs, return_exceptions=True)
+        for idx, summary in zip(pending, final_summaries):
+            if isinstance(summary, Exception):
+                self.logger.error(
+                    f"An error occurred during resume summarization: {summary}"
+                )
+                continue
+            summaries[idx] = summary
+
+        return [
+            {"resume_id": item["resume_id"], "final_summary": summary}
+            for item, summary in zip(items, summaries)
+        ]
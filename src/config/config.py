@@ -7,7 +7,7 @@ load_dotenv()
 # You can swap out the model names here. It's also possible to use environment
 # variables to set these values for more flexibility.
 
-DEFAULT_API = "openrouter"  # Options: "openrouter", "openai", "huggingface"
+DEFAULT_API = "openrouter"  # Options: "openrouter", "openai", "huggingface", "local"
 
 match DEFAULT_API:
     case "openrouter" | "openai":
@@ -18,6 +18,10 @@ match DEFAULT_API:
         DEFAULT_MODEL = "mistralai/Mistral-7B-v0.1"
         BASE_URL = "https://api-inference.huggingface.co"
         API_KEY = os.environ.get("HUGGINGFACE_API_TOKEN", "")
+    case "local":
+        DEFAULT_MODEL = os.environ.get("LOCAL_MODEL", "Qwen/Qwen2.5-0.5B-Instruct")
+        BASE_URL = ""
+        API_KEY = ""
     case _:
         raise ValueError(f"Unsupported DEFAULT_API: {DEFAULT_API}")
 
@@ -27,6 +31,9 @@ REFORMATTER_MODEL = os.environ.get("REFORMATTER_MODEL", DEFAULT_MODEL)
 SUMMARIZER_MODEL = os.environ.get("SUMMARIZER_MODEL", DEFAULT_MODEL)
 ANONYMIZER_MODEL = os.environ.get("ANONYMIZER_MODEL", DEFAULT_MODEL)
 LOCALIZATION_MODEL = os.environ.get("LOCALIZATION_MODEL", DEFAULT_MODEL)
+FUSED_LOCALIZATION_MODEL = os.environ.get(
+    "FUSED_LOCALIZATION_MODEL", LOCALIZATION_MODEL
+)
 JOB_MODEL = os.environ.get("JOB_MODEL", DEFAULT_MODEL)
 
 
@@ -34,3 +41,192 @@ TEMPERATURE = float(os.environ.get("LLM_TEMPERATURE", 0.0))
 
 
 LOGGING_LEVEL = os.environ.get("LOGGING_LEVEL", "ERROR").upper()
+
+
+# --- RAG Configuration ---
+# Number of chunks retrieved per source type (sub-directory of data/rag_sources)
+# for every evaluation. Source types with a quota of 0 are not searched.
+RAG_SOURCE_QUOTAS = {
+    "past_resumes": int(os.environ.get("RAG_PAST_RESUMES_K", 2)),
+    "company_criteria": int(os.environ.get("RAG_COMPANY_CRITERIA_K", 1)),
+    "job_descriptions": int(os.environ.get("RAG_JOB_DESCRIPTIONS_K", 1)),
+}
+
+# Retrieval mode for the evaluator: "dense" (embeddings only), "lexical" (BM25
+# only, no embedding call per query) or "hybrid" (both, fused with RRF).
+RAG_RETRIEVAL_MODE = os.environ.get("RAG_RETRIEVAL_MODE", "hybrid")
+RAG_RRF_K = int(os.environ.get("RAG_RRF_K", 60))
+
+# Backend for HuggingFace embeddings: "torch" (sentence-transformers) or "onnx"
+# (ONNX Runtime with a dynamically int8-quantized model, exported on first use).
+HF_EMBEDDING_BACKEND = os.environ.get("HF_EMBEDDING_BACKEND", "torch")
+
+# Compact storage for the HuggingFace vector store partitions, applied when the
+# index is built. Quantization: "none", "int8" or "binary"; reduction: "none",
+# "pca" or "matryoshka" (Matryoshka-trained models only) to HF_INDEX_DIMENSIONS.
+HF_INDEX_QUANTIZATION = os.environ.get("HF_INDEX_QUANTIZATION", "none")
+HF_INDEX_REDUCTION = os.environ.get("HF_INDEX_REDUCTION", "none")
+HF_INDEX_DIMENSIONS = int(os.environ.get("HF_INDEX_DIMENSIONS", 0)) or None
+HF_INDEX_RESCORE_FACTOR = int(os.environ.get("HF_INDEX_RESCORE_FACTOR", 4))
+
+# Index versioning: readers check the CURRENT pointer of the partitioned index
+# at most every RAG_INDEX_POLL_INTERVAL seconds and swap in new versions; the
+# newest RAG_INDEX_KEEP_VERSIONS versions are kept on disk.
+RAG_INDEX_POLL_INTERVAL = float(os.environ.get("RAG_INDEX_POLL_INTERVAL", 30))
+RAG_INDEX_KEEP_VERSIONS = int(os.environ.get("RAG_INDEX_KEEP_VERSIONS", 3))
+
+# Anonymization: redact structured PII (emails, phones, NRIC, addresses, ...)
+# with compiled regexes before the LLM sees the resume. With
+# ANONYMIZER_LLM_IF_NEEDED, resumes without residual free-text identifiers
+# (names, companies, institutions) skip the LLM entirely.
+ANONYMIZER_PRESCRUB = os.environ.get("ANONYMIZER_PRESCRUB", "true").lower() == "true"
+ANONYMIZER_LLM_IF_NEEDED = (
+    os.environ.get("ANONYMIZER_LLM_IF_NEEDED", "false").lower() == "true"
+)
+
+# Generation budgets for the agents that rewrite a whole resume. A call may
+# generate up to `output_ratio` tokens per token of its user message, clamped
+# to [min_tokens, max_tokens], and stops early at any of the `stop` sequences.
+# Truncated responses (finish_reason "length") are retried with the budget
+# multiplied by GENERATION_RETRY_GROWTH, at most GENERATION_MAX_RETRIES times.
+GENERATION_BUDGETS = {
+    "anonymizer": {
+        "output_ratio": float(os.environ.get("ANONYMIZER_OUTPUT_RATIO", 1.5)),
+        "min_tokens": 256,
+        "max_tokens": int(os.environ.get("ANONYMIZER_MAX_TOKENS", 4096)),
+        "stop": [],
+    },
+    "reformatter": {
+        "output_ratio": float(os.environ.get("REFORMATTER_OUTPUT_RATIO", 2.0)),
+        "min_tokens": 256,
+        "max_tokens": int(os.environ.get("REFORMATTER_MAX_TOKENS", 4096)),
+        "stop": [],
+    },
+    "localizer": {
+        "output_ratio": float(os.environ.get("LOCALIZER_OUTPUT_RATIO", 1.5)),
+        "min_tokens": 256,
+        "max_tokens": int(os.environ.get("LOCALIZER_MAX_TOKENS", 4096)),
+        "stop": [],
+    },
+    # Up to three resumes when intermediates are requested; the localized
+    # resume is always the last section, so nothing after it is needed
+    "fused_localizer": {
+        "output_ratio": float(os.environ.get("FUSED_LOCALIZER_OUTPUT_RATIO", 4.0)),
+        "min_tokens": 512,
+        "max_tokens": int(os.environ.get("FUSED_LOCALIZER_MAX_TOKENS", 12288)),
+        "stop": ["</localized>"],
+    },
+}
+GENERATION_RETRY_GROWTH = float(os.environ.get("GENERATION_RETRY_GROWTH", 2.0))
+GENERATION_MAX_RETRIES = int(os.environ.get("GENERATION_MAX_RETRIES", 1))
+
+# Local generation (DEFAULT_API = "local"): concurrent requests are batched,
+# waiting at most LOCAL_MAX_WAIT_MS for up to LOCAL_MAX_BATCH_SIZE requests.
+# KV caches of shared prompt prefixes of at least LOCAL_MIN_PREFIX_TOKENS
+# tokens are reused; the LOCAL_PREFIX_CACHE_SIZE most recent ones are kept.
+LOCAL_DEVICE = os.environ.get("LOCAL_DEVICE", "auto")
+LOCAL_MAX_BATCH_SIZE = int(os.environ.get("LOCAL_MAX_BATCH_SIZE", 8))
+LOCAL_MAX_WAIT_MS = float(os.environ.get("LOCAL_MAX_WAIT_MS", 50))
+LOCAL_MAX_NEW_TOKENS = int(os.environ.get("LOCAL_MAX_NEW_TOKENS", 512))
+LOCAL_PREFIX_CACHE_SIZE = int(os.environ.get("LOCAL_PREFIX_CACHE_SIZE", 4))
+LOCAL_MIN_PREFIX_TOKENS = int(os.environ.get("LOCAL_MIN_PREFIX_TOKENS", 32))
+
+# Map-reduce processing of long resumes: resumes longer than
+# RESUME_CHUNK_MAX_CHARS characters are split at section headings and the
+# parts are processed in parallel (at most RESUME_CHUNK_MAX_CONCURRENCY calls
+# at a time; 0 uses LangChain's default). Set the size to 0 to disable.
+RESUME_CHUNK_MAX_CHARS = int(os.environ.get("RESUME_CHUNK_MAX_CHARS", 12000))
+RESUME_CHUNK_MAX_CONCURRENCY = (
+    int(os.environ.get("RESUME_CHUNK_MAX_CONCURRENCY", 0)) or None
+)
+
+# Stage outputs cached under a hash of their inputs (input text, prompts,
+# model, country, ...) when a pipeline is run with caching enabled
+STAGE_CACHE_DIR = os.environ.get("STAGE_CACHE_DIR", "results/stage_cache")
+
+# Name -> ethnicity/gender labels of OneShotNameAgent, stored per normalized
+# name. A name is sent to the LLM (once per resume) until it has
+# NAME_LABEL_SAMPLES_PER_NAME stored labels, by default one call per unique
+# name; after that its resumes get the most common label or, with
+# NAME_LABEL_SAMPLE, a label drawn from the label counts (seeded by
+# NAME_LABEL_SEED and the resume). Raise NAME_LABEL_SAMPLES_PER_NAME together
+# with NAME_LABEL_SAMPLE to sample from a distribution of labels.
+NAME_LABEL_TABLE_PATH = os.environ.get(
+    "NAME_LABEL_TABLE_PATH", "results/name_labels.json"
+)
+NAME_LABEL_SAMPLE = os.environ.get("NAME_LABEL_SAMPLE", "False").lower() == "true"
+NAME_LABEL_SEED = int(os.environ.get("NAME_LABEL_SEED", 0))
+NAME_LABEL_SAMPLES_PER_NAME = int(os.environ.get("NAME_LABEL_SAMPLES_PER_NAME", 1))
+
+# JobPipeline.batch generates company criteria once per group of jobs with
+# equal values of these fields ("description" compares a hash of the
+# normalized description); leave empty to generate them for every job
+JOB_CRITERIA_GROUP_BY = [
+    field.strip()
+    for field in os.environ.get(
+        "JOB_CRITERIA_GROUP_BY", "job_classification,job_type"
+    ).split(",")
+    if field.strip()
+]
+# Maximum number of concurrent LLM calls in JobPipeline.batch, shared by the
+# company criteria and previous hire stages
+JOB_MAX_CONCURRENCY = int(os.environ.get("JOB_MAX_CONCURRENCY", 8))
+
+# Maximum number of pipeline stages running at once in the DAG scheduler
+PIPELINE_MAX_CONCURRENCY = int(os.environ.get("PIPELINE_MAX_CONCURRENCY", 8))
+
+# Cascaded evaluation: a cheap first pass ("llm": CASCADE_SCREENER_MODEL
+# without RAG context, or "embedding": resume/job description similarity)
+# scores every resume from 0 to 10. Resumes scoring below
+# CASCADE_REJECT_BELOW or from CASCADE_ACCEPT_ABOVE with at least
+# CASCADE_MIN_CONFIDENCE are decided by it; the rest escalate to the full
+# evaluation. CASCADE_MIN_CONFIDENCE only applies to the LLM screener, since
+# the embedding screener reports no confidence. Embedding similarities are mapped linearly from
+# CASCADE_SIMILARITY_RANGE to 0-10. CASCADE_PASS_SCORE is the full-evaluation
+# score counted as a pass when calibrating the thresholds.
+EVALUATOR_CASCADE = os.environ.get("EVALUATOR_CASCADE", "False").lower() == "true"
+CASCADE_SCREENER = os.environ.get("CASCADE_SCREENER", "llm")
+CASCADE_SCREENER_MODEL = os.environ.get("CASCADE_SCREENER_MODEL", DEFAULT_MODEL)
+CASCADE_REJECT_BELOW = float(os.environ.get("CASCADE_REJECT_BELOW", 4.0))
+CASCADE_ACCEPT_ABOVE = float(os.environ.get("CASCADE_ACCEPT_ABOVE", 8.0))
+CASCADE_MIN_CONFIDENCE = float(os.environ.get("CASCADE_MIN_CONFIDENCE", 0.7))
+CASCADE_SIMILARITY_RANGE = tuple(
+    float(bound)
+    for bound in os.environ.get("CASCADE_SIMILARITY_RANGE", "0.2,0.7").split(",")
+)
+CASCADE_PASS_SCORE = float(os.environ.get("CASCADE_PASS_SCORE", 6.0))
+
+# Pre-ranking for HiringPipeline.batch: all resumes are embedded with
+# PRERANK_MODEL (a HuggingFace model, see HF_EMBEDDING_BACKEND) and only the
+# PRERANK_TOP_K most similar to the job description and/or those with a
+# cosine similarity of at least PRERANK_MIN_SCORE go through the full
+# pipeline. Leave both unset (0 / empty) to process every resume.
+PRERANK_MODEL = os.environ.get(
+    "PRERANK_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+)
+PRERANK_TOP_K = int(os.environ.get("PRERANK_TOP_K", 0)) or None
+PRERANK_MIN_SCORE = (
+    float(os.environ["PRERANK_MIN_SCORE"])
+    if os.environ.get("PRERANK_MIN_SCORE")
+    else None
+)
+
+# Duplicate resumes in batch_process_resumes / batch_hiring_pipeline: with
+# RESUME_DEDUP, resumes whose normalized text equals an earlier one reuse its
+# results. Near duplicates (Jaccard similarity of RESUME_DEDUP_SHINGLE_SIZE-word
+# shingles of at least RESUME_DEDUP_THRESHOLD, found with MinHash LSH) are
+# flagged, and reuse the results as well with RESUME_DEDUP_REUSE_NEAR.
+RESUME_DEDUP = os.environ.get("RESUME_DEDUP", "False").lower() == "true"
+RESUME_DEDUP_REUSE_NEAR = (
+    os.environ.get("RESUME_DEDUP_REUSE_NEAR", "False").lower() == "true"
+)
+RESUME_DEDUP_THRESHOLD = float(os.environ.get("RESUME_DEDUP_THRESHOLD", 0.9))
+RESUME_DEDUP_NUM_PERM = int(os.environ.get("RESUME_DEDUP_NUM_PERM", 128))
+RESUME_DEDUP_SHINGLE_SIZE = int(os.environ.get("RESUME_DEDUP_SHINGLE_SIZE", 5))
+
+# Items per Parquet row group / Arrow record batch when the pipeline_utils
+# batch helpers return Arrow tables or write Parquet files
+OUTPUT_ROW_GROUP_SIZE = int(os.environ.get("OUTPUT_ROW_GROUP_SIZE", 256))
+
+# Rows read at a time from CSV, JSONL and Parquet inputs of the batch helpers
+INPUT_CHUNK_SIZE = int(os.environ.get("INPUT_CHUNK_SIZE", 1000))
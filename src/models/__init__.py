@@ -1,4 +1,6 @@
+from .base_model import get_usage_report
 from .huggingface_model import HuggingFaceModel
+from .local_model import LocalHFModel
 from .openai_model import OpenAIModel
 
-__all__ = ["HuggingFaceModel", "OpenAIModel"]
+__all__ = ["HuggingFaceModel", "LocalHFModel", "OpenAIModel", "get_usage_report"]
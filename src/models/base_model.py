@@ -1,19 +1,197 @@
+import threading
 from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Iterator, Optional
+from langchain_core.messages import AIMessageChunk
+from langchain_core.messages.ai import add_usage
 from langchain_core.runnables import RunnableLambda
 from src.utils.logger import get_logger
-from src.config.config import BASE_URL, API_KEY, TEMPERATURE
+from src.config.config import (
+    BASE_URL,
+    API_KEY,
+    TEMPERATURE,
+    GENERATION_RETRY_GROWTH,
+    GENERATION_MAX_RETRIES,
+)
+
+# Rough characters per token, used to size generation budgets without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Token usage summed over every model instance in the process
+_TOTAL_USAGE = Counter()
+_USAGE_LOCK = threading.Lock()
+
+
+def _usage_report(usage: Counter) -> dict:
+    """Token counts plus the share of input tokens served from the prompt cache."""
+    report = {
+        key: usage.get(key, 0)
+        for key in ("calls", "input_tokens", "cached_input_tokens", "output_tokens")
+    }
+    report["cached_token_ratio"] = (
+        report["cached_input_tokens"] / report["input_tokens"]
+        if report["input_tokens"]
+        else 0.0
+    )
+    return report
+
+
+def get_usage_report() -> dict:
+    """
+    Return the token usage of all models since the process started.
+
+    Returns:
+        Dictionary with calls, input_tokens, cached_input_tokens,
+        output_tokens and cached_token_ratio
+    """
+    with _USAGE_LOCK:
+        return _usage_report(_TOTAL_USAGE)
 
 
 class BaseModel(RunnableLambda, ABC):
     """An abstract base class for all models in the pipeline."""
 
-    def __init__(self, api_url=None, api_key=None, temperature=None):
+    def __init__(
+        self, api_url=None, api_key=None, temperature=None, generation_budget=None
+    ):
         self.logger = get_logger(self.__class__.__name__)
         self.api_url = api_url or BASE_URL
         self.api_key = api_key or API_KEY
         self.temperature = temperature or TEMPERATURE
+        self.generation_budget = generation_budget
+        self._usage = Counter()
 
     @abstractmethod
     def invoke(self, *args, **kwargs):
         """The main entry point for the model's execution."""
         pass
+
+    @property
+    def usage(self) -> dict:
+        """Token usage of this model, including the cached token ratio."""
+        with _USAGE_LOCK:
+            return _usage_report(self._usage)
+
+    def _record_usage(self, response):
+        """Add the token usage reported with a chat response to the counters."""
+        usage_metadata = getattr(response, "usage_metadata", None)
+        if not usage_metadata:
+            return
+        input_details = usage_metadata.get("input_token_details") or {}
+        usage = Counter(
+            calls=1,
+            input_tokens=usage_metadata.get("input_tokens", 0),
+            cached_input_tokens=input_details.get("cache_read", 0) or 0,
+            output_tokens=usage_metadata.get("output_tokens", 0),
+        )
+        with _USAGE_LOCK:
+            self._usage.update(usage)
+            _TOTAL_USAGE.update(usage)
+        self.logger.debug(
+            f"Tokens: {usage['input_tokens']} in "
+            f"({usage['cached_input_tokens']} cached), {usage['output_tokens']} out"
+        )
+
+    def transform(self, input: Iterator, config=None, **kwargs) -> Iterator:
+        """
+        Stream the response to the prompt produced by the previous chain step.
+
+        Chains call `transform` on every step when they are streamed; the
+        prompt arrives in one piece, so it is collected and passed to `stream`.
+        """
+        prompt = None
+        for chunk in input:
+            prompt = chunk if prompt is None else prompt + chunk
+        yield from self.stream(prompt, config, **kwargs)
+
+    def _stream_within_budget(self, input, *args, **kwargs) -> Iterator:
+        """
+        Stream the underlying chat model within the generation budget, if any.
+
+        Chunks are yielded as they arrive, so truncated responses cannot be
+        retried; the token usage is recorded once the stream is finished.
+        """
+        if self.generation_budget:
+            if self.generation_budget.get("stop"):
+                kwargs["stop"] = self.generation_budget["stop"]
+            kwargs.update(self._budget_kwargs(self._output_budget(input)))
+        usage = None
+        for chunk in self.llm.stream(input, *args, **kwargs):
+            if getattr(chunk, "usage_metadata", None):
+                usage = add_usage(usage, chunk.usage_metadata)
+            yield chunk
+        if usage:
+            self._record_usage(AIMessageChunk(content="", usage_metadata=usage))
+
+    def _budget_kwargs(self, max_tokens: int) -> dict:
+        """Backend-specific invocation kwargs limiting the output to max_tokens."""
+        return {"max_tokens": max_tokens}
+
+    def _output_budget(self, input) -> int:
+        """
+        Output token budget for a prompt, from the length of its last message.
+
+        The last message holds the text being rewritten; the static system
+        prompt does not change how long the output should be.
+        """
+        if hasattr(input, "to_messages"):
+            input = input.to_messages()
+        if isinstance(input, list) and input:
+            input = input[-1]
+        text = getattr(input, "content", input)
+        input_tokens = len(str(text)) // CHARS_PER_TOKEN
+        budget = self.generation_budget
+        return int(
+            min(
+                budget["max_tokens"],
+                max(budget["min_tokens"], input_tokens * budget["output_ratio"]),
+            )
+        )
+
+    @staticmethod
+    def _is_truncated(response, max_tokens: Optional[int] = None) -> bool:
+        """Whether generation stopped at the token limit rather than naturally."""
+        metadata = getattr(response, "response_metadata", None) or {}
+        if metadata.get("finish_reason") == "length":
+            return True
+        # Backends without a finish reason: a response that used the whole budget
+        usage_metadata = getattr(response, "usage_metadata", None) or {}
+        return (
+            "finish_reason" not in metadata
+            and max_tokens is not None
+            and usage_metadata.get("output_tokens", 0) >= max_tokens
+        )
+
+    def _invoke_within_budget(self, input, *args, **kwargs):
+        """
+        Call the underlying chat model within the generation budget, if any.
+
+        Truncated responses are retried with a larger budget, up to the budget's
+        max_tokens and GENERATION_MAX_RETRIES times. The last response is
+        returned even if it is still truncated, so tail latency stays bounded.
+        """
+        if not self.generation_budget:
+            response = self.llm.invoke(input, *args, **kwargs)
+            self._record_usage(response)
+            return response
+
+        cap = self.generation_budget["max_tokens"]
+        stop = self.generation_budget.get("stop")
+        if stop:
+            kwargs["stop"] = stop
+        max_tokens = self._output_budget(input)
+        for attempt in range(GENERATION_MAX_RETRIES + 1):
+            response = self.llm.invoke(
+                input, *args, **kwargs, **self._budget_kwargs(max_tokens)
+            )
+            self._record_usage(response)
+            if not self._is_truncated(response, max_tokens):
+                return response
+            if attempt == GENERATION_MAX_RETRIES or max_tokens >= cap:
+                break
+            max_tokens = min(cap, int(max_tokens * GENERATION_RETRY_GROWTH))
+            self.logger.warning(
+                f"Response truncated, retrying with max_tokens={max_tokens}"
+            )
+        self.logger.warning(f"Response still truncated at max_tokens={max_tokens}")
+        return response
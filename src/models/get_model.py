@@ -1,23 +1,49 @@
-from src.config.config import DEFAULT_API, DEFAULT_MODEL, TEMPERATURE
+from src.config.config import (
+    DEFAULT_API,
+    DEFAULT_MODEL,
+    TEMPERATURE,
+    GENERATION_BUDGETS,
+)
 
-from src.models import HuggingFaceModel, OpenAIModel
+from src.models import HuggingFaceModel, LocalHFModel, OpenAIModel
 
 
-def get_model(model_name: str = None, temperature: float = TEMPERATURE):
+def get_model(
+    model_name: str = None, temperature: float = TEMPERATURE, budget: str = None
+):
     """
     Returns a chat model instance based on the config setting and model name.
 
     Args:
         model_name (str, optional): The name of the model to use. Defaults to config value.
+        budget (str, optional): Key of the generation budget in GENERATION_BUDGETS
+            (e.g. "reformatter"). Without one, output length is not limited.
 
     Returns:
         An instance of the selected chat model.
     """
     model_name = model_name or DEFAULT_MODEL
+    if budget is not None and budget not in GENERATION_BUDGETS:
+        raise ValueError(f"Unknown generation budget: {budget}")
+    generation_budget = GENERATION_BUDGETS.get(budget)
 
     if DEFAULT_API == "huggingface":
-        return HuggingFaceModel(model_name=model_name, temperature=temperature)
+        return HuggingFaceModel(
+            model_name=model_name,
+            temperature=temperature,
+            generation_budget=generation_budget,
+        )
+    elif DEFAULT_API == "local":
+        return LocalHFModel(
+            model_name=model_name,
+            temperature=temperature,
+            generation_budget=generation_budget,
+        )
     elif DEFAULT_API in ("openrouter", "openai"):
-        return OpenAIModel(model_name=model_name, temperature=temperature)
+        return OpenAIModel(
+            model_name=model_name,
+            temperature=temperature,
+            generation_budget=generation_budget,
+        )
     else:
         raise ValueError(f"Unsupported DEFAULT_API: {DEFAULT_API}")
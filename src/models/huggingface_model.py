@@ -17,8 +17,15 @@ class HuggingFaceModel(BaseModel, Runnable):
         max_new_tokens=512,
         do_sample=False,
         repetition_penalty=1.03,
+        generation_budget=None,
     ):
-        super().__init__(api_url=api_url, api_key=api_key, temperature=temperature)
+        super().__init__(
+            api_url=api_url,
+            api_key=api_key,
+            temperature=temperature,
+            generation_budget=generation_budget,
+        )
+        self.model_name = model_name
         llm = HuggingFacePipeline.from_model_id(
             model_id=model_name,
             task="text-generation",
@@ -45,14 +52,17 @@ class HuggingFaceModel(BaseModel, Runnable):
         """
         try:
             self.logger.info("Invoking HuggingFace model...")
-            response = self.llm.invoke(input, *args, **kwargs)
-            return response
+            return self._invoke_within_budget(input, *args, **kwargs)
         except Exception as e:
             self.logger.error(
                 f"Error invoking HuggingFace model: {str(e)}", exc_info=True
             )
             raise RuntimeError("Failed to invoke HuggingFace model") from e
 
+    def _budget_kwargs(self, max_tokens: int) -> dict:
+        """The local pipeline takes its token limit as a pipeline kwarg."""
+        return {"pipeline_kwargs": {"max_new_tokens": max_tokens}}
+
     def stream(self, input, *args, **kwargs):
         """
         LangChain Runnable interface: stream method.
@@ -63,8 +73,7 @@ class HuggingFaceModel(BaseModel, Runnable):
         """
         try:
             self.logger.info("Streaming HuggingFace model response...")
-            for chunk in self.llm.stream(input, *args, **kwargs):
-                yield chunk
+            yield from self._stream_within_budget(input, *args, **kwargs)
         except Exception as e:
             self.logger.error(
                 f"Error streaming HuggingFace model: {str(e)}", exc_info=True
@@ -0,0 +1,524 @@
+"""
+Local HuggingFace generation with dynamic batching and prefix KV caching.
+
+Concurrent requests, e.g. from `chain.batch`, are queued and generated
+together: a worker thread waits up to LOCAL_MAX_WAIT_MS for up to
+LOCAL_MAX_BATCH_SIZE compatible requests and pads them into a single
+`generate` call. When the prompts of a batch share a long token prefix (the
+static system prompt), the KV cache of that prefix is computed once, kept in
+a small LRU cache and reused, so only the variable part of each prompt is
+prefilled. Prompts are padded between the shared prefix and their own tokens,
+which keeps the cached prefix at the same positions for every row. Each row
+stops at its own output limit, stop sequence or end token.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from src.models.base_model import BaseModel
+from src.utils.logger import get_logger
+from src.config.config import (
+    LOCAL_DEVICE,
+    LOCAL_MAX_BATCH_SIZE,
+    LOCAL_MAX_WAIT_MS,
+    LOCAL_MAX_NEW_TOKENS,
+    LOCAL_PREFIX_CACHE_SIZE,
+    LOCAL_MIN_PREFIX_TOKENS,
+)
+
+logger = get_logger(__name__)
+
+# LangChain message types to chat template roles
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+# One generator per model, shared by every agent using that model
+_GENERATORS: Dict[str, "LocalGenerator"] = {}
+_GENERATORS_LOCK = threading.Lock()
+
+
+class _GenerationRequest(NamedTuple):
+    prompt_ids: List[int]
+    max_new_tokens: int
+    # Only requests with the same stop sequences and temperature share a batch
+    key: Tuple[Tuple[str, ...], float]
+    enqueued_at: float
+    future: Future
+
+
+def _stop_sequences_criteria(tokenizer, stop: Tuple[str, ...], prompt_length: int):
+    """
+    Stopping criteria that end each row once its output contains a stop sequence.
+
+    Only the last few tokens of every row are decoded at each step, which is
+    enough since every token decodes to at least one character.
+    """
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    window = max(len(sequence) for sequence in stop) + 1
+
+    class StopOnSequences(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            tails = tokenizer.batch_decode(
+                input_ids[:, prompt_length:][:, -window:], skip_special_tokens=True
+            )
+            return torch.tensor(
+                [any(sequence in tail for sequence in stop) for tail in tails],
+                dtype=torch.bool,
+                device=input_ids.device,
+            )
+
+    return StoppingCriteriaList([StopOnSequences()])
+
+
+def _max_new_tokens_criteria(limits: List[int], prompt_length: int):
+    """
+    Stopping criteria that end each row once it has its own number of new tokens.
+
+    `generate` only applies one max_new_tokens to the whole batch (the
+    largest); this finishes the other rows earlier, and the batch ends as
+    soon as every row is finished.
+    """
+    import torch
+    from transformers import StoppingCriteria
+
+    class StopAtRowLimit(StoppingCriteria):
+        def __init__(self):
+            self.limits = None
+
+        def __call__(self, input_ids, scores, **kwargs):
+            if self.limits is None:
+                self.limits = torch.tensor(limits, device=input_ids.device)
+            return input_ids.shape[1] - prompt_length >= self.limits
+
+    return StopAtRowLimit()
+
+
+class LocalGenerator:
+    """Batches generation requests for a local causal language model."""
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        model_name: str = "local",
+        max_batch_size: int = LOCAL_MAX_BATCH_SIZE,
+        max_wait_ms: float = LOCAL_MAX_WAIT_MS,
+        max_new_tokens: int = LOCAL_MAX_NEW_TOKENS,
+        prefix_cache_size: int = LOCAL_PREFIX_CACHE_SIZE,
+        min_prefix_tokens: int = LOCAL_MIN_PREFIX_TOKENS,
+    ):
+        """
+        Start the batching worker for a loaded model.
+
+        Args:
+            model: A transformers causal language model
+            tokenizer: The model's tokenizer
+            model_name: Name reported in the response metadata
+            max_batch_size: Maximum number of requests per `generate` call
+            max_wait_ms: How long the first request of a batch waits for more
+            max_new_tokens: Output limit for requests that do not set one
+            prefix_cache_size: Number of prefix KV caches kept (0 disables reuse)
+            min_prefix_tokens: Shortest shared prefix worth caching
+        """
+        self.model = model.eval()
+        self.tokenizer = tokenizer
+        if self.tokenizer.pad_token_id is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_new_tokens = max_new_tokens
+        self.prefix_cache_size = prefix_cache_size
+        self.min_prefix_tokens = min_prefix_tokens
+
+        eos = self.model.generation_config.eos_token_id
+        eos = eos if isinstance(eos, list) else [eos]
+        self._end_ids = {i for i in eos if i is not None}
+        self._end_ids.add(self.tokenizer.pad_token_id)
+
+        self._queue: List[_GenerationRequest] = []
+        self._condition = threading.Condition()
+        self._prefix_cache = OrderedDict()
+        self._metrics = Counter()
+        self._metrics_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._serve, daemon=True)
+        self._worker.start()
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Throughput counters since the generator was created.
+
+        Returns:
+            Dictionary with requests, batches, mean_batch_size, prompt_tokens,
+            reused_prefix_tokens (prompt tokens whose KV entries came from the
+            prefix cache), prefix_cache_hits, generated_tokens,
+            generation_seconds and tokens_per_second
+        """
+        with self._metrics_lock:
+            metrics = {
+                key: self._metrics.get(key, 0)
+                for key in (
+                    "requests",
+                    "batches",
+                    "prompt_tokens",
+                    "reused_prefix_tokens",
+                    "prefix_cache_hits",
+                    "generated_tokens",
+                    "generation_seconds",
+                )
+            }
+        metrics["mean_batch_size"] = (
+            metrics["requests"] / metrics["batches"] if metrics["batches"] else 0.0
+        )
+        metrics["tokens_per_second"] = (
+            metrics["generated_tokens"] / metrics["generation_seconds"]
+            if metrics["generation_seconds"]
+            else 0.0
+        )
+        return metrics
+
+    def _render(self, input) -> str:
+        """Turn a prompt value, message list or string into the model's prompt text."""
+        if hasattr(input, "to_messages"):
+            input = input.to_messages()
+        if isinstance(input, str):
+            return input
+        messages = [
+            {"role": _ROLES.get(message.type, message.type), "content": message.content}
+            for message in input
+        ]
+        if self.tokenizer.chat_template:
+            return self.tokenizer.apply_chat_template(
+                messages, tokenize=False, add_generation_prompt=True
+            )
+        return (
+            "\n\n".join(f"{m['role']}: {m['content']}" for m in messages)
+            + "\n\nassistant:"
+        )
+
+    def submit(
+        self,
+        prompt: str,
+        max_new_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None,
+        temperature: float = 0.0,
+    ) -> Future:
+        """
+        Queue a prompt for generation.
+
+        Args:
+            prompt: The rendered prompt text
+            max_new_tokens: Output token limit, LOCAL_MAX_NEW_TOKENS by default
+            stop: Sequences that end the generation (not included in the output)
+            temperature: Sampling temperature; 0 decodes greedily
+
+        Returns:
+            A future resolving to a dictionary with text, finish_reason,
+            prompt_tokens, cached_tokens and completion_tokens
+        """
+        prompt_ids = self.tokenizer(
+            prompt, add_special_tokens=not self.tokenizer.chat_template
+        )["input_ids"]
+        request = _GenerationRequest(
+            prompt_ids=prompt_ids,
+            max_new_tokens=max_new_tokens or self.max_new_tokens,
+            key=(tuple(stop or ()), float(temperature or 0.0)),
+            enqueued_at=time.monotonic(),
+            future=Future(),
+        )
+        with self._condition:
+            self._queue.append(request)
+            self._condition.notify()
+        return request.future
+
+    def invoke(
+        self,
+        input,
+        config=None,
+        stop: Optional[List[str]] = None,
+        max_new_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+    ) -> AIMessage:
+        """Generate a response, batched with any concurrent requests."""
+        output = self.submit(
+            self._render(input), max_new_tokens, stop, temperature
+        ).result()
+        return AIMessage(
+            content=output["text"],
+            response_metadata={
+                "finish_reason": output["finish_reason"],
+                "model_name": self.model_name,
+            },
+            usage_metadata={
+                "input_tokens": output["prompt_tokens"],
+                "output_tokens": output["completion_tokens"],
+                "total_tokens": output["prompt_tokens"] + output["completion_tokens"],
+                "input_token_details": {"cache_read": output["cached_tokens"]},
+            },
+        )
+
+    def stream(self, input, config=None, **kwargs) -> Iterator[AIMessageChunk]:
+        """Generate a response as a single chunk; batched outputs finish together."""
+        message = self.invoke(input, config, **kwargs)
+        yield AIMessageChunk(
+            content=message.content,
+            response_metadata=message.response_metadata,
+            usage_metadata=message.usage_metadata,
+        )
+
+    def _next_batch(self) -> List[_GenerationRequest]:
+        """Wait for the oldest request, then for compatible ones until the window closes."""
+        with self._condition:
+            while not self._queue:
+                self._condition.wait()
+            first = self._queue[0]
+            deadline = first.enqueued_at + self.max_wait
+            while True:
+                batch = [r for r in self._queue if r.key == first.key]
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.max_batch_size or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch = batch[: self.max_batch_size]
+            for request in batch:
+                self._queue.remove(request)
+        return batch
+
+    def _serve(self):
+        """Worker loop: generate batches and resolve their futures."""
+        while True:
+            batch = self._next_batch()
+            try:
+                outputs = self._generate(batch)
+            except Exception as e:
+                logger.error(f"Local generation failed: {str(e)}", exc_info=True)
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            for request, output in zip(batch, outputs):
+                request.future.set_result(output)
+
+    def _get_prefix_cache(self, prefix: Tuple[int, ...]):
+        """Return the KV cache of a token prefix, computing it on a miss."""
+        import torch
+
+        cache = self._prefix_cache.get(prefix)
+        if cache is not None:
+            self._prefix_cache.move_to_end(prefix)
+            return cache, True
+        with torch.inference_mode():
+            cache = self.model(
+                torch.tensor([prefix], device=self.model.device), use_cache=True
+            ).past_key_values
+        self._prefix_cache[prefix] = cache
+        while len(self._prefix_cache) > self.prefix_cache_size:
+            self._prefix_cache.popitem(last=False)
+        return cache, False
+
+    def _generate(self, batch: List[_GenerationRequest]) -> List[dict]:
+        """Generate all requests of a batch with one padded `generate` call."""
+        import torch
+        from transformers import StoppingCriteriaList
+
+        prompts = [request.prompt_ids for request in batch]
+        stop, temperature = batch[0].key
+
+        # Shared prefix, leaving at least one token per prompt to prefill
+        prefix_length = len(os.path.commonprefix(prompts))
+        prefix_length = min(prefix_length, min(len(p) for p in prompts) - 1)
+        past_key_values, cache_hit = None, False
+        if self.prefix_cache_size and prefix_length >= self.min_prefix_tokens:
+            cache, cache_hit = self._get_prefix_cache(tuple(prompts[0][:prefix_length]))
+            past_key_values = copy.deepcopy(cache)
+            if len(batch) > 1:
+                past_key_values.batch_repeat_interleave(len(batch))
+        else:
+            prefix_length = 0
+
+        # Pad between the prefix and the rest of each prompt
+        width = max(len(p) for p in prompts) - prefix_length
+        pad_id = self.tokenizer.pad_token_id
+        input_ids, attention_mask = [], []
+        for prompt in prompts:
+            padding = width - (len(prompt) - prefix_length)
+            input_ids.append(
+                prompt[:prefix_length] + [pad_id] * padding + prompt[prefix_length:]
+            )
+            attention_mask.append(
+                [1] * prefix_length
+                + [0] * padding
+                + [1] * (len(prompt) - prefix_length)
+            )
+
+        generate_kwargs = dict(
+            max_new_tokens=max(request.max_new_tokens for request in batch),
+            pad_token_id=pad_id,
+            do_sample=temperature > 0,
+        )
+        if temperature > 0:
+            generate_kwargs["temperature"] = temperature
+        stopping_criteria = StoppingCriteriaList()
+        if stop:
+            stopping_criteria.extend(
+                _stop_sequences_criteria(self.tokenizer, stop, len(input_ids[0]))
+            )
+        limits = [request.max_new_tokens for request in batch]
+        if len(set(limits)) > 1:
+            stopping_criteria.append(
+                _max_new_tokens_criteria(limits, len(input_ids[0]))
+            )
+        if stopping_criteria:
+            generate_kwargs["stopping_criteria"] = stopping_criteria
+
+        start = time.perf_counter()
+        with torch.inference_mode():
+            sequences = self.model.generate(
+                input_ids=torch.tensor(input_ids, device=self.model.device),
+                attention_mask=torch.tensor(attention_mask, device=self.model.device),
+                past_key_values=past_key_values,
+                **generate_kwargs,
+            )
+        elapsed = time.perf_counter() - start
+
+        outputs = []
+        for request, row in zip(batch, sequences[:, len(input_ids[0]) :].tolist()):
+            tokens = row[: request.max_new_tokens]
+            end = next((i for i, t in enumerate(tokens) if t in self._end_ids), None)
+            finished = end is not None
+            tokens = tokens[:end]
+            text = self.tokenizer.decode(tokens, skip_special_tokens=True)
+            for sequence in stop:
+                position = text.find(sequence)
+                if position >= 0:
+                    text, finished = text[:position], True
+            outputs.append(
+                {
+                    "text": text,
+                    "finish_reason": (
+                        "stop"
+                        if finished or len(tokens) < request.max_new_tokens
+                        else "length"
+                    ),
+                    "prompt_tokens": len(request.prompt_ids),
+                    "cached_tokens": prefix_length if cache_hit else 0,
+                    "completion_tokens": len(tokens),
+                }
+            )
+
+        generated = sum(output["completion_tokens"] for output in outputs)
+        with self._metrics_lock:
+            self._metrics.update(
+                requests=len(batch),
+                batches=1,
+                prompt_tokens=sum(len(p) for p in prompts),
+                # Only prefixes served from the cache; a miss computes them
+                reused_prefix_tokens=prefix_length * len(batch) if cache_hit else 0,
+                prefix_cache_hits=int(cache_hit),
+                generated_tokens=generated,
+                generation_seconds=elapsed,
+            )
+        logger.debug(
+            f"Generated {generated} tokens for {len(batch)} request(s) in "
+            f"{elapsed:.2f}s ({generated / elapsed:.1f} tokens/s), "
+            f"shared prefix {prefix_length} tokens"
+        )
+        return outputs
+
+
+def get_local_generator(model_name: str) -> LocalGenerator:
+    """
+    Load a model for local generation, or return the already loaded one.
+
+    Args:
+        model_name: HuggingFace model id or local path of a causal LM
+
+    Returns:
+        The model's LocalGenerator
+    """
+    with _GENERATORS_LOCK:
+        if model_name not in _GENERATORS:
+            try:
+                import torch
+                from transformers import AutoModelForCausalLM, AutoTokenizer
+            except ImportError as e:
+                raise ImportError(
+                    "Local generation backend not available. "
+                    "Install it with `pip install torch transformers`."
+                ) from e
+
+            device = LOCAL_DEVICE
+            if device == "auto":
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+            logger.info(f"Loading {model_name} for local generation on {device}...")
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = AutoModelForCausalLM.from_pretrained(
+                model_name,
+                dtype=torch.float16 if device == "cuda" else torch.float32,
+            ).to(device)
+            _GENERATORS[model_name] = LocalGenerator(
+                model, tokenizer, model_name=model_name
+            )
+        return _GENERATORS[model_name]
+
+
+class LocalHFModel(BaseModel):
+    """
+    Model wrapper for local HuggingFace generation with dynamic batching.
+    """
+
+    def __init__(self, model_name, temperature=None, generation_budget=None):
+        super().__init__(temperature=temperature, generation_budget=generation_budget)
+        self.model_name = model_name
+        self.llm = get_local_generator(model_name)
+
+    @property
+    def metrics(self) -> dict:
+        """Throughput counters of the shared generator, including tokens/sec."""
+        return self.llm.metrics
+
+    def _budget_kwargs(self, max_tokens: int) -> dict:
+        """The local generator takes its token limit as max_new_tokens."""
+        return {"max_new_tokens": max_tokens}
+
+    def invoke(self, input, *args, **kwargs):
+        """
+        Generate a response locally, batched with concurrent requests.
+
+        Args:
+            input: The input prompt.
+            **kwargs: Additional parameters for the generator.
+
+        Returns:
+            The model's response message.
+        """
+        try:
+            kwargs.setdefault("temperature", self.temperature)
+            return self._invoke_within_budget(input, *args, **kwargs)
+        except Exception as e:
+            self.logger.error(f"Error invoking local model: {str(e)}", exc_info=True)
+            raise RuntimeError("Failed to invoke local model") from e
+
+    def stream(self, input, *args, **kwargs):
+        """
+        Stream a locally generated response (as a single chunk).
+
+        Args:
+            input: The input prompt.
+
+        Yields:
+            Message chunks of the model's response.
+        """
+        try:
+            kwargs.setdefault("temperature", self.temperature)
+            yield from self._stream_within_budget(input, *args, **kwargs)
+        except Exception as e:
+            self.logger.error(f"Error streaming local model: {str(e)}", exc_info=True)
+            raise RuntimeError("Failed to stream local model") from e
@@ -7,8 +7,21 @@ class OpenAIModel(BaseModel):
     Model wrapper for OpenAI's Chat API.
     """
 
-    def __init__(self, model_name, base_url=None, api_key=None, temperature=None):
-        super().__init__(api_url=base_url, api_key=api_key, temperature=temperature)
+    def __init__(
+        self,
+        model_name,
+        base_url=None,
+        api_key=None,
+        temperature=None,
+        generation_budget=None,
+    ):
+        super().__init__(
+            api_url=base_url,
+            api_key=api_key,
+            temperature=temperature,
+            generation_budget=generation_budget,
+        )
+        self.model_name = model_name
         self.llm = ChatOpenAI(
             model=model_name,
             base_url=self.api_url,
@@ -29,8 +42,27 @@ class OpenAIModel(BaseModel):
         """
         try:
             self.logger.info("Invoking OpenAI model...")
-            response = self.llm.invoke(prompt, *args, **kwargs)
-            return response
+            return self._invoke_within_budget(prompt, *args, **kwargs)
         except Exception as e:
             self.logger.error(f"Error invoking OpenAI model: {str(e)}", exc_info=True)
             raise RuntimeError("Failed to invoke OpenAI model") from e
+
+    def stream(self, prompt, *args, **kwargs):
+        """
+        Stream the OpenAI model's response to a prompt.
+
+        Args:
+            prompt: The input prompt string.
+            **kwargs: Additional parameters for the model.
+
+        Yields:
+            Message chunks of the model's response.
+        """
+        try:
+            self.logger.info("Streaming OpenAI model response...")
+            # Ask for the token usage in the last chunk
+            kwargs.setdefault("stream_usage", True)
+            yield from self._stream_within_budget(prompt, *args, **kwargs)
+        except Exception as e:
+            self.logger.error(f"Error streaming OpenAI model: {str(e)}", exc_info=True)
+            raise RuntimeError("Failed to stream OpenAI model") from e
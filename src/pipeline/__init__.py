@@ -5,6 +5,7 @@ This package provides tools for processing resumes, including localization and
 anonymization.
 """
 
+from .dag import DAG, Stage
 from .localization_pipeline import LocalizationPipeline
 from .hiring_pipeline import HiringPipeline
 from .job_pipeline import JobPipeline
@@ -12,6 +13,8 @@ from .analysis_pipeline import RaceAnalysisPipeline, JobAnalysisPipeline
 
 
 __all__ = [
+    "DAG",
+    "Stage",
     "LocalizationPipeline",
     "HiringPipeline",
     "JobPipeline",
@@ -5,8 +5,10 @@ This module provides a unified interface for analyzing resumes,
 including name and demographic predictions.
 """
 
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 from src.pipeline.base_pipeline import BasePipeline
+from src.pipeline.dag import Stage
+from src.utils.name_label_table import NameLabelTable
 from ..agents.analysis import OneShotNameAgent, OneShotResumeAgent
 
 
@@ -15,42 +17,99 @@ class RaceAnalysisPipeline(BasePipeline):
     A pipeline for analyzing resumes to extract names and demographic information.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        label_table: Optional[NameLabelTable] = None,
+        attributes: Sequence[str] = ("name",),
+    ):
         """
         Initialize the analysis pipeline with agents for name and demographic extraction.
+
+        Args:
+            label_table: Optional persistent name -> ethnicity table, so names
+                         with enough labels from earlier runs are not sent to
+                         the LLM again
+            attributes: Resume attributes to extract besides the ethnicity
+                        ("name", "age", "work_experience"). The name is always
+                        extracted; several attributes are extracted with a
+                        single combined call per resume.
         """
         super().__init__()
-        self.name_agent = OneShotResumeAgent(mode="name")
-        self.ethnicity_agent = OneShotNameAgent(mode="ethnicity")
+        attributes = ["name"] + [a for a in attributes if a != "name"]
+        self.combined = len(attributes) > 1
+        self.name_agent = (
+            OneShotResumeAgent(mode="combined", attributes=attributes)
+            if self.combined
+            else OneShotResumeAgent(mode="name")
+        )
+        self.ethnicity_agent = OneShotNameAgent(
+            mode="ethnicity", label_table=label_table
+        )
+
+    def _extract(self, resume_text: str) -> Dict[str, Any]:
+        extracted = self.name_agent.run(resume_text)
+        return extracted if self.combined else {"name": extracted}
 
-    def run(self, resume_content: str) -> Dict[str, str]:
+    def _stages(self) -> List[Stage]:
+        """The attribute extraction and ethnicity stages of a single resume."""
+        return [
+            Stage(
+                "attributes",
+                self._extract,
+                {"resume_text": "resume_text"},
+                "extracted",
+                agent=self.name_agent,
+                validate=lambda output: bool(output.get("name")),
+            ),
+            Stage(
+                "ethnicity",
+                lambda extracted: self.ethnicity_agent.run(extracted["name"]),
+                {"extracted": "extracted"},
+                "ethnicity",
+                agent=self.ethnicity_agent,
+            ),
+        ]
+
+    def run(self, resume_content: str) -> Dict[str, Any]:
         """
         Analyze a resume to extract the name and ethnicity.
         """
         try:
-            name = self.name_agent.run(resume_content)
-            ethnicity = self.ethnicity_agent.run(name)
-            return {"name": name, "ethnicity": ethnicity}
+            outputs = self._dag(self._stages()).run({"resume_text": resume_content})
+            if outputs["errors"]:
+                stage, error = next(iter(outputs["errors"].items()))
+                raise RuntimeError(f"The {stage} stage failed: {error}")
+            return {**outputs["extracted"], "ethnicity": outputs["ethnicity"]}
         except Exception as e:
             self.logger.log(f"Error processing resume: {e}")
             raise RuntimeError(f"Failed to analyze resume: {str(e)}")
 
-    def batch(self, resumes: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    def batch(self, resumes: List[Dict[str, str]]) -> List[Dict[str, Any]]:
         """
         Process multiple resumes in batch.
         """
         results = []
         try:
-            names = self.name_agent.batch(resumes)
+            extracted = {}
+            for item in self.name_agent.batch(resumes):
+                if "error" in item:
+                    results.append(item)
+                elif self.combined:
+                    extracted[item["resume_id"]] = item["extracted"]
+                else:
+                    extracted[item["resume_id"]] = {"name": item["extracted"]}
             names = [
-                {"resume_id": item["resume_id"], "name": item["extracted"]}
-                for item in names
+                {"resume_id": resume_id, "name": fields["name"] or ""}
+                for resume_id, fields in extracted.items()
             ]
             ethnicities = self.ethnicity_agent.batch(names)
             for ethnicity in ethnicities:
+                if "error" in ethnicity:
+                    results.append(ethnicity)
+                    continue
                 result = {
                     "resume_id": ethnicity["resume_id"],
-                    "name": ethnicity["name"],
+                    **extracted[ethnicity["resume_id"]],
                     "ethnicity": ethnicity["extracted"],
                 }
                 results.append(result)
@@ -65,38 +124,55 @@ class JobAnalysisPipeline(BasePipeline):
     A pipeline for analyzing job descriptions to extract relevant information.
     """
 
-    def __init__(self):
+    def __init__(self, attributes: Sequence[str] = ("work_experience",)):
         """
         Initialize the job analysis pipeline with agents for job classification and type extraction.
+
+        Args:
+            attributes: Resume attributes to extract ("name", "age",
+                        "work_experience"); several attributes are extracted
+                        with a single combined call per resume
         """
         super().__init__()
-        self.job_extraction_agent = OneShotResumeAgent(mode="work_experience")
+        self.combined = len(attributes) > 1
+        self.job_extraction_agent = (
+            OneShotResumeAgent(mode="combined", attributes=attributes)
+            if self.combined
+            else OneShotResumeAgent(mode=attributes[0])
+        )
+        self.attribute = attributes[0]
 
     def run(
         self,
         resume_text: str,
-    ) -> Dict[str, str]:
+    ) -> Dict[str, Any]:
         """
         Analyze a job description to extract classification and type.
         """
         try:
             classification = self.job_extraction_agent.run(resume_text)
-            return {"work_experience": classification}
+            if self.combined:
+                return classification
+            return {self.attribute: classification}
         except Exception as e:
             self.logger.log(f"Error processing job description: {e}")
             raise RuntimeError(f"Failed to analyze job description: {str(e)}")
 
-    def batch(self, resumes: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    def batch(self, resumes: List[Dict[str, str]]) -> List[Dict[str, Any]]:
         """
         Process multiple job descriptions in batch.
         """
         results = []
         try:
             classifications = self.job_extraction_agent.batch(resumes)
-            for idx, resume in enumerate(resumes):
+            for classification in classifications:
+                if "error" in classification:
+                    results.append(classification)
+                    continue
+                extracted = classification["extracted"]
                 result = {
-                    "resume_id": resume["resume_id"],
-                    "work_experience": classifications[idx]["extracted"],
+                    "resume_id": classification["resume_id"],
+                    **(extracted if self.combined else {self.attribute: extracted}),
                 }
                 results.append(result)
         except Exception as e:
@@ -1,14 +1,31 @@
 from abc import ABC, abstractmethod
+from typing import List, Optional
+from src.pipeline.dag import DAG, Stage
 from src.utils.logger import get_logger
+from src.utils.stage_cache import StageCache
 
 
 class BasePipeline(ABC):
     """An abstract base class for all pipelines."""
 
-    def __init__(self):
+    def __init__(self, stage_cache: Optional[StageCache] = None):
         self.logger = get_logger(self.__class__.__name__)
+        self.stage_cache = stage_cache
 
     @abstractmethod
     def run(self, *args, **kwargs):
         """The main entry point for the pipeline's execution."""
         pass
+
+    def _dag(self, stages: List[Stage], **kwargs) -> DAG:
+        """
+        Build a DAG of stages that uses the pipeline's stage cache.
+
+        Args:
+            stages: The pipeline's stages
+            **kwargs: Other DAG arguments (e.g. max_concurrency)
+
+        Returns:
+            The DAG
+        """
+        return DAG(stages, stage_cache=self.stage_cache, **kwargs)
@@ -0,0 +1,271 @@
+"""
+Pipeline DAG
+
+A small dependency-driven scheduler for agent pipelines.
+
+A pipeline is declared as a list of `Stage`s. Each stage names the values it
+reads (pipeline inputs or outputs of other stages) and the value it
+produces, so the execution order follows from the data flow. `DAG` runs the
+stages of every item on a shared thread pool: a stage is submitted as soon
+as its own inputs are ready, so independent stages run concurrently and
+every item moves on without waiting for the rest of the batch.
+
+Per stage:
+- with a `StageCache`, outputs are stored under a hash of the stage inputs
+  and the agent fingerprint, so a rerun (or a run resumed after a crash)
+  skips stages whose inputs are unchanged;
+- a `share` key lets items with equal keys share one call within a batch
+  (and one cache entry);
+- an output rejected by `validate` fails the stage, and stages depending on
+  a failed stage are skipped.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+from src.agents.base_agent import BaseAgent
+from src.config.config import PIPELINE_MAX_CONCURRENCY
+from src.utils.logger import get_logger
+from src.utils.stage_cache import StageCache
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of a pipeline.
+
+    Attributes:
+        name: Stage name, also used as the cache namespace
+        fn: Called with one keyword argument per entry of `inputs`
+        inputs: Keyword argument -> name of the value passed for it
+        output: Name of the value the stage produces
+        agent: Agent run by the stage; its fingerprint is part of the cache key
+        validate: Whether an output counts as success
+        cacheable: Whether an output may be cached (default: `validate`)
+        share: Key function over the stage's keyword arguments; items with
+               equal keys share one call and one cache entry
+        cache: Whether the stage uses the stage cache at all
+        when: Condition over the stage's keyword arguments; if it is false,
+              the stage is not run and its output is None
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    inputs: Dict[str, str]
+    output: str
+    agent: Optional[BaseAgent] = None
+    validate: Callable[[Any], bool] = bool
+    cacheable: Optional[Callable[[Any], bool]] = None
+    share: Optional[Callable[[Dict[str, Any]], Hashable]] = None
+    cache: bool = True
+    when: Optional[Callable[[Dict[str, Any]], bool]] = None
+
+
+class DAG:
+    """Runs a set of stages over one or many items, following their data flow."""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        stage_cache: Optional[StageCache] = None,
+        max_concurrency: int = PIPELINE_MAX_CONCURRENCY,
+    ):
+        """
+        Initialize the DAG and check that it is well-formed.
+
+        Args:
+            stages: The stages; values no stage produces are pipeline inputs
+            stage_cache: Optional cache of stage outputs
+            max_concurrency: Maximum number of stages running at once
+
+        Raises:
+            ValueError: If stage names or outputs repeat, or the stages form a cycle
+        """
+        names = [stage.name for stage in stages]
+        outputs = [stage.output for stage in stages]
+        if len(set(names)) != len(names) or len(set(outputs)) != len(outputs):
+            raise ValueError("Stage names and outputs must be unique")
+        self.stages = self._sort(stages)
+        self.stage_cache = stage_cache
+        self.max_concurrency = max_concurrency
+        self.producers = {stage.output: stage.name for stage in self.stages}
+
+    @staticmethod
+    def _sort(stages: List[Stage]) -> List[Stage]:
+        """Order stages so that every stage comes after the stages it reads from."""
+        producers = {stage.output: stage for stage in stages}
+        ordered, visiting, visited = [], set(), set()
+
+        def visit(stage: Stage):
+            if stage.name in visited:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"Stage '{stage.name}' is part of a dependency cycle")
+            visiting.add(stage.name)
+            for value in stage.inputs.values():
+                if value in producers:
+                    visit(producers[value])
+            visiting.discard(stage.name)
+            visited.add(stage.name)
+            ordered.append(stage)
+
+        for stage in stages:
+            visit(stage)
+        return ordered
+
+    def _call(self, stage: Stage, kwargs: Dict[str, Any], fingerprint: Dict) -> Any:
+        """Run a stage, through the stage cache if there is one."""
+        if self.stage_cache is None or not stage.cache:
+            output = stage.fn(**kwargs)
+            if not stage.validate(output):
+                raise ValueError(f"The {stage.name} stage produced no valid output.")
+            return output
+
+        inputs = {"share": stage.share(kwargs)} if stage.share else dict(kwargs)
+        inputs.update(fingerprint)
+        key = self.stage_cache.key(stage.name, inputs)
+        output = self.stage_cache.get(stage.name, key)
+        if output is not None:
+            self.stage_cache.hits += 1
+            return output
+        self.stage_cache.misses += 1
+        output = stage.fn(**kwargs)
+        if (stage.cacheable or stage.validate)(output):
+            self.stage_cache.put(stage.name, key, output, inputs)
+        if not stage.validate(output):
+            raise ValueError(f"The {stage.name} stage produced no valid output.")
+        return output
+
+    def stream(self, items: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Run the stages over many items, yielding events as stages finish.
+
+        Args:
+            items: Pipeline inputs of every item, by value name
+
+        Yields:
+            {"type": "end", "item", "stage", "output"} when a stage succeeds,
+            {"type": "error", "item", "stage", "error"} when it fails, and
+            {"type": "result", "item", "output"} with all values of an item
+            (plus an "errors" dictionary by stage) once it is finished
+        """
+        values = [dict(item) for item in items]
+        errors: List[Dict[str, str]] = [{} for _ in items]
+        # Stages of every item that have not been submitted or skipped yet
+        waiting = [list(self.stages) for _ in items]
+        running = [0] * len(items)
+        fingerprints = {
+            stage.name: stage.agent.fingerprint()
+            for stage in self.stages
+            if stage.agent is not None and self.stage_cache is not None and stage.cache
+        }
+        shared: Dict[Any, Any] = {}  # (stage, share key) -> future
+        futures: Dict[Any, List] = {}  # future -> [stage, item indices]
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+
+            def advance(idx: int) -> Iterator[Dict[str, Any]]:
+                """Submit the ready stages of an item and skip the blocked ones."""
+                for stage in list(waiting[idx]):
+                    sources = [
+                        self.producers.get(value) for value in stage.inputs.values()
+                    ]
+                    if any(source in errors[idx] for source in sources if source):
+                        waiting[idx].remove(stage)
+                        errors[idx][stage.name] = "Skipped after a failed stage."
+                        continue
+                    if not all(value in values[idx] for value in stage.inputs.values()):
+                        continue
+                    waiting[idx].remove(stage)
+                    kwargs = {
+                        arg: values[idx][value] for arg, value in stage.inputs.items()
+                    }
+                    if stage.when is not None and not stage.when(kwargs):
+                        values[idx][stage.output] = None
+                        continue
+                    running[idx] += 1
+                    share_key = (
+                        (stage.name, stage.share(kwargs)) if stage.share else None
+                    )
+                    if share_key in shared:
+                        # A finished future is re-added and picked up at once
+                        future = shared[share_key]
+                        futures.setdefault(future, [stage, []])[1].append(idx)
+                        continue
+                    future = executor.submit(
+                        self._call, stage, kwargs, fingerprints.get(stage.name, {})
+                    )
+                    if share_key is not None:
+                        shared[share_key] = future
+                    futures[future] = [stage, [idx]]
+                if not waiting[idx] and not running[idx]:
+                    yield {
+                        "type": "result",
+                        "item": idx,
+                        "output": {**values[idx], "errors": errors[idx]},
+                    }
+
+            for idx in range(len(items)):
+                yield from advance(idx)
+
+            while futures:
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, owners = futures.pop(future)
+                    try:
+                        output, error = future.result(), None
+                    except Exception as e:
+                        output, error = None, str(e)
+                        logger.error(f"Stage '{stage.name}' failed: {error}")
+                    for idx in owners:
+                        running[idx] -= 1
+                        if error is None:
+                            values[idx][stage.output] = output
+                            yield {
+                                "type": "end",
+                                "item": idx,
+                                "stage": stage.name,
+                                "output": output,
+                            }
+                        else:
+                            errors[idx][stage.name] = error
+                            yield {
+                                "type": "error",
+                                "item": idx,
+                                "stage": stage.name,
+                                "error": error,
+                            }
+                        yield from advance(idx)
+
+    def batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run the stages over many items.
+
+        Args:
+            items: Pipeline inputs of every item, by value name
+
+        Returns:
+            The inputs and stage outputs of every item, in item order, with an
+            "errors" dictionary of failed and skipped stages
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        for event in self.stream(items):
+            if event["type"] == "result":
+                results[event["item"]] = event["output"]
+        return results
+
+    def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the stages for a single item.
+
+        Args:
+            inputs: Pipeline inputs, by value name
+
+        Returns:
+            The inputs and stage outputs, with an "errors" dictionary of failed
+            and skipped stages
+        """
+        return self.batch([inputs])[0]
@@ -1,5 +1,10 @@
-from typing import Literal, Optional
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional
+from src.config.config import EVALUATOR_CASCADE, PRERANK_MIN_SCORE, PRERANK_TOP_K
+from src.models import get_usage_report
 from src.pipeline.base_pipeline import BasePipeline
+from src.pipeline.dag import Stage
+from src.utils.candidate_ranking import CandidateRanker
+from src.utils.stage_cache import StageCache
 from src.agents.resume import (
     ResumeExtractorAgent,
     ResumeEvaluatorAgent,
@@ -17,6 +22,11 @@ class HiringPipeline(BasePipeline):
         self,
         embedding_type: Literal["openai", "huggingface"] = "openai",
         embedding_model_name: Optional[str] = None,
+        stage_cache: Optional[StageCache] = None,
+        cascade: bool = EVALUATOR_CASCADE,
+        prerank_top_k: Optional[int] = PRERANK_TOP_K,
+        prerank_min_score: Optional[float] = PRERANK_MIN_SCORE,
+        ranker: Optional[CandidateRanker] = None,
     ):
         """Initialize the hiring pipeline.
 
@@ -24,34 +34,88 @@ class HiringPipeline(BasePipeline):
             embedding_type: Type of embeddings to use ("openai" or "huggingface")
             model_name: Name of the model to use for embeddings (only for HuggingFace)
             llm: An optional LLM instance for agents that require it
+            stage_cache: Optional cache used by `run` to skip stages whose
+                         inputs are unchanged since a previous run
+            cascade: Whether to screen resumes with a cheap first pass and
+                     only evaluate and summarize those near the decision
+                     boundary (see ResumeEvaluatorAgent)
+            prerank_top_k: In `batch`, only process the top-K resumes by
+                           embedding similarity to the job description
+            prerank_min_score: In `batch`, only process resumes with at least
+                               this similarity to the job description
+            ranker: Pre-ranker to use (default: a CandidateRanker, created
+                    when pre-ranking is enabled)
         """
-        super().__init__()
+        super().__init__(stage_cache)
         # Initialize all agents
         self.extractor = ResumeExtractorAgent()
         self.evaluator = ResumeEvaluatorAgent(
-            embedding_type=embedding_type, embedding_model_name=embedding_model_name
+            embedding_type=embedding_type,
+            embedding_model_name=embedding_model_name,
+            cascade=cascade,
         )
         self.summarizer = ResumeSummarizerAgent()
+        self.prerank_top_k = prerank_top_k
+        self.prerank_min_score = prerank_min_score
+        if ranker is None and (
+            prerank_top_k is not None or prerank_min_score is not None
+        ):
+            ranker = CandidateRanker()
+        self.ranker = ranker
+
+    def _stages(self) -> List[Stage]:
+        """The extraction, evaluation and summary stages of a single resume."""
+        return [
+            Stage(
+                "extraction",
+                self.extractor.run,
+                {"resume_text": "resume_text"},
+                "extracted_details",
+                agent=self.extractor,
+            ),
+            Stage(
+                "evaluation",
+                self.evaluator.run,
+                {
+                    "resume_details": "extracted_details",
+                    "job_description": "job_description",
+                },
+                "evaluation_scores_json",
+                agent=self.evaluator,
+                cacheable=lambda output: not self.evaluator.is_error_response(output),
+            ),
+            Stage(
+                "summary",
+                self.summarizer.run,
+                {
+                    "resume_details": "extracted_details",
+                    "evaluation_scores": "evaluation_scores_json",
+                },
+                "final_summary",
+                agent=self.summarizer,
+                # Resumes decided by the cascade's screener are not summarized
+                when=lambda kwargs: self.evaluator.cascade_decision(
+                    kwargs["evaluation_scores"]
+                )
+                is None,
+            ),
+        ]
 
     def run(self, resume_text: str, job_description: str):
         """Runs the full pipeline from resume extraction to final summary."""
         self.logger.info("--- Starting Hiring Pipeline ---")
+        outputs = self._dag(self._stages()).run(
+            {"resume_text": resume_text, "job_description": job_description}
+        )
 
-        # 1. Resume Extractor
-        extracted_details = self.extractor.run(resume_text)
-        if not extracted_details:
-            self.logger.error(
-                "Failed to extract details from resume. Aborting pipeline."
-            )
+        if outputs["errors"]:
+            stage, error = next(iter(outputs["errors"].items()))
+            self.logger.error(f"The {stage} stage failed: {error} Aborting pipeline.")
             return
-        self.logger.info(f"Extracted Details:\n{extracted_details}")
-
-        # 2. Resume Evaluator
-        evaluation_scores_json = self.evaluator.run(extracted_details, job_description)
-        if not evaluation_scores_json:
-            self.logger.error("Failed to evaluate resume. Aborting pipeline.")
-            return
-        self.logger.info(f"Evaluation Scores (JSON):\n{evaluation_scores_json}")
+        self.logger.info(f"Extracted Details:\n{outputs['extracted_details']}")
+        self.logger.info(
+            f"Evaluation Scores (JSON):\n{outputs['evaluation_scores_json']}"
+        )
 
         # 3. Score Formatter
         # self.logger.info("Formatting scores...")
@@ -60,14 +124,208 @@ class HiringPipeline(BasePipeline):
         # self.logger.info(f"Formatted Scores: {formatted_scores}")
         # self.logger.info(f"Total Score: {total_score} / 10")
 
-        # 4. Resume Summarizer
-        final_summary = self.summarizer.run(extracted_details, evaluation_scores_json)
-        if not final_summary:
-            self.logger.error("Failed to generate final summary.")
-            return
-        self.logger.info(f"\n--- Final Candidate Summary ---\n{final_summary}")
+        if outputs["final_summary"] is None:
+            self.logger.info("Resume decided by screening; no summary generated.")
+        else:
+            self.logger.info(
+                f"\n--- Final Candidate Summary ---\n{outputs['final_summary']}"
+            )
         return {
-            "extracted_details": extracted_details,
-            "evaluation_scores_json": evaluation_scores_json,
-            "final_summary": final_summary,
+            "extracted_details": outputs["extracted_details"],
+            "evaluation_scores_json": outputs["evaluation_scores_json"],
+            "final_summary": outputs["final_summary"],
         }
+
+    def stream(
+        self, resume_text: str, job_description: str
+    ) -> Iterator[Dict[str, Any]]:
+        """Runs the full pipeline, yielding events as the outputs are generated.
+
+        Every stage yields a "start" event, a "token" event per generated
+        chunk, and an "end" event with its output. The
+        evaluation's tokens are the free-text evaluation; its "end" output is
+        the parsed JSON. In cascade mode the resume is screened first; if
+        the screener decides it, the evaluation yields no tokens, its "end"
+        output is the screening decision, and there is no summary stage
+        (final_summary is None). The last event is a "result" with the same
+        dictionary `run` returns, or an "error" if a stage failed.
+
+        Args:
+            resume_text: The resume text
+            job_description: Job description to evaluate against
+
+        Yields:
+            Event dictionaries with a "type" ("start", "token", "end",
+            "result" or "error"), the "stage" for stage events, and
+            "content", "output" or "error" depending on the type
+        """
+        self.logger.info("--- Starting streamed Hiring Pipeline ---")
+        outputs = {}
+        stage = "extraction"
+        try:
+            # 1. Resume Extractor
+            outputs["extracted_details"] = yield from self._stream_stage(
+                stage, self.extractor.stream(resume_text)
+            )
+
+            # 2. Resume Evaluator, screened first in cascade mode
+            stage = "evaluation"
+            screening, screened = self.evaluator.prescreen(
+                outputs["extracted_details"], job_description
+            )
+            if screened is not None:
+                # Decided by the screener: no full evaluation and no summary
+                yield {"type": "start", "stage": stage}
+                yield {"type": "end", "stage": stage, "output": screened}
+                outputs["evaluation_scores_json"] = screened
+                outputs["final_summary"] = None
+            else:
+                outputs["evaluation_scores_json"] = yield from self._stream_stage(
+                    stage,
+                    self.evaluator.stream(
+                        outputs["extracted_details"], job_description
+                    ),
+                    postprocess=lambda text: self.evaluator.parse(text, screening),
+                )
+
+                # 3. Resume Summarizer
+                stage = "summary"
+                outputs["final_summary"] = yield from self._stream_stage(
+                    stage,
+                    self.summarizer.stream(
+                        outputs["extracted_details"],
+                        outputs["evaluation_scores_json"],
+                    ),
+                )
+        except Exception as e:
+            self.logger.error(f"Streaming failed at the {stage} stage: {e}")
+            yield {"type": "error", "stage": stage, "error": str(e)}
+            return
+
+        self.logger.info("--- Streamed Hiring Pipeline completed ---")
+        yield {"type": "result", "output": outputs}
+
+    def _stream_stage(
+        self,
+        stage: str,
+        chunks: Iterator[str],
+        postprocess: Optional[Callable[[str], str]] = None,
+    ):
+        """Yield the events of one stage and return its (post-processed) output."""
+        yield {"type": "start", "stage": stage}
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield {"type": "token", "stage": stage, "content": chunk}
+        output = "".join(parts)
+        if postprocess:
+            output = postprocess(output)
+        if not output:
+            raise ValueError(f"The {stage} stage produced no output.")
+        yield {"type": "end", "stage": stage, "output": output}
+        return output
+
+    def batch(
+        self, resumes: List[Dict[str, str]], job_description: str
+    ) -> List[Dict[str, str]]:
+        """
+        Runs the full pipeline for multiple resumes against one job description.
+
+        Every stage processes the whole batch at once, and RAG retrieval for
+        the job description is done a single time. With pre-ranking enabled,
+        only the resumes forwarded by the ranker go through the stages; the
+        others are returned with their ranking and no stage outputs.
+
+        Args:
+            resumes: List of dictionaries containing resume_id and resume_text
+            job_description: Job description to evaluate against
+
+        Returns:
+            List of dictionaries containing resume_id and either
+            extracted_details, evaluation_scores_json and final_summary,
+            or an error message; with pre-ranking, also prerank_score,
+            prerank_position and forwarded
+        """
+        self.logger.info(f"--- Starting Hiring Pipeline for {len(resumes)} resumes ---")
+        results = {
+            resume["resume_id"]: {"resume_id": resume["resume_id"]}
+            for resume in resumes
+        }
+
+        # 0. Embedding pre-ranking
+        if self.ranker is not None:
+            resumes, ranking = self.ranker.rank(
+                resumes,
+                job_description,
+                top_k=self.prerank_top_k,
+                min_score=self.prerank_min_score,
+            )
+            for resume_id, rank in ranking.items():
+                results[resume_id].update(rank)
+                if not rank["forwarded"]:
+                    results[resume_id].update(
+                        extracted_details=None,
+                        evaluation_scores_json=None,
+                        final_summary=None,
+                    )
+
+        # 1. Resume Extractor
+        extracted = []
+        for output in self.extractor.batch(resumes):
+            if not output["extracted_details"]:
+                results[output["resume_id"]][
+                    "error"
+                ] = "Failed to extract details from resume."
+                continue
+            results[output["resume_id"]]["extracted_details"] = output[
+                "extracted_details"
+            ]
+            extracted.append(output)
+
+        # 2. Resume Evaluator
+        evaluations = self.evaluator.batch(
+            [
+                {
+                    "resume_id": output["resume_id"],
+                    "resume_details": output["extracted_details"],
+                    "job_description": job_description,
+                }
+                for output in extracted
+            ]
+        )
+        evaluated = []
+        for output in evaluations:
+            if not output["evaluation_scores_json"]:
+                results[output["resume_id"]]["error"] = "Failed to evaluate resume."
+                continue
+            results[output["resume_id"]]["evaluation_scores_json"] = output[
+                "evaluation_scores_json"
+            ]
+            # Resumes decided by the cascade's screener are not summarized
+            if self.evaluator.cascade_decision(output["evaluation_scores_json"]):
+                results[output["resume_id"]]["final_summary"] = None
+                continue
+            evaluated.append(output)
+
+        # 3. Resume Summarizer
+        summaries = self.summarizer.batch(
+            [
+                {
+                    "resume_id": output["resume_id"],
+                    "resume_details": results[output["resume_id"]]["extracted_details"],
+                    "evaluation_scores": output["evaluation_scores_json"],
+                }
+                for output in evaluated
+            ]
+        )
+        for output in summaries:
+            if not output["final_summary"]:
+                results[output["resume_id"]][
+                    "error"
+                ] = "Failed to generate final summary."
+                continue
+            results[output["resume_id"]]["final_summary"] = output["final_summary"]
+
+        self.logger.info("--- Hiring Pipeline batch completed ---")
+        self.logger.info(f"Token usage: {get_usage_report()}")
+        return list(results.values())
@@ -5,22 +5,101 @@ This module provides a unified interface for generating detailed job-related inf
 including company criteria and previous hire suggestions.
 """
 
+import hashlib
+from typing import List, Optional, Sequence
+from src.config.config import JOB_CRITERIA_GROUP_BY, JOB_MAX_CONCURRENCY
 from src.pipeline.base_pipeline import BasePipeline
+from src.pipeline.dag import Stage
+from src.utils.stage_cache import StageCache
+from src.utils.text_normalization import normalize_text
 from ..agents.job import PreviousHireGeneratorAgent, CompanyCriteriaGeneratorAgent
 
 
+def job_group_key(job: dict, group_by: Sequence[str]) -> str:
+    """
+    Build the key of the group of jobs that share company criteria.
+
+    Args:
+        job: Job dictionary (job_classification, job_type, position, description)
+        group_by: Job fields to compare; "description" compares a hash of the
+                  normalized, lower-cased description
+
+    Returns:
+        Key made of the normalized field values
+    """
+    values = []
+    for field in group_by:
+        value = normalize_text(str(job.get(field) or "")).lower()
+        if field == "description":
+            value = hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+        values.append(value)
+    return "|".join(values)
+
+
 class JobPipeline(BasePipeline):
     """
     A pipeline for generating job-related details such as company criteria and previous hires.
+
+    Company criteria are generated once per group of jobs (by default, jobs
+    with the same classification and type) and shared by the group's jobs;
+    previous hires are still generated for every job.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        group_by: Sequence[str] = JOB_CRITERIA_GROUP_BY,
+        stage_cache: Optional[StageCache] = None,
+        max_concurrency: int = JOB_MAX_CONCURRENCY,
+    ):
         """
         Initialize the job detail generation pipeline.
+
+        Args:
+            group_by: Job fields whose values define a group sharing company
+                      criteria (see `job_group_key`); empty to generate
+                      criteria for every job
+            stage_cache: Optional persistent store of the stage outputs (the
+                         criteria of each group, the previous hires of each
+                         job), reused across runs
+            max_concurrency: Maximum number of concurrent LLM calls in `batch`
         """
-        super().__init__()
+        super().__init__(stage_cache)
         self.company_criteria_generator = CompanyCriteriaGeneratorAgent()
         self.previous_hire_generator = PreviousHireGeneratorAgent()
+        self.group_by = list(group_by)
+        self.max_concurrency = max_concurrency
+
+    def _criteria_group(self, kwargs: dict) -> str:
+        """Share key of the company criteria stage: the key of the job's group."""
+        return job_group_key(
+            {**kwargs, "description": kwargs["job_description"]}, self.group_by
+        )
+
+    def _stages(self) -> List[Stage]:
+        """The company criteria and previous hire stages of a single job."""
+        job_inputs = {
+            "job_classification": "job_classification",
+            "job_type": "job_type",
+            "position": "position",
+            "job_description": "job_description",
+        }
+        return [
+            Stage(
+                "company_criteria",
+                self.company_criteria_generator.run,
+                job_inputs,
+                "company_criteria",
+                agent=self.company_criteria_generator,
+                share=self._criteria_group if self.group_by else None,
+            ),
+            Stage(
+                "previous_hires",
+                self.previous_hire_generator.run,
+                {**job_inputs, "company_criteria": "company_criteria"},
+                "previous_hires",
+                agent=self.previous_hire_generator,
+            ),
+        ]
 
     def run(
         self,
@@ -41,70 +120,67 @@ class JobPipeline(BasePipeline):
         Returns:
             A dictionary containing generated company criteria and previous hires
         """
-
-        try:
-            # Step 1: Generate company criteria
-            company_criteria = self.company_criteria_generator.run(
-                job_classification=job_classification,
-                job_type=job_type,
-                position=position,
-                job_description=job_description,
-            )
-            self.logger.info("Generated Company Criteria:\n %s", company_criteria)
-
-            # Step 2: Generate previous hires based on job description and company criteria
-            previous_hires = self.previous_hire_generator.run(
-                job_classification=job_classification,
-                job_type=job_type,
-                position=position,
-                job_description=job_description,
-                company_criteria=company_criteria,
-            )
-            self.logger.info("Generated Previous Hires:\n %s", previous_hires)
-
-            return {
-                "company_criteria": company_criteria,
-                "previous_hires": previous_hires,
-            }
-        except Exception as e:
-            self.logger.error("Error in JobPipeline: %s", str(e))
-            return {
-                "company_criteria": None,
-                "previous_hires": None,
+        outputs = self._dag(self._stages()).run(
+            {
+                "job_classification": job_classification,
+                "job_type": job_type,
+                "position": position,
+                "job_description": job_description,
             }
+        )
+        for stage, error in outputs["errors"].items():
+            self.logger.error("Error in JobPipeline (%s): %s", stage, error)
+        self.logger.info(
+            "Generated Company Criteria:\n %s", outputs.get("company_criteria")
+        )
+        self.logger.info(
+            "Generated Previous Hires:\n %s", outputs.get("previous_hires")
+        )
+        return {
+            "company_criteria": outputs.get("company_criteria"),
+            "previous_hires": outputs.get("previous_hires"),
+        }
 
     def batch(self, jobs: list[dict]) -> list[dict]:
         """
         Process multiple job descriptions in batch through the complete job pipeline.
 
+        Company criteria are generated once per group of jobs (or read from
+        the stage cache) and shared by all jobs of the group. Jobs do not
+        wait for each other: a job's previous hires are generated as soon as
+        its group's criteria are ready, with at most max_concurrency LLM
+        calls in flight across both stages.
+
         Args:
             jobs: List of dictionaries containing job-related information with keys:
                   'job_id', 'job_classification', 'job_type', 'position', 'description'
         Returns:
-            List of dictionaries containing the processed results for each job description
+            List of dictionaries containing the processed results for each job
+            description, in job order; jobs whose criteria or previous hires
+            failed get None values and an error message
         """
+        outputs = self._dag(self._stages(), max_concurrency=self.max_concurrency).batch(
+            [
+                {
+                    "job_classification": job.get("job_classification", ""),
+                    "job_type": job.get("job_type", ""),
+                    "position": job.get("position", ""),
+                    "job_description": job.get("description", ""),
+                }
+                for job in jobs
+            ]
+        )
         results = []
-        try:
-            # Step 1: Generate company criteria for all jobs
-            company_criteria_results = self.company_criteria_generator.batch(jobs)
-
-            # Merge company criteria back into jobs for previous hire generation
-            for job, criteria in zip(jobs, company_criteria_results):
-                job["company_criteria"] = criteria["company_criteria"]
-
-            # Step 2: Generate previous hires for all jobs
-            previous_hire_results = self.previous_hire_generator.batch(jobs)
-
-            # Combine results
-            for criteria, hires in zip(company_criteria_results, previous_hire_results):
-                job_id = criteria["job_id"]
-                results.append(
-                    {
-                        "job_id": job_id,
-                        "company_criteria": criteria["company_criteria"],
-                        "previous_hires": hires["previous_hires"],
-                    }
+        for job, output in zip(jobs, outputs):
+            job["company_criteria"] = output.get("company_criteria")
+            result = {
+                "job_id": job.get("job_id"),
+                "company_criteria": output.get("company_criteria"),
+                "previous_hires": output.get("previous_hires"),
+            }
+            if output["errors"]:
+                result["error"] = "; ".join(
+                    f"{stage}: {error}" for stage, error in output["errors"].items()
                 )
-        except Exception as e:
-            self.logger.error(f"Error during batch job processing: {str(e)}")
+            results.append(result)
         return results
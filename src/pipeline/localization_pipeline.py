@@ -5,12 +5,16 @@ This module provides a unified interface for processing resumes,
 including localization and anonymization.
 """
 
-from typing import Dict
+from typing import Dict, List, Optional, Union
+from src.models import get_usage_report
 from src.pipeline.base_pipeline import BasePipeline
+from src.pipeline.dag import Stage
+from src.utils.stage_cache import StageCache
 from ..agents.localization import (
     AnonymizationAgent,
     ResumeReformatterAgent,
     LocalizationAgent,
+    FusedLocalizationAgent,
 )
 
 
@@ -19,108 +23,259 @@ class LocalizationPipeline(BasePipeline):
     A pipeline for processing resumes with localization and anonymization.
     """
 
-    def __init__(self, target_country: str = "Singapore"):
+    def __init__(
+        self,
+        target_country: str = "Singapore",
+        fused: bool = False,
+        stage_cache: Optional[StageCache] = None,
+    ):
         """
         Initialize the resume processing pipeline.
 
+        Args:
+            target_country: Target country/region for localization
+            fused: Whether to run anonymization, reformatting and localization
+                   as a single LLM call when all three are requested
+            stage_cache: Optional cache used by `run` to skip steps whose
+                         inputs are unchanged since a previous run
         """
-        super().__init__()
+        super().__init__(stage_cache)
         self.anonymizer = AnonymizationAgent()
         self.reformatter = ResumeReformatterAgent()
         self.localizer = LocalizationAgent()
+        self.fused_localizer = FusedLocalizationAgent() if fused else None
         self.target_country = target_country
 
+    def _use_fused(self, anonymize: bool, reformat: bool, localize: bool) -> bool:
+        return self.fused_localizer is not None and anonymize and reformat and localize
+
     def run(
         self,
         resume_content: str,
         anonymize: bool = True,
         reformat: bool = True,
         localize: bool = True,
-    ) -> str:
+        return_intermediates: bool = False,
+    ) -> Union[str, Dict[str, str]]:
         """
         Process a resume with optional anonymization and localization.
 
         Args:
             resume_content: The resume content to process
-            target_country: Target country/region code (e.g., 'SG', 'US', 'JP')
             anonymize: Whether to anonymize the resume
+            reformat: Whether to reformat the resume
             localize: Whether to localize the resume
+            return_intermediates: Whether to return the output of every step
 
         Returns:
-            processed_content: The processed resume content (or None on failure)
+            processed_content: The processed resume content, or a dictionary of
+            {"anonymized", "reformatted", "localized"} outputs for the steps run
+            when return_intermediates is set
         """
 
-        current_content = resume_content
-
+        fused = self._use_fused(anonymize, reformat, localize)
         try:
-            # Step 1: Anonymization
-            if anonymize:
-                anonymized_content = self.anonymizer.run(resume_text=current_content)
-                self.logger.info("Anonymized resume:\n %s", anonymized_content)
-                current_content = anonymized_content
-            # Step 2: Reformatting
-            if reformat:
-                reformatted_content = self.reformatter.run(
-                    anonymized_resume_text=current_content
-                )
-                self.logger.info("Reformatted resume:\n %s", reformatted_content)
-                current_content = reformatted_content
-            # Step 3: Localization
-            if localize:
-                localized_content = self.localizer.run(
-                    resume_text=current_content,
-                    target_country=self.target_country,
-                )
-                self.logger.info("Localized resume:\n %s", localized_content)
-                current_content = localized_content
-            return current_content
+            outputs = self._dag(self._stages(anonymize, reformat, localize, fused)).run(
+                {
+                    "resume_text": resume_content,
+                    "target_country": self.target_country,
+                    "return_intermediates": return_intermediates,
+                }
+            )
+            if outputs["errors"]:
+                stage, error = next(iter(outputs["errors"].items()))
+                raise RuntimeError(f"The {stage} stage failed: {error}")
+
+            if fused:
+                output = outputs["fused"]
+                self.logger.info("Localized resume:\n %s", output["localized_text"])
+                if not return_intermediates:
+                    return output["localized_text"]
+                return {
+                    "anonymized": output["anonymized_text"],
+                    "reformatted": output["reformatted_text"],
+                    "localized": output["localized_text"],
+                }
+
+            current_content = resume_content
+            intermediates = {}
+            for key in ("anonymized", "reformatted", "localized"):
+                if key in outputs:
+                    self.logger.info(f"{key.capitalize()} resume:\n %s", outputs[key])
+                    current_content = intermediates[key] = outputs[key]
+            return intermediates if return_intermediates else current_content
         except Exception as e:
             self.logger.error(f"Error processing resume: {str(e)}", exc_info=True)
             raise RuntimeError("Failed to process resume") from e
 
+    def _stages(
+        self, anonymize: bool, reformat: bool, localize: bool, fused: bool
+    ) -> List[Stage]:
+        """The requested steps, each reading the output of the previous one."""
+        if fused:
+            return [
+                Stage(
+                    "fused_localization",
+                    self.fused_localizer.run,
+                    {
+                        "resume_text": "resume_text",
+                        "target_country": "target_country",
+                        "return_intermediates": "return_intermediates",
+                    },
+                    "fused",
+                    agent=self.fused_localizer,
+                    validate=lambda output: bool(output["localized_text"]),
+                )
+            ]
+        stages, current = [], "resume_text"
+        # Step 1: Anonymization
+        if anonymize:
+            stages.append(
+                Stage(
+                    "anonymization",
+                    self.anonymizer.run,
+                    {"resume_text": current},
+                    "anonymized",
+                    agent=self.anonymizer,
+                )
+            )
+            current = "anonymized"
+        # Step 2: Reformatting
+        if reformat:
+            stages.append(
+                Stage(
+                    "reformatting",
+                    self.reformatter.run,
+                    {"anonymized_resume_text": current},
+                    "reformatted",
+                    agent=self.reformatter,
+                )
+            )
+            current = "reformatted"
+        # Step 3: Localization
+        if localize:
+            stages.append(
+                Stage(
+                    "localization",
+                    self.localizer.run,
+                    {"resume_text": current, "target_country": "target_country"},
+                    "localized",
+                    agent=self.localizer,
+                )
+            )
+        return stages
+
     def batch(
         self,
-        resumes: Dict[str, str],
+        resumes: List[Dict[str, str]],
         anonymize: bool = True,
         reformat: bool = True,
         localize: bool = True,
-    ) -> dict:
+        return_intermediates: bool = False,
+    ) -> List[Dict[str, str]]:
         """
         Process multiple resumes in batch with optional anonymization and localization.
 
         Args:
-            resumes: Dictionary of {resume_id: resume_content} pairs
-            target_country: Target country/region code (e.g., 'SG', 'US', 'JP')
+            resumes: List of dictionaries containing resume_id and resume_text
             anonymize: Whether to anonymize the resumes
+            reformat: Whether to reformat the resumes
             localize: Whether to localize the resumes
+            return_intermediates: Whether to include the output of every step
 
         Returns:
-            Dictionary of {resume_id: processed_content} pairs
+            List of dictionaries containing resume_id and the output of the last
+            step (e.g. localized_text), plus anonymized_text and
+            reformatted_text when return_intermediates is set
         """
         current_resumes = resumes.copy()
+        intermediates = {resume["resume_id"]: {} for resume in resumes}
+
+        def collect(outputs: List[Dict[str, str]], key: str):
+            for output in outputs:
+                if key in output:
+                    intermediates[output["resume_id"]][key] = output[key]
 
         try:
+            if self._use_fused(anonymize, reformat, localize):
+                current_resumes = self.fused_localizer.batch(
+                    resumes=current_resumes,
+                    target_country=self.target_country,
+                    return_intermediates=return_intermediates,
+                )
+                self.logger.info("Localized resume:\n %s", current_resumes)
+                self.logger.info(f"Token usage: {get_usage_report()}")
+                return current_resumes
+
+            # Every step reads the text written by the previous one
+            current = "resume_text"
             # Step 1: Anonymization
             if anonymize:
-                anonymized_content = self.anonymizer.batch(resumes=current_resumes)
+                anonymized_content = self._chain_step(
+                    self.anonymizer.batch, current_resumes, current
+                )
                 self.logger.info("Anonymized resume:\n %s", anonymized_content)
                 current_resumes = anonymized_content
+                current = "anonymized_text"
+                collect(current_resumes, current)
             # Step 2: Reformatting
             if reformat:
-                reformatted_content = self.reformatter.batch(resumes=current_resumes)
+                reformatted_content = self._chain_step(
+                    self.reformatter.batch, current_resumes, current
+                )
                 self.logger.info("Reformatted resume:\n %s", reformatted_content)
                 current_resumes = reformatted_content
+                current = "reformatted_text"
+                collect(current_resumes, current)
             # Step 3: Localization
             if localize:
-                localized_content = self.localizer.batch(
-                    resumes=current_resumes,
+                localized_content = self._chain_step(
+                    self.localizer.batch,
+                    current_resumes,
+                    current,
                     target_country=self.target_country,
                 )
                 self.logger.info("Localized resume:\n %s", localized_content)
                 current_resumes = localized_content
+            self.logger.info(f"Token usage: {get_usage_report()}")
+            if return_intermediates:
+                for resume in current_resumes:
+                    for key, value in intermediates[resume["resume_id"]].items():
+                        resume.setdefault(key, value)
             return current_resumes
         except Exception as e:
             self.logger.error(
                 f"Error batch processing resumes: {str(e)}", exc_info=True
             )
             raise RuntimeError("Failed to process resumes") from e
+
+    @staticmethod
+    def _chain_step(
+        step, outputs: List[Dict[str, str]], text_key: str, **kwargs
+    ) -> List[Dict[str, str]]:
+        """
+        Feed the outputs of one batch step into the next.
+
+        Resumes that failed in an earlier step keep their error entry and are
+        not sent to the next step; the outputs stay in input order.
+        """
+        inputs = [
+            {"resume_id": output["resume_id"], "resume_text": output[text_key]}
+            for output in outputs
+            if text_key in output
+        ]
+        results = {
+            result["resume_id"]: result
+            for result in (step(resumes=inputs, **kwargs) if inputs else [])
+        }
+        return [
+            (
+                results.get(
+                    output["resume_id"],
+                    {"resume_id": output["resume_id"], "error": "No output for resume"},
+                )
+                if text_key in output
+                else output
+            )
+            for output in outputs
+        ]
@@ -1,17 +1,31 @@
 # This file allows the 'prompts' directory to be treated as a Python package.
 
 from .analysis_prompt import (
-    NAME_PROMPT,
-    ETHNICITY_PROMPT,
-    GENDER_PROMPT,
-    AGE_PROMPT,
-    WORK_EXPERIENCE_PROMPT,
+    NAME_SYSTEM_PROMPT,
+    NAME_USER_PROMPT,
+    ETHNICITY_SYSTEM_PROMPT,
+    GENDER_SYSTEM_PROMPT,
+    NAME_INPUT_USER_PROMPT,
+    AGE_SYSTEM_PROMPT,
+    WORK_EXPERIENCE_SYSTEM_PROMPT,
+    RESUME_INPUT_USER_PROMPT,
+    COMBINED_ATTRIBUTE_FIELDS,
+    COMBINED_SYSTEM_PROMPT,
 )
+from .chat import chat_prompt
+from .chunk_prompt import RESUME_PART_NOTE
 
 __all__ = [
-    "NAME_PROMPT",
-    "ETHNICITY_PROMPT",
-    "GENDER_PROMPT",
-    "AGE_PROMPT",
-    "WORK_EXPERIENCE_PROMPT",
+    "NAME_SYSTEM_PROMPT",
+    "NAME_USER_PROMPT",
+    "ETHNICITY_SYSTEM_PROMPT",
+    "GENDER_SYSTEM_PROMPT",
+    "NAME_INPUT_USER_PROMPT",
+    "AGE_SYSTEM_PROMPT",
+    "WORK_EXPERIENCE_SYSTEM_PROMPT",
+    "RESUME_INPUT_USER_PROMPT",
+    "COMBINED_ATTRIBUTE_FIELDS",
+    "COMBINED_SYSTEM_PROMPT",
+    "chat_prompt",
+    "RESUME_PART_NOTE",
 ]
@@ -1,35 +1,39 @@
-NAME_PROMPT = """
-Given the following anonymized resume from Singapore, generate an appropriate name of the person:
-
-{resume_text}
+NAME_SYSTEM_PROMPT = """
+Given an anonymized resume from Singapore, generate an appropriate name of the person.
 
 ONLY OUTPUT THE NAME. NO EXPLANATIONS OR ADDITIONAL TEXT.
 """
 
+NAME_USER_PROMPT = """
+{resume_text}
+"""
 
-ETHNICITY_PROMPT = """
-Given the following name from Singapore, predict the person's ethnicity. Choose one from [Chinese, Malay, Indian, Eurasian].
-Name: {name}
+
+ETHNICITY_SYSTEM_PROMPT = """
+Given a name from Singapore, predict the person's ethnicity. Choose one from [Chinese, Malay, Indian, Eurasian].
 
 ONLY OUTPUT THE ETHNICITY. NO EXPLANATIONS OR ADDITIONAL TEXT.
 """
 
-GENDER_PROMPT = """
-Given the following name from Singapore, predict the person's gender. Choose one from [Male, Female, Other].
-Name: {name}
+GENDER_SYSTEM_PROMPT = """
+Given a name from Singapore, predict the person's gender. Choose one from [Male, Female, Other].
 
 ONLY OUTPUT THE GENDER. NO EXPLANATIONS OR ADDITIONAL TEXT.
 """
 
-AGE_PROMPT = """
-Given the following anonymized resume from Singapore, predict the person's age range. Choose one from [18-24, 25-34, 35-44, 45-54, 55-64, 65+].
-Resume: {resume_text}
+# Shared by the ethnicity and gender prompts
+NAME_INPUT_USER_PROMPT = """
+Name: {name}
+"""
+
+AGE_SYSTEM_PROMPT = """
+Given an anonymized resume from Singapore, predict the person's age range. Choose one from [18-24, 25-34, 35-44, 45-54, 55-64, 65+].
 
 ONLY OUTPUT THE AGE RANGE. NO EXPLANATIONS OR ADDITIONAL TEXT.
 """
 
-WORK_EXPERIENCE_PROMPT = """
-Given the following anonymized resume from Singapore, extract the person's work experiences in the format:
+WORK_EXPERIENCE_SYSTEM_PROMPT = """
+Given an anonymized resume from Singapore, extract the person's work experiences in the format:
 {{
 "company": company name,
 "position": position held,
@@ -37,6 +41,26 @@ Given the following anonymized resume from Singapore, extract the person's work
 "end_date": end date (YYYY-MM or "Present"),
 }}
 List all work experiences in a JSON array. If any field is missing, use null for that field.
-Resume: {resume_text}
 ONLY OUTPUT THE JSON ARRAY. NO EXPLANATIONS OR ADDITIONAL TEXT.
 """
+
+# Shared by the age and work experience prompts
+RESUME_INPUT_USER_PROMPT = """
+Resume: {resume_text}
+"""
+
+# Field descriptions for the combined extraction prompt, by attribute
+COMBINED_ATTRIBUTE_FIELDS = {
+    "name": '"name": an appropriate generated name of the person (string)',
+    "age": '"age": the predicted age range, one of "18-24", "25-34", "35-44", "45-54", "55-64", "65+"',
+    "work_experience": '"work_experience": all work experiences, as an array of objects with "company", "position", "start_date" (YYYY-MM) and "end_date" (YYYY-MM or "Present"); use null for any missing field',
+}
+
+# {fields} is filled with the requested COMBINED_ATTRIBUTE_FIELDS before the
+# prompt is built, so the system message stays free of template variables
+COMBINED_SYSTEM_PROMPT = """
+Given an anonymized resume from Singapore, output a single JSON object with the following fields:
+{fields}
+
+ONLY OUTPUT THE JSON OBJECT. NO EXPLANATIONS OR ADDITIONAL TEXT.
+"""
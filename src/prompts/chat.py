@@ -0,0 +1,27 @@
+"""
+Helpers for building chat prompts from the prompt modules.
+
+Every prompt is split into a static system message and a user message that
+holds the template variables. The system message therefore forms an identical
+prefix across calls, which lets provider-side prompt caching reuse it; within
+the user message, variables shared by many calls (e.g. the job description)
+come before per-resume content.
+"""
+
+from langchain_core.prompts import ChatPromptTemplate
+
+
+def chat_prompt(system_prompt: str, user_prompt: str) -> ChatPromptTemplate:
+    """
+    Build a chat prompt with a static system message and a templated user message.
+
+    Args:
+        system_prompt: Static instructions; must not contain template variables
+        user_prompt: Template for the variable part of the prompt
+
+    Returns:
+        ChatPromptTemplate with a system and a human message
+    """
+    return ChatPromptTemplate.from_messages(
+        [("system", system_prompt), ("human", user_prompt)]
+    )
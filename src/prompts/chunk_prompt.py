@@ -0,0 +1,6 @@
+# Note prepended to each part of a resume that is processed in several calls.
+# It is part of the user message, so the system prompts stay cacheable.
+
+RESUME_PART_NOTE = """[This is part {part} of {total} of a longer resume. Process only this part; the outputs of all parts are combined in order afterwards. Do not add anything this part does not contain, such as an introduction, closing remarks or a header for the whole resume.]
+
+"""
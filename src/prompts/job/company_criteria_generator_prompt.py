@@ -5,21 +5,14 @@ This prompt is designed to guide the LLM in generating relevant company criteria
 based on the provided job description.
 """
 
-COMPANY_CRITERIA_GENERATOR_PROMPT = """
-You are an expert HR analyst. Your task is to carefully review the following job description and extract the key company criteria that HR should consider when evaluating candidates or shaping company policies.
+COMPANY_CRITERIA_GENERATOR_SYSTEM_PROMPT = """
+You are an expert HR analyst. Your task is to carefully review the job description you are given and extract the key company criteria that HR should consider when evaluating candidates or shaping company policies.
 
 Instructions:
 1. Analyze the job description to identify important company attributes, values, and requirements.
 2. Generate a list of criteria that reflect what the company is seeking or prioritizing (e.g., culture, skills, experience, work environment, diversity, benefits, etc.).
 3. For each criterion, provide a concise one-line description explaining its relevance or importance.
 
-Job classification: {job_classification}
-Job type: {job_type}
-Position: {position}
-
-Job Description:
-{job_description}
-
 Output Format:
 - List each criterion as a bullet point.
 - Include a one-line description for each criterion.
@@ -29,3 +22,12 @@ Example Output:
 - Criterion 2: [Description of criterion 2]
 - Criterion 3: [Description of criterion 3]
 """
+
+COMPANY_CRITERIA_GENERATOR_USER_PROMPT = """
+Job classification: {job_classification}
+Job type: {job_type}
+Position: {position}
+
+Job Description:
+{job_description}
+"""
@@ -5,25 +5,14 @@ This prompt is designed to guide the LLM in generating insights about previous h
 based on the provided job description and company criteria.
 """
 
-PREVIOUS_HIRE_GENERATOR_PROMPT = """
-You are an expert HR analyst. Your task is to review the following job description and company criteria, then generate a list of previous hires who have held similar positions.
+PREVIOUS_HIRE_GENERATOR_SYSTEM_PROMPT = """
+You are an expert HR analyst. Your task is to review the job description and company criteria you are given, then generate a list of previous hires who have held similar positions.
 
 Instructions:
 1. Analyze the job description and company criteria to identify key skills, qualifications, and attributes required for the role.
 2. Generate a list of previous hires (use anonymized candidate profiles) who match these requirements.
 3. For each candidate, provide a brief summary of their relevant experience and how they align with the job and company criteria.
 
-Job classification: {job_classification}
-Job type: {job_type}
-Position: {position}
-
-
-Job Description:
-{job_description}
-
-Company Criteria:
-{company_criteria}
-
 Output Format:
 - Candidate 1: [Brief summary of relevant experience and alignment]
 - Candidate 2: [Brief summary of relevant experience and alignment]
@@ -34,3 +23,15 @@ Notes:
 - Focus on clarity and relevance for HR decision-making.
 - Ensure the summaries highlight key qualifications and experiences that match the job description and company criteria.
 """
+
+PREVIOUS_HIRE_GENERATOR_USER_PROMPT = """
+Job classification: {job_classification}
+Job type: {job_type}
+Position: {position}
+
+Job Description:
+{job_description}
+
+Company Criteria:
+{company_criteria}
+"""
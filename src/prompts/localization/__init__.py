@@ -5,12 +5,27 @@ This module contains prompts used by the localization agents to adapt content
 to different regions, industries, and professional contexts.
 """
 
-from .localization_prompt import LOCALIZATION_PROMPT
-from .resume_anonymizer_prompt import RESUME_ANONYMIZER_PROMPT
-from .resume_reformatter_prompt import RESUME_REFORMATTER_PROMPT
+from .fused_localization_prompt import (
+    FUSED_LOCALIZATION_SYSTEM_PROMPT,
+    FUSED_LOCALIZATION_USER_PROMPT,
+)
+from .localization_prompt import LOCALIZATION_SYSTEM_PROMPT, LOCALIZATION_USER_PROMPT
+from .resume_anonymizer_prompt import (
+    RESUME_ANONYMIZER_SYSTEM_PROMPT,
+    RESUME_ANONYMIZER_USER_PROMPT,
+)
+from .resume_reformatter_prompt import (
+    RESUME_REFORMATTER_SYSTEM_PROMPT,
+    RESUME_REFORMATTER_USER_PROMPT,
+)
 
 __all__ = [
-    "LOCALIZATION_PROMPT",
-    "RESUME_ANONYMIZER_PROMPT",
-    "RESUME_REFORMATTER_PROMPT",
+    "FUSED_LOCALIZATION_SYSTEM_PROMPT",
+    "FUSED_LOCALIZATION_USER_PROMPT",
+    "LOCALIZATION_SYSTEM_PROMPT",
+    "LOCALIZATION_USER_PROMPT",
+    "RESUME_ANONYMIZER_SYSTEM_PROMPT",
+    "RESUME_ANONYMIZER_USER_PROMPT",
+    "RESUME_REFORMATTER_SYSTEM_PROMPT",
+    "RESUME_REFORMATTER_USER_PROMPT",
 ]
@@ -5,11 +5,8 @@ This prompt is designed to guide the LLM in localizing resumes based on
 specific parameters like target country, education level, and experience.
 """
 
-LOCALIZATION_PROMPT = """
-You are an expert in formatting to a {target_country}'s hiring practices. Your task is to adapt the provided resume.
-## Resume Localization Parameters:
-- Target Country: {target_country}
-
+LOCALIZATION_SYSTEM_PROMPT = """
+You are an expert in formatting resumes to a target country's hiring practices. Your task is to adapt the provided resume to the target country given with it.
 
 ## Guidelines:
 - Replace the following placeholders with companies and departments present in the target country, use real-world examples as much as possible:
@@ -36,15 +33,18 @@ You are an expert in formatting to a {target_country}'s hiring practices. Your t
 3. Preserve technical accuracy
 4. Format according to local standards
 
+You are to output only the modified resume content without any additional commentary or explanations.
+The final output should not have any placeholders for job or education related information.
+"""
+
+LOCALIZATION_USER_PROMPT = """
+## Resume Localization Parameters:
+- Target Country: {target_country}
 
 ## Input Resume:
 {resume_text}
 
-
-You are to output only the modified resume content without any additional commentary or explanations.
-The final output should not have any placeholders for job or education related information.
 ## Result Resume:
-[Model output]
 """
 
 # ## Additional Context (if any):
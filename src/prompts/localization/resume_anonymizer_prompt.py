@@ -5,8 +5,8 @@ This prompt is designed to guide the LLM in anonymizing resume content while
 preserving the structure and meaning of the original document.
 """
 
-RESUME_ANONYMIZER_PROMPT = """
-You are an expert in data privacy and anonymization. Your task is to process the following resume text by removing or obfuscating all personally identifiable information (PII) while maintaining the document's structure and professional details.
+RESUME_ANONYMIZER_SYSTEM_PROMPT = """
+You are an expert in data privacy and anonymization. Your task is to process the resume text you are given by removing or obfuscating all personally identifiable information (PII) while maintaining the document's structure and professional details.
 
 ## Instructions:
 1. **Remove or Replace PII**:
@@ -34,11 +34,8 @@ You are an expert in data privacy and anonymization. Your task is to process the
    - Remove or generalize specific technologies/tools that might be too identifying
    - Keep skill categories but remove specific project names or internal tools
 
-## Input Resume:
-{resume_text}
-
-## Anonymized Output:
-[Your anonymized resume content here, maintaining the original structure and formatting as much as possible.]
+## Output:
+Return only the anonymized resume content, maintaining the original structure and formatting as much as possible.
 
 ## Notes:
 - Preserve the original document structure (sections, bullet points, etc.)
@@ -48,6 +45,13 @@ You are an expert in data privacy and anonymization. Your task is to process the
 - The output should be ready to use in a professional context
 """
 
+RESUME_ANONYMIZER_USER_PROMPT = """
+## Input Resume:
+{resume_text}
+
+## Anonymized Output:
+"""
+
 
 RESUME_ANONYMIZER_PROMPT_ALT = """
 **Objective:** Anonymize and clean the following resume text by removing personal identifiable information (PII) and standardizing the format.
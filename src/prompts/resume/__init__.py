@@ -1,17 +1,35 @@
-from .resume_evaluator_prompt import RESUME_EVALUATOR_PROMPT
-from .resume_extractor_prompt import RESUME_EXTRACTOR_PROMPT
+from .resume_evaluator_prompt import (
+    RESUME_EVALUATOR_SYSTEM_PROMPT,
+    RESUME_EVALUATOR_USER_PROMPT,
+)
+from .resume_screener_prompt import (
+    RESUME_SCREENER_SYSTEM_PROMPT,
+    RESUME_SCREENER_USER_PROMPT,
+)
+from .resume_extractor_prompt import (
+    RESUME_EXTRACTOR_SYSTEM_PROMPT,
+    RESUME_EXTRACTOR_USER_PROMPT,
+)
 from .resume_summarizer_prompts import (
-    CEO_PROMPT,
-    CTO_PROMPT,
-    HR_PROMPT,
-    FINAL_SUMMARY_PROMPT,
+    CEO_SYSTEM_PROMPT,
+    CTO_SYSTEM_PROMPT,
+    HR_SYSTEM_PROMPT,
+    SUB_AGENT_USER_PROMPT,
+    FINAL_SUMMARY_SYSTEM_PROMPT,
+    FINAL_SUMMARY_USER_PROMPT,
 )
 
 __all__ = [
-    "RESUME_EVALUATOR_PROMPT",
-    "RESUME_EXTRACTOR_PROMPT",
-    "CEO_PROMPT",
-    "CTO_PROMPT",
-    "HR_PROMPT",
-    "FINAL_SUMMARY_PROMPT",
+    "RESUME_EVALUATOR_SYSTEM_PROMPT",
+    "RESUME_EVALUATOR_USER_PROMPT",
+    "RESUME_SCREENER_SYSTEM_PROMPT",
+    "RESUME_SCREENER_USER_PROMPT",
+    "RESUME_EXTRACTOR_SYSTEM_PROMPT",
+    "RESUME_EXTRACTOR_USER_PROMPT",
+    "CEO_SYSTEM_PROMPT",
+    "CTO_SYSTEM_PROMPT",
+    "HR_SYSTEM_PROMPT",
+    "SUB_AGENT_USER_PROMPT",
+    "FINAL_SUMMARY_SYSTEM_PROMPT",
+    "FINAL_SUMMARY_USER_PROMPT",
 ]
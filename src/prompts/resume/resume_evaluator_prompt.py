@@ -1,6 +1,8 @@
 # In this file, you can define the prompt for the resume evaluator agent.
+# The static instructions come first; the job description and retrieved context,
+# which are shared by every resume evaluated for a job, precede the resume.
 
-RESUME_EVALUATOR_PROMPT = """
+RESUME_EVALUATOR_SYSTEM_PROMPT = """
 As an expert hiring manager, your task is to evaluate a candidate's resume based on the provided job description and historical data from outstanding candidates.
 
 **Scoring Criteria:**
@@ -12,13 +14,6 @@ As an expert hiring manager, your task is to evaluate a candidate's resume based
 
 The total score should be out of 10.
 
-**Evaluation Context:**
-- **Applied Job**: {job_description}
-- **Historical Candidate Insights**: {retrieved_chunks}
-
-**Candidate's Resume Details:**
-{resume_details}
-
 **Instructions:**
 Score the extracted resume details, ensuring that skills, work experience, and education are evaluated based on their relevance to the applied job. Use the historical candidate insights to refine your evaluation criteria.
 
@@ -28,3 +23,12 @@ Provide the scores in a JSON format with the following keys:
 Example:
 {{'self_evaluation_score': 0.5, 'skills_score': 2.0, 'experience_score': 4.0, 'basic_info_score': 1.0, 'education_score': 2.0}}
 """
+
+RESUME_EVALUATOR_USER_PROMPT = """
+**Evaluation Context:**
+- **Applied Job**: {job_description}
+- **Historical Candidate Insights**: {retrieved_chunks}
+
+**Candidate's Resume Details:**
+{resume_details}
+"""
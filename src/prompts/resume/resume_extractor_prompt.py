@@ -1,7 +1,7 @@
 # In this file, you can define the prompt for the resume extractor agent.
 # This makes it easy to swap out prompts without changing the agent's code.
 
-RESUME_EXTRACTOR_PROMPT = """
+RESUME_EXTRACTOR_SYSTEM_PROMPT = """
 Extract the following key details from the resume provided:
 
 1.  **Position Applied For**: Identify the position name and its level (e.g., Junior, Mid-level, Senior, Leadership).
@@ -13,7 +13,9 @@ Extract the following key details from the resume provided:
 
 Please format the output as a JSON object with the following keys:
 `position_applied_for`, `self_evaluation`, `skills_and_specialties`, `work_experience`, `basic_information`, `education_background`.
+"""
 
+RESUME_EXTRACTOR_USER_PROMPT = """
 Resume:
 --- --- ---
 {resume_text}
@@ -1,7 +1,44 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from collections import defaultdict
+from typing import Any, Dict, List, Literal, NamedTuple, Optional, Tuple
+import faiss
+import numpy as np
 from langchain.schema.document import Document
+from langchain_community.vectorstores import FAISS
+from src.config.config import (
+    RAG_RRF_K,
+    RAG_INDEX_POLL_INTERVAL,
+    RAG_INDEX_KEEP_VERSIONS,
+)
 from src.utils.logger import get_logger
+from .bm25_index import BM25Index, reciprocal_rank_fusion
+from .quantization import QuantizedIndex
+
+# Documents that sit directly in the sources directory (not in a sub-directory)
+DEFAULT_SOURCE_TYPE = "general"
+
+# File in the partitions directory naming the version readers should load
+CURRENT_POINTER = "CURRENT"
+VERSIONS_DIR = "versions"
+
+
+class IndexSnapshot(NamedTuple):
+    """One loaded index version. Searches read a single snapshot throughout."""
+
+    version: Optional[str]
+    partitions: Dict[str, FAISS]
+    sparse_partitions: Dict[str, BM25Index]
+    quantized_partitions: Dict[str, QuantizedIndex]
+
+
+EMPTY_SNAPSHOT = IndexSnapshot(None, {}, {}, {})
 
 
 class RAGLoader(ABC):
@@ -12,6 +49,35 @@ class RAGLoader(ABC):
 
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
+        # Replaced as a whole when a new index version is swapped in
+        self.snapshot: IndexSnapshot = EMPTY_SNAPSHOT
+        # QuantizedIndex.from_vectors arguments, or None to keep float32 FAISS
+        self.quantization_config: Optional[dict] = None
+        # Partitions directory being served, and the state of its pointer file
+        self.index_root: Optional[str] = None
+        self._pointer_mtime: Optional[int] = None
+        self._last_poll = 0.0
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def partitions(self) -> Dict[str, FAISS]:
+        """FAISS sub-indexes of the current snapshot, by source type."""
+        return self.snapshot.partitions
+
+    @property
+    def sparse_partitions(self) -> Dict[str, BM25Index]:
+        """BM25 indexes of the current snapshot, by source type."""
+        return self.snapshot.sparse_partitions
+
+    @property
+    def quantized_partitions(self) -> Dict[str, QuantizedIndex]:
+        """Quantized indexes of the current snapshot, by source type."""
+        return self.snapshot.quantized_partitions
+
+    @property
+    def index_version(self) -> Optional[str]:
+        """Version of the index currently being served."""
+        return self.snapshot.version
 
     @abstractmethod
     def load_documents_from_directory(self, directory_path: str) -> List[Document]:
@@ -39,3 +105,542 @@ class RAGLoader(ABC):
             A vector store object.
         """
         pass
+
+    @abstractmethod
+    def _get_embeddings(self):
+        """Return the LangChain embeddings object used by this loader."""
+        pass
+
+    def _source_type(self, directory_path: str, file_path: str) -> str:
+        """
+        Derive the source type of a file from its top-level sub-directory.
+
+        Args:
+            directory_path: Root directory of the RAG sources
+            file_path: Path of the loaded file
+
+        Returns:
+            The sub-directory name (e.g. "past_resumes"), or DEFAULT_SOURCE_TYPE
+        """
+        relative_path = os.path.relpath(file_path, directory_path)
+        parts = relative_path.split(os.sep)
+        return parts[0] if len(parts) > 1 else DEFAULT_SOURCE_TYPE
+
+    def _embedding_model_name(self) -> str:
+        """Return a name identifying the embedding model, stored in the manifest."""
+        embeddings = self._get_embeddings()
+        return str(
+            getattr(embeddings, "model_name", None)
+            or getattr(embeddings, "model", None)
+            or embeddings.__class__.__name__
+        )
+
+    def _load_partitions(self, partitions_path: str) -> IndexSnapshot:
+        """Load the per-source sub-indexes listed in the partition manifest."""
+        manifest_path = os.path.join(partitions_path, "manifest.json")
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+
+        if manifest.get("embedding_model") != self._embedding_model_name():
+            raise ValueError(
+                f"Cached partitions were built with {manifest.get('embedding_model')}"
+            )
+        if manifest.get("quantization") != self.quantization_config:
+            raise ValueError(
+                f"Cached partitions were built with quantization "
+                f"{manifest.get('quantization')}"
+            )
+
+        embeddings = self._get_embeddings()
+        partitions, sparse_partitions, quantized_partitions = {}, {}, {}
+        for source_type, info in manifest["partitions"].items():
+            partition_path = os.path.join(partitions_path, source_type)
+            store = FAISS.load_local(
+                partition_path, embeddings, allow_dangerous_deserialization=True
+            )
+            if info.get("bm25"):
+                sparse_index = BM25Index.load(os.path.join(partition_path, "bm25"))
+            else:
+                # Partitions built before the sparse index existed
+                sparse_index = self._build_sparse_index(store)
+                sparse_index.save(os.path.join(partition_path, "bm25"))
+            if info.get("quantization"):
+                quantized_partitions[source_type] = QuantizedIndex.load(
+                    os.path.join(partition_path, "quantized")
+                )
+            partitions[source_type] = store
+            sparse_partitions[source_type] = sparse_index
+        return IndexSnapshot(
+            manifest.get("version"), partitions, sparse_partitions, quantized_partitions
+        )
+
+    def _build_sparse_index(self, store: FAISS) -> BM25Index:
+        """Build a BM25 index over a vector store, in vector store order."""
+        texts = [
+            store.docstore.search(store.index_to_docstore_id[position]).page_content
+            for position in range(len(store.index_to_docstore_id))
+        ]
+        return BM25Index.from_texts(texts)
+
+    def _build_partitions(
+        self, documents: List[Document], partitions_path: str, version: str
+    ) -> IndexSnapshot:
+        """
+        Build one FAISS sub-index per source type and write the manifest.
+
+        The manifest is written last, so a directory without one is an
+        incomplete build.
+        """
+        grouped = defaultdict(list)
+        for doc in documents:
+            grouped[doc.metadata.get("source_type", DEFAULT_SOURCE_TYPE)].append(doc)
+
+        embeddings = self._get_embeddings()
+        partitions, sparse_partitions, quantized_partitions = {}, {}, {}
+        manifest = {
+            "version": version,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "embedding_model": self._embedding_model_name(),
+            "quantization": self.quantization_config,
+            "partitions": {},
+        }
+        for source_type, docs in grouped.items():
+            partition_path = os.path.join(partitions_path, source_type)
+            store = FAISS.from_documents(docs, embeddings)
+            if self.quantization_config:
+                quantized_index = QuantizedIndex.from_vectors(
+                    store.index.reconstruct_n(0, store.index.ntotal),
+                    **self.quantization_config,
+                )
+                quantized_index.save(os.path.join(partition_path, "quantized"))
+                quantized_partitions[source_type] = quantized_index
+                # The vectors now live in the quantized index; keep FAISS for
+                # the docstore only so the float32 index is not held in memory
+                store.index = faiss.IndexFlatL2(store.index.d)
+            store.save_local(partition_path)
+            # FAISS keeps insertion order, so BM25 positions match vector positions
+            sparse_index = BM25Index.from_texts([doc.page_content for doc in docs])
+            sparse_index.save(os.path.join(partition_path, "bm25"))
+            partitions[source_type] = store
+            sparse_partitions[source_type] = sparse_index
+            manifest["partitions"][source_type] = {
+                "documents": len(docs),
+                "bm25": True,
+                "quantization": source_type in quantized_partitions,
+            }
+            self.logger.info(f"Built partition '{source_type}' with {len(docs)} chunks")
+
+        with open(os.path.join(partitions_path, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return IndexSnapshot(
+            version, partitions, sparse_partitions, quantized_partitions
+        )
+
+    def _read_current_version(self, index_root: str) -> Optional[str]:
+        """Return the version named by the CURRENT pointer, if any."""
+        try:
+            with open(os.path.join(index_root, CURRENT_POINTER), "r") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _publish_version(self, index_root: str, version: str):
+        """Atomically point CURRENT at a completed version."""
+        tmp_path = os.path.join(index_root, f".{CURRENT_POINTER}.{uuid.uuid4().hex}")
+        with open(tmp_path, "w") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(index_root, CURRENT_POINTER))
+
+    def _prune_versions(self, index_root: str, keep: int = RAG_INDEX_KEEP_VERSIONS):
+        """Delete the oldest completed versions, never the current one."""
+        versions_path = os.path.join(index_root, VERSIONS_DIR)
+        current = self._read_current_version(index_root)
+        completed = sorted(
+            version
+            for version in os.listdir(versions_path)
+            if os.path.exists(os.path.join(versions_path, version, "manifest.json"))
+        )
+        for version in completed[: max(len(completed) - keep, 0)]:
+            if version != current:
+                self.logger.info(f"Removing old index version {version}")
+                shutil.rmtree(os.path.join(versions_path, version), ignore_errors=True)
+
+    def _load_current(self, index_root: str) -> IndexSnapshot:
+        """Load the version named by CURRENT, or an unversioned legacy index."""
+        version = self._read_current_version(index_root)
+        if version is None:
+            if not os.path.exists(os.path.join(index_root, "manifest.json")):
+                raise FileNotFoundError(f"No index published in {index_root}")
+            # Partitions written before index versioning
+            return self._load_partitions(index_root)
+        return self._load_partitions(os.path.join(index_root, VERSIONS_DIR, version))
+
+    def _pointer_state(self, index_root: str) -> Optional[int]:
+        """Modification time of the CURRENT pointer, used for cheap polling."""
+        try:
+            return os.stat(os.path.join(index_root, CURRENT_POINTER)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def rebuild_index(
+        self, sources_path: str, cache_path: str = "data/vector_store"
+    ) -> Optional[str]:
+        """
+        Build a new index version next to the live one and publish it.
+
+        The new version is written to its own directory and only becomes
+        visible when the CURRENT pointer is atomically replaced, so readers
+        never see a partial index. This loader serves the new version
+        immediately; other readers pick it up with `refresh_index`.
+
+        Args:
+            sources_path: Path to the directory containing source documents
+            cache_path: Path to cache the partitioned vector stores
+
+        Returns:
+            The published version, or None if there were no documents
+        """
+        index_root = os.path.join(cache_path, "partitions")
+        self.logger.info(f"Creating partitioned vector stores from {sources_path}...")
+        documents = self.load_documents_from_directory(sources_path)
+        if not documents:
+            self.logger.warning("No documents found to create a vector store.")
+            return None
+
+        # Sortable by build time, unique across concurrent builders
+        version = datetime.now().strftime("%Y%m%dT%H%M%S%f") + f"-{os.getpid()}"
+        version_path = os.path.join(index_root, VERSIONS_DIR, version)
+        os.makedirs(version_path)
+        try:
+            snapshot = self._build_partitions(documents, version_path, version)
+        except Exception:
+            shutil.rmtree(version_path, ignore_errors=True)
+            raise
+
+        self._publish_version(index_root, version)
+        self.logger.info(f"Published index version {version}")
+        self._prune_versions(index_root)
+        self.index_root = index_root
+        self._pointer_mtime = self._pointer_state(index_root)
+        self.snapshot = snapshot
+        return version
+
+    def refresh_index(self, force: bool = False) -> bool:
+        """
+        Swap in a newly published index version, if there is one.
+
+        Polling is rate-limited to RAG_INDEX_POLL_INTERVAL seconds and only
+        stats the CURRENT pointer unless it changed. The new version is
+        loaded while searches keep using the previous snapshot, then replaces
+        it in one assignment; in-flight searches finish on the old snapshot.
+
+        Args:
+            force: Check the pointer even if the poll interval has not elapsed
+
+        Returns:
+            True if a new version was swapped in
+        """
+        if self.index_root is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_poll < RAG_INDEX_POLL_INTERVAL:
+            return False
+        self._last_poll = now
+
+        pointer_mtime = self._pointer_state(self.index_root)
+        if pointer_mtime is None or pointer_mtime == self._pointer_mtime:
+            return False
+        # Another thread is already loading the new version
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        # Also named in the warning if reading the pointer fails
+        version = None
+        try:
+            version = self._read_current_version(self.index_root)
+            if version == self.snapshot.version:
+                self._pointer_mtime = pointer_mtime
+                return False
+            self.logger.info(f"Loading index version {version}...")
+            snapshot = self._load_current(self.index_root)
+            self._pointer_mtime = pointer_mtime
+            self.snapshot = snapshot
+            self.logger.info(f"Swapped in index version {snapshot.version}")
+            return True
+        except Exception as e:
+            self.logger.warning(
+                f"Failed to load index version {version}: {e}. "
+                f"Keeping version {self.snapshot.version}."
+            )
+            return False
+        finally:
+            self._refresh_lock.release()
+
+    def get_partitioned_vector_stores(
+        self, sources_path: str, cache_path: str = "data/vector_store"
+    ) -> Dict[str, FAISS]:
+        """
+        Get or create one FAISS sub-index per source type.
+
+        Source types are the top-level sub-directories of `sources_path`
+        (e.g. past_resumes, company_criteria, job_descriptions). Indexes are
+        versioned under `cache_path/partitions/versions`, and the CURRENT
+        pointer names the version to load. If it is missing or unusable a
+        new version is built and published.
+
+        Args:
+            sources_path: Path to the directory containing source documents
+            cache_path: Path to cache the partitioned vector stores
+
+        Returns:
+            Dictionary of {source_type: FAISS vector store}
+        """
+        index_root = os.path.join(cache_path, "partitions")
+
+        pointer_mtime = self._pointer_state(index_root)
+        try:
+            self.logger.info(f"Loading cached partitions from {index_root}...")
+            snapshot = self._load_current(index_root)
+            self.index_root = index_root
+            self._pointer_mtime = pointer_mtime
+            self.snapshot = snapshot
+            return self.partitions
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Failed to load cached partitions: {e}. Rebuilding...")
+
+        if self.rebuild_index(sources_path, cache_path) is None:
+            self.snapshot = EMPTY_SNAPSHOT
+        return self.partitions
+
+    def _documents_at(
+        self, snapshot: IndexSnapshot, source_type: str, positions
+    ) -> List[Document]:
+        """Map vector store positions of a partition back to documents."""
+        store = snapshot.partitions[source_type]
+        return [
+            store.docstore.search(store.index_to_docstore_id[int(position)])
+            for position in positions
+            if position >= 0
+        ]
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts with the loader's embedding model, e.g. to compare them.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Matrix with one embedding per text
+        """
+        return self._embed_queries(texts)
+
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed all queries in one batched call to the embedding model."""
+        embeddings = self._get_embeddings().embed_documents(list(queries))
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def _dense_search(
+        self,
+        snapshot: IndexSnapshot,
+        source_type: str,
+        query_embeddings: np.ndarray,
+        k: int,
+    ) -> Tuple[List[List[int]], List[List[float]]]:
+        """
+        Search a partition for every row of a query matrix in one call.
+
+        Returns:
+            Tuple of (positions, cosine similarities), one list per query
+        """
+        if source_type in snapshot.quantized_partitions:
+            return snapshot.quantized_partitions[source_type].search_batch(
+                query_embeddings, k
+            )
+        store = snapshot.partitions[source_type]
+        k = min(k, store.index.ntotal)
+        if k <= 0:
+            return [[] for _ in query_embeddings], [[] for _ in query_embeddings]
+
+        scores, positions = store.index.search(query_embeddings, k)
+        if store.index.metric_type == faiss.METRIC_L2:
+            # Squared L2 distance between normalized vectors is 2 - 2 * cosine
+            scores = 1.0 - scores / 2.0
+        all_positions, all_similarities = [], []
+        for row_positions, row_scores in zip(positions, scores):
+            found = row_positions >= 0
+            all_positions.append(row_positions[found].tolist())
+            all_similarities.append(row_scores[found].tolist())
+        return all_positions, all_similarities
+
+    def search_partitions_batch(
+        self,
+        queries: List[str],
+        quotas: Dict[str, int],
+        mode: Literal["dense", "lexical", "hybrid"] = "hybrid",
+        fetch_factor: int = 4,
+    ) -> List[List[Document]]:
+        """
+        Retrieve documents with a fixed number of results per source type.
+
+        All queries are embedded in one call and every partition with a
+        positive quota is searched once over the whole query matrix. In
+        "hybrid" mode dense and BM25 results are fused with reciprocal rank
+        fusion; "lexical" mode never calls the embedding model.
+
+        Args:
+            queries: The query texts
+            quotas: Dictionary of {source_type: k}
+            mode: "dense", "lexical" or "hybrid"
+            fetch_factor: Candidates fetched per ranking in hybrid mode, as a
+                          multiple of the quota
+
+        Returns:
+            One list of documents per query, grouped by source type in quota order
+        """
+        if mode not in ("dense", "lexical", "hybrid"):
+            raise ValueError(f"Unsupported retrieval mode: {mode}")
+
+        snapshot = self.snapshot
+        requested = {
+            source_type: k
+            for source_type, k in quotas.items()
+            if k > 0 and source_type in snapshot.partitions
+        }
+        for source_type in quotas:
+            if source_type not in snapshot.partitions:
+                self.logger.debug(f"No partition for source type '{source_type}'")
+        results = [[] for _ in queries]
+        if not requested or not queries:
+            return results
+
+        query_embeddings = None
+        if mode != "lexical":
+            query_embeddings = self._embed_queries(queries)
+
+        for source_type, k in requested.items():
+            fetch_k = k * fetch_factor if mode == "hybrid" else k
+            dense_positions = None
+            if mode != "lexical":
+                dense_positions, _ = self._dense_search(
+                    snapshot, source_type, query_embeddings, fetch_k
+                )
+            for idx, query in enumerate(queries):
+                if mode == "dense":
+                    positions = dense_positions[idx]
+                else:
+                    lexical, _ = snapshot.sparse_partitions[source_type].search(
+                        query, fetch_k
+                    )
+                    rankings = [lexical.tolist()]
+                    if mode == "hybrid":
+                        rankings.append(dense_positions[idx])
+                    positions = reciprocal_rank_fusion(rankings, k=RAG_RRF_K)[:k]
+                results[idx].extend(
+                    self._documents_at(snapshot, source_type, positions)
+                )
+        return results
+
+    def search_partitions(
+        self,
+        query: str,
+        quotas: Dict[str, int],
+        mode: Literal["dense", "lexical", "hybrid"] = "hybrid",
+        fetch_factor: int = 4,
+    ) -> List[Document]:
+        """
+        Retrieve documents for a single query with a fixed number of results
+        per source type. See `search_partitions_batch`.
+        """
+        return self.search_partitions_batch([query], quotas, mode, fetch_factor)[0]
+
+    def search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        filters: Optional[List[Optional[Dict[str, Any]]]] = None,
+        fetch_factor: int = 4,
+    ) -> List[List[Document]]:
+        """
+        Retrieve the k most similar documents for every query.
+
+        All queries are embedded in one forward pass and each partition is
+        searched once over the matrix of the queries that can match it.
+
+        Args:
+            queries: The query texts
+            k: Number of documents per query
+            filters: Optional metadata filter per query, e.g.
+                     {"source_type": "past_resumes"}. Values may be lists of
+                     accepted values. A "source_type" filter restricts which
+                     partitions are searched; other keys are applied to the
+                     fetched candidates.
+            fetch_factor: Candidates fetched per partition when a query has
+                          filters beyond "source_type", as a multiple of k
+
+        Returns:
+            One list of documents per query, most similar first
+        """
+        filters = filters or [None] * len(queries)
+        if len(filters) != len(queries):
+            raise ValueError("filters must have one entry per query")
+        results = [[] for _ in queries]
+        if not queries or k <= 0:
+            return results
+        snapshot = self.snapshot
+        if not snapshot.partitions:
+            self.logger.warning("No partitions loaded; returning empty results.")
+            return results
+
+        def accepted(value, expected) -> bool:
+            if isinstance(expected, (list, tuple, set)):
+                return value in expected
+            return value == expected
+
+        # Which queries search which partition, and how many candidates they need
+        partition_queries = defaultdict(list)
+        for idx, query_filter in enumerate(filters):
+            query_filter = query_filter or {}
+            for source_type in snapshot.partitions:
+                if "source_type" in query_filter and not accepted(
+                    source_type, query_filter["source_type"]
+                ):
+                    continue
+                partition_queries[source_type].append(idx)
+
+        query_embeddings = self._embed_queries(queries)
+        candidates = [[] for _ in queries]
+        for source_type, indices in partition_queries.items():
+            needs_post_filter = any(
+                set(filters[idx] or {}) - {"source_type"} for idx in indices
+            )
+            fetch_k = k * fetch_factor if needs_post_filter else k
+            positions, similarities = self._dense_search(
+                snapshot, source_type, query_embeddings[indices], fetch_k
+            )
+            for idx, row_positions, row_similarities in zip(
+                indices, positions, similarities
+            ):
+                documents = self._documents_at(snapshot, source_type, row_positions)
+                candidates[idx].extend(zip(row_similarities, documents))
+
+        for idx, query_filter in enumerate(filters):
+            metadata_filter = {
+                key: value
+                for key, value in (query_filter or {}).items()
+                if key != "source_type"
+            }
+            matches = [
+                (similarity, doc)
+                for similarity, doc in candidates[idx]
+                if all(
+                    accepted(doc.metadata.get(key), value)
+                    for key, value in metadata_filter.items()
+                )
+            ]
+            matches.sort(key=lambda match: match[0], reverse=True)
+            results[idx] = [doc for _, doc in matches[:k]]
+        return results
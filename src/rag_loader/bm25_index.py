@@ -0,0 +1,172 @@
+"""
+Sparse BM25 index stored as compressed-sparse-column arrays.
+
+Postings are grouped by term: `term_offsets[t]:term_offsets[t + 1]` slices
+`doc_ids` and `weights` for term `t`. BM25 weights (idf and length
+normalisation included) are precomputed at build time, so scoring a query
+is a sum over the postings of its terms and needs no embedding model.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# Keeps skill tokens such as "c++", "c#", "ci/cd" and "node.js" intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into BM25 terms."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[int]], k: int = 60) -> List[int]:
+    """
+    Fuse several ranked lists of document positions.
+
+    Args:
+        rankings: Ranked lists of document positions, best first
+        k: RRF smoothing constant
+
+    Returns:
+        Document positions ordered by fused score, best first
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, position in enumerate(ranking):
+            scores[position] = scores.get(position, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=lambda position: (-scores[position], position))
+
+
+class BM25Index:
+    """A BM25 inverted index over the documents of one vector store partition."""
+
+    def __init__(
+        self,
+        vocabulary: List[str],
+        term_offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+        num_documents: int,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.vocabulary = vocabulary
+        self.term_ids = {term: idx for idx, term in enumerate(vocabulary)}
+        self.term_offsets = term_offsets
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.num_documents = num_documents
+        self.k1 = k1
+        self.b = b
+
+    @classmethod
+    def from_texts(
+        cls, texts: Sequence[str], k1: float = 1.5, b: float = 0.75
+    ) -> "BM25Index":
+        """
+        Build the index. Document positions follow the order of `texts`.
+
+        Args:
+            texts: Document texts, in vector store order
+            k1: BM25 term frequency saturation
+            b: BM25 length normalisation
+
+        Returns:
+            The built BM25Index
+        """
+        term_ids: Dict[str, int] = {}
+        rows, cols, tfs = [], [], []
+        doc_lengths = np.zeros(len(texts), dtype=np.float32)
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            doc_lengths[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                rows.append(term_ids.setdefault(term, len(term_ids)))
+                cols.append(doc_id)
+                tfs.append(tf)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int32)
+        tfs = np.asarray(tfs, dtype=np.float32)
+
+        order = np.argsort(rows, kind="stable")
+        rows, cols, tfs = rows[order], cols[order], tfs[order]
+        doc_freqs = np.bincount(rows, minlength=len(term_ids))
+        term_offsets = np.zeros(len(term_ids) + 1, dtype=np.int64)
+        np.cumsum(doc_freqs, out=term_offsets[1:])
+
+        num_documents = len(texts)
+        avg_length = float(doc_lengths.mean()) if num_documents else 0.0
+        idf = np.log1p((num_documents - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        norm = k1 * (1 - b + b * doc_lengths[cols] / max(avg_length, 1e-9))
+        weights = (idf[rows] * tfs * (k1 + 1) / (tfs + norm)).astype(np.float32)
+
+        vocabulary = [None] * len(term_ids)
+        for term, idx in term_ids.items():
+            vocabulary[idx] = term
+        return cls(vocabulary, term_offsets, cols, weights, num_documents, k1, b)
+
+    def scores(self, query: str) -> np.ndarray:
+        """Return the BM25 score of every document for the query."""
+        scores = np.zeros(self.num_documents, dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            scores[self.doc_ids[start:end]] += self.weights[start:end]
+        return scores
+
+    def search(self, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the top-k matching document positions and their scores.
+
+        Documents sharing no term with the query are never returned.
+        """
+        scores = self.scores(query)
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        return ranked, scores[ranked]
+
+    def save(self, path: str):
+        """Save the index arrays and vocabulary to a directory."""
+        os.makedirs(path, exist_ok=True)
+        np.savez(
+            os.path.join(path, "postings.npz"),
+            term_offsets=self.term_offsets,
+            doc_ids=self.doc_ids,
+            weights=self.weights,
+        )
+        with open(os.path.join(path, "vocabulary.json"), "w") as f:
+            json.dump(
+                {
+                    "num_documents": self.num_documents,
+                    "k1": self.k1,
+                    "b": self.b,
+                    "terms": self.vocabulary,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Load an index saved with `save`."""
+        with open(os.path.join(path, "vocabulary.json"), "r") as f:
+            meta = json.load(f)
+        with np.load(os.path.join(path, "postings.npz")) as arrays:
+            return cls(
+                meta["terms"],
+                arrays["term_offsets"],
+                arrays["doc_ids"],
+                arrays["weights"],
+                meta["num_documents"],
+                meta["k1"],
+                meta["b"],
+            )
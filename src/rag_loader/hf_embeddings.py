@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 import os
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import FAISS
@@ -16,6 +16,7 @@ class HFEmbeddingsWrapper:
         model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
         model_kwargs: Optional[dict] = None,
         encode_kwargs: Optional[dict] = None,
+        backend: Literal["torch", "onnx"] = "torch",
     ):
         """
         Initialize the HuggingFace embeddings wrapper.
@@ -24,8 +25,18 @@ class HFEmbeddingsWrapper:
             model_name: Name of the HuggingFace model to use for embeddings
             model_kwargs: Additional arguments to pass to the model
             encode_kwargs: Additional arguments to pass to the encode method
+            backend: "torch" for sentence-transformers on PyTorch, or "onnx"
+                     for an int8-quantized ONNX Runtime model
         """
         super().__init__()
+        if backend == "onnx":
+            from .onnx_embeddings import ONNXEmbeddings
+
+            self.embeddings = ONNXEmbeddings(model_name=model_name)
+            return
+        if backend != "torch":
+            raise ValueError(f"Unsupported embedding backend: {backend}")
+
         if model_kwargs is None:
             model_kwargs = {"device": "cpu"}
         if encode_kwargs is None:
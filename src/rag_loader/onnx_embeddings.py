@@ -0,0 +1,190 @@
+"""
+ONNX Runtime backend for sentence-transformers embeddings.
+
+The model is exported to ONNX once with `optimum`, optionally quantized to
+dynamic int8, and cached on disk. Later runs only need `onnxruntime` and a
+tokenizer, so neither PyTorch nor its import time are paid at query time.
+"""
+
+import os
+import time
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ONNXEmbeddings(Embeddings):
+    """Mean-pooled sentence embeddings computed with ONNX Runtime on CPU."""
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        cache_dir: str = "data/onnx_models",
+        quantize: bool = True,
+        batch_size: int = 32,
+        max_length: int = 256,
+        normalize_embeddings: bool = True,
+    ):
+        """
+        Initialize the ONNX embeddings, exporting the model if needed.
+
+        Args:
+            model_name: Name of the HuggingFace sentence-transformers model
+            cache_dir: Directory where exported ONNX models are cached
+            quantize: Whether to use a dynamically int8-quantized model
+            batch_size: Number of texts per ONNX Runtime call
+            max_length: Maximum number of tokens per text
+            normalize_embeddings: Whether to L2-normalize the embeddings
+        """
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "ONNX embedding backend not available. "
+                "Install it with `pip install optimum[onnxruntime]`."
+            ) from e
+
+        self.model_name = f"{model_name}#onnx{'-int8' if quantize else ''}"
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.normalize_embeddings = normalize_embeddings
+
+        model_dir = os.path.join(cache_dir, model_name.replace("/", "__"))
+        model_file = "model_quantized.onnx" if quantize else "model.onnx"
+        if not os.path.exists(os.path.join(model_dir, model_file)):
+            self._export(model_name, model_dir, quantize)
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file),
+            session_options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {
+            model_input.name for model_input in self.session.get_inputs()
+        }
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+    @staticmethod
+    def _export(model_name: str, model_dir: str, quantize: bool):
+        """Export the model to ONNX and apply dynamic int8 quantization."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        logger.info(f"Exporting {model_name} to ONNX in {model_dir}...")
+        model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+        model.save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+
+        if quantize:
+            logger.info("Applying dynamic int8 quantization...")
+            quantizer = ORTQuantizer.from_pretrained(model_dir)
+            quantization_config = AutoQuantizationConfig.avx2(
+                is_static=False, per_channel=False
+            )
+            quantizer.quantize(
+                save_dir=model_dir, quantization_config=quantization_config
+            )
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batches and return a float32 matrix."""
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            encoded = self.tokenizer(
+                texts[start : start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            inputs = {
+                name: values.astype(np.int64)
+                for name, values in encoded.items()
+                if name in self.input_names
+            }
+            token_embeddings = self.session.run(None, inputs)[0]
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(
+                mask.sum(axis=1), 1e-9
+            )
+            if self.normalize_embeddings:
+                pooled /= np.maximum(
+                    np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12
+                )
+            batches.append(pooled.astype(np.float32))
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(batches)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents."""
+        return self._embed(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self._embed([text])[0].tolist()
+
+
+def compare_embedding_backends(
+    texts: List[str],
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    repeats: int = 3,
+    onnx_embeddings: Optional[ONNXEmbeddings] = None,
+) -> dict:
+    """
+    Check the ONNX backend against PyTorch and measure embedding throughput.
+
+    Args:
+        texts: Sample texts, e.g. resume chunks
+        model_name: Name of the HuggingFace sentence-transformers model
+        repeats: Number of timed passes per backend (the best one is kept)
+        onnx_embeddings: An existing ONNXEmbeddings instance to evaluate
+
+    Returns:
+        Dictionary with the per-text cosine agreement between the backends
+        ("min_cosine", "mean_cosine") and the texts per second of each backend
+    """
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+
+    torch_embeddings = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": "cpu"},
+        encode_kwargs={"normalize_embeddings": True},
+    )
+    onnx_embeddings = onnx_embeddings or ONNXEmbeddings(model_name=model_name)
+
+    def throughput(embeddings) -> float:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            embeddings.embed_documents(texts)
+            best = min(best, time.perf_counter() - start)
+        return len(texts) / best
+
+    reference = np.asarray(torch_embeddings.embed_documents(texts), dtype=np.float32)
+    candidate = np.asarray(onnx_embeddings.embed_documents(texts), dtype=np.float32)
+    cosines = (reference * candidate).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+
+    torch_rate = throughput(torch_embeddings)
+    onnx_rate = throughput(onnx_embeddings)
+    report = {
+        "num_texts": len(texts),
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "torch_texts_per_second": torch_rate,
+        "onnx_texts_per_second": onnx_rate,
+        "speedup": onnx_rate / torch_rate,
+    }
+    logger.info(f"Embedding backend comparison: {report}")
+    return report
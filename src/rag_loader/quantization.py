@@ -0,0 +1,221 @@
+"""
+Compact vector index with optional dimensionality reduction and quantization.
+
+Vectors are reduced (PCA or Matryoshka truncation) and quantized (int8 or
+binary) at build time. Searches score the queries in the same compact space,
+then rescore the best candidates against the original float32 vectors, which
+are memory-mapped from disk so only the candidate rows are read.
+"""
+
+import json
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+QUANTIZATION_TYPES = ("none", "int8", "binary")
+REDUCTION_TYPES = ("none", "pca", "matryoshka")
+
+# Number of set bits for every byte value, used for Hamming distances
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class QuantizedIndex:
+    """A reduced and quantized copy of a partition's embedding vectors."""
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        full_vectors: np.ndarray,
+        quantization: str = "int8",
+        reduction: str = "none",
+        dimensions: Optional[int] = None,
+        scales: Optional[np.ndarray] = None,
+        mean: Optional[np.ndarray] = None,
+        components: Optional[np.ndarray] = None,
+        rescore_factor: int = 4,
+    ):
+        self.codes = codes
+        self.full_vectors = full_vectors
+        self.quantization = quantization
+        self.reduction = reduction
+        self.dimensions = dimensions
+        self.scales = scales
+        self.mean = mean
+        self.components = components
+        self.rescore_factor = rescore_factor
+
+    @property
+    def params(self) -> dict:
+        """Build parameters, as stored in the index manifest."""
+        return {
+            "quantization": self.quantization,
+            "reduction": self.reduction,
+            "dimensions": self.dimensions,
+            "rescore_factor": self.rescore_factor,
+        }
+
+    @classmethod
+    def from_vectors(
+        cls,
+        vectors: np.ndarray,
+        quantization: str = "int8",
+        reduction: str = "none",
+        dimensions: Optional[int] = None,
+        rescore_factor: int = 4,
+    ) -> "QuantizedIndex":
+        """
+        Reduce and quantize a matrix of normalized embedding vectors.
+
+        Args:
+            vectors: Float32 matrix of shape (num_vectors, embedding_dim)
+            quantization: "none", "int8" or "binary"
+            reduction: "none", "pca" or "matryoshka" (only meaningful for
+                       models trained with Matryoshka representation learning)
+            dimensions: Target dimensionality when a reduction is used
+            rescore_factor: Candidates rescored in float32, as a multiple of k
+
+        Returns:
+            The built QuantizedIndex
+        """
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        if reduction not in REDUCTION_TYPES:
+            raise ValueError(f"Unsupported reduction: {reduction}")
+        if reduction != "none" and not dimensions:
+            raise ValueError(f"Reduction '{reduction}' requires dimensions")
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        index = cls(
+            codes=None,
+            full_vectors=vectors,
+            quantization=quantization,
+            reduction=reduction,
+            dimensions=dimensions if reduction != "none" else None,
+            rescore_factor=rescore_factor,
+        )
+        if reduction == "pca":
+            index.mean = vectors.mean(axis=0)
+            _, _, vt = np.linalg.svd(vectors - index.mean, full_matrices=False)
+            index.components = vt[:dimensions].astype(np.float32)
+            index.dimensions = len(index.components)
+
+        reduced = index._reduce(vectors)
+        if quantization == "int8":
+            index.scales = np.maximum(np.abs(reduced).max(axis=0), 1e-12) / 127.0
+            index.codes = np.round(reduced / index.scales).astype(np.int8)
+        elif quantization == "binary":
+            index.codes = np.packbits(reduced > 0, axis=1)
+        else:
+            index.codes = reduced.astype(np.float32)
+        return index
+
+    def _reduce(self, vectors: np.ndarray) -> np.ndarray:
+        """Project vectors into the reduced space and renormalize them."""
+        if self.reduction == "pca":
+            return _normalize((vectors - self.mean) @ self.components.T)
+        if self.reduction == "matryoshka":
+            return _normalize(vectors[..., : self.dimensions])
+        return vectors
+
+    def _compact_scores(self, queries: np.ndarray) -> np.ndarray:
+        """Score every vector against a matrix of queries in the compact space."""
+        reduced = self._reduce(queries)
+        if self.quantization == "int8":
+            return (reduced * self.scales).astype(np.float32) @ self.codes.T
+        if self.quantization == "binary":
+            query_bits = np.packbits(reduced > 0, axis=1)
+            # One query at a time keeps the XOR buffer at codes.nbytes
+            distances = np.stack(
+                [
+                    _POPCOUNT[np.bitwise_xor(self.codes, bits)].sum(axis=1)
+                    for bits in query_bits
+                ]
+            )
+            return -distances.astype(np.float32)
+        return reduced @ self.codes.T
+
+    def search_batch(
+        self, query_embeddings, k: int
+    ) -> Tuple[List[List[int]], List[List[float]]]:
+        """
+        Return the k most similar vectors for every query, best first.
+
+        Args:
+            query_embeddings: Normalized float query embeddings, one per row
+            k: Number of results per query
+
+        Returns:
+            Tuple of (positions, cosine similarities), one list per query
+        """
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        num_vectors = len(self.codes)
+        k = min(k, num_vectors)
+        if k <= 0:
+            return [[] for _ in queries], [[] for _ in queries]
+
+        scores = self._compact_scores(queries)
+        num_candidates = min(num_vectors, k * self.rescore_factor)
+        all_positions, all_similarities = [], []
+        for query, query_scores in zip(queries, scores):
+            if num_candidates < num_vectors:
+                candidates = np.argpartition(-query_scores, num_candidates - 1)[
+                    :num_candidates
+                ]
+            else:
+                candidates = np.arange(num_vectors)
+            candidates = np.sort(candidates)
+            rescored = (
+                np.asarray(self.full_vectors[candidates], dtype=np.float32) @ query
+            )
+            order = np.argsort(-rescored, kind="stable")[:k]
+            all_positions.append(candidates[order].tolist())
+            all_similarities.append(rescored[order].tolist())
+        return all_positions, all_similarities
+
+    def search(self, query_embedding, k: int) -> np.ndarray:
+        """
+        Return the positions of the k most similar vectors, best first.
+
+        Args:
+            query_embedding: Normalized float query embedding
+            k: Number of results
+
+        Returns:
+            Array of vector positions
+        """
+        positions, _ = self.search_batch([query_embedding], k)
+        return np.asarray(positions[0], dtype=np.int64)
+
+    def save(self, path: str):
+        """Save the compact codes, projection and float32 vectors to a directory."""
+        os.makedirs(path, exist_ok=True)
+        arrays = {"codes": self.codes}
+        for name in ("scales", "mean", "components"):
+            if getattr(self, name) is not None:
+                arrays[name] = getattr(self, name)
+        np.savez(os.path.join(path, "codes.npz"), **arrays)
+        np.save(os.path.join(path, "vectors.npy"), np.asarray(self.full_vectors))
+        with open(os.path.join(path, "params.json"), "w") as f:
+            json.dump(self.params, f)
+
+    @classmethod
+    def load(cls, path: str) -> "QuantizedIndex":
+        """Load an index saved with `save`; float32 vectors stay on disk."""
+        with open(os.path.join(path, "params.json"), "r") as f:
+            params = json.load(f)
+        with np.load(os.path.join(path, "codes.npz")) as arrays:
+            loaded = {name: arrays[name] for name in arrays.files}
+        return cls(
+            codes=loaded["codes"],
+            full_vectors=np.load(os.path.join(path, "vectors.npy"), mmap_mode="r"),
+            scales=loaded.get("scales"),
+            mean=loaded.get("mean"),
+            components=loaded.get("components"),
+            **params,
+        )
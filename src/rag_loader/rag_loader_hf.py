@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Literal, Optional
 from langchain.document_loaders import (
     PyPDFLoader,
     UnstructuredMarkdownLoader,
@@ -7,6 +7,13 @@ from langchain.document_loaders import (
 )
 from langchain.schema.document import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from src.config.config import (
+    HF_EMBEDDING_BACKEND,
+    HF_INDEX_QUANTIZATION,
+    HF_INDEX_REDUCTION,
+    HF_INDEX_DIMENSIONS,
+    HF_INDEX_RESCORE_FACTOR,
+)
 from .base_rag_loader import RAGLoader
 from .hf_embeddings import HFEmbeddingsWrapper
 from langchain_community.vectorstores import FAISS
@@ -20,6 +27,11 @@ class HFRAGLoader(RAGLoader):
         model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
+        quantization: Literal["none", "int8", "binary"] = HF_INDEX_QUANTIZATION,
+        reduction: Literal["none", "pca", "matryoshka"] = HF_INDEX_REDUCTION,
+        dimensions: Optional[int] = HF_INDEX_DIMENSIONS,
+        rescore_factor: int = HF_INDEX_RESCORE_FACTOR,
+        backend: Literal["torch", "onnx"] = HF_EMBEDDING_BACKEND,
     ):
         """
         Initialize the RAG loader.
@@ -28,13 +40,31 @@ class HFRAGLoader(RAGLoader):
             model_name: Name of the HuggingFace model to use for embeddings
             chunk_size: Size of text chunks for splitting documents
             chunk_overlap: Overlap between chunks
+            quantization: Storage of the partition vectors ("none", "int8", "binary")
+            reduction: Dimensionality reduction ("none", "pca", "matryoshka")
+            dimensions: Target dimensionality when a reduction is used
+            rescore_factor: Candidates rescored in float32, as a multiple of k
+            backend: Embedding backend ("torch" or "onnx")
         """
         super().__init__()
-        self.embeddings_wrapper = HFEmbeddingsWrapper(model_name=model_name)
+        self.embeddings_wrapper = HFEmbeddingsWrapper(
+            model_name=model_name, backend=backend
+        )
+        if quantization != "none" or reduction != "none":
+            self.quantization_config = {
+                "quantization": quantization,
+                "reduction": reduction,
+                "dimensions": dimensions if reduction != "none" else None,
+                "rescore_factor": rescore_factor,
+            }
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size, chunk_overlap=chunk_overlap
         )
 
+    def _get_embeddings(self):
+        """Return the HuggingFace embeddings object."""
+        return self.embeddings_wrapper.embeddings
+
     def load_documents_from_directory(self, directory_path: str) -> List[Document]:
         """Load and split documents from a directory."""
         documents = []
@@ -44,28 +74,20 @@ class HFRAGLoader(RAGLoader):
                 try:
                     if filename.endswith(".pdf"):
                         loader = PyPDFLoader(file_path)
-                        docs = loader.load()
-                        docs = self.text_splitter.split_documents(docs)
-                        documents.extend(docs)
-                        self.logger.info(
-                            f"Successfully loaded and split {filename} into {len(docs)} chunks"
-                        )
                     elif filename.endswith(".md"):
                         loader = UnstructuredMarkdownLoader(file_path)
-                        docs = loader.load()
-                        docs = self.text_splitter.split_documents(docs)
-                        documents.extend(docs)
-                        self.logger.info(
-                            f"Successfully loaded and split {filename} into {len(docs)} chunks"
-                        )
                     elif filename.endswith(".txt"):
                         loader = TextLoader(file_path)
-                        docs = loader.load()
-                        docs = self.text_splitter.split_documents(docs)
-                        documents.extend(docs)
-                        self.logger.info(
-                            f"Successfully loaded and split {filename} into {len(docs)} chunks"
-                        )
+                    else:
+                        continue
+                    docs = self.text_splitter.split_documents(loader.load())
+                    source_type = self._source_type(directory_path, file_path)
+                    for doc in docs:
+                        doc.metadata["source_type"] = source_type
+                    documents.extend(docs)
+                    self.logger.info(
+                        f"Successfully loaded and split {filename} into {len(docs)} chunks"
+                    )
                 except Exception as e:
                     self.logger.error(f"Failed to load {filename}: {e}")
         return documents
@@ -114,36 +136,35 @@ class HFRAGLoader(RAGLoader):
     def rebuild_vector_store(
         self, sources_path: str = "data/sources", cache_path: str = "data/vector_store"
     ) -> bool:
-        # Initialize RAG loader
-        try:
-            # Force rebuild by removing existing index
-            import shutil
+        """
+        Rebuild the partitioned vector store as a new index version.
 
-            if os.path.exists(cache_path):
-                self.logger.info(f"Removing existing vector store at {cache_path}")
-                shutil.rmtree(cache_path)
+        The live index is left in place until the new version is complete and
+        published, so running evaluators keep serving it and swap over on
+        their next poll.
 
-            # Create directory if it doesn't exist
-            os.makedirs(cache_path, exist_ok=True)
+        Args:
+            sources_path: Path to the directory containing source documents
+            cache_path: Path to cache the vector store
 
-            # Rebuild vector store
+        Returns:
+            True if a new version was published
+        """
+        try:
             self.logger.info(f"Rebuilding vector store from {sources_path}")
-            vector_store = self.get_vector_store(sources_path, cache_path)
+            version = self.rebuild_index(sources_path, cache_path)
 
-            if vector_store is None:
+            if version is None:
                 self.logger.error("Failed to rebuild vector store")
                 return False
 
-            # Verify the vector store
-            if hasattr(vector_store, "index") and hasattr(vector_store.index, "ntotal"):
-                self.logger.info(
-                    f"Successfully rebuilt vector store with {vector_store.index.ntotal} vectors"
-                )
-            else:
-                self.logger.warning(
-                    "Rebuilt vector store, but couldn't verify vector count"
-                )
-
+            num_vectors = sum(
+                len(store.index_to_docstore_id) for store in self.partitions.values()
+            )
+            self.logger.info(
+                f"Successfully rebuilt vector store version {version} "
+                f"with {num_vectors} vectors"
+            )
             return True
 
         except Exception as e:
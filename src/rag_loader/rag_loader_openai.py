@@ -14,6 +14,10 @@ class OpenAIRAGLoader(RAGLoader):
         super().__init__()
         self.embeddings = OpenAIEmbeddings()
 
+    def _get_embeddings(self):
+        """Return the OpenAI embeddings object."""
+        return self.embeddings
+
     def load_documents_from_directory(self, directory_path: str) -> List[Document]:
         """Recursively loads all supported files (PDF, Markdown) from a directory."""
         documents = []
@@ -23,12 +27,18 @@ class OpenAIRAGLoader(RAGLoader):
                 try:
                     if filename.endswith(".pdf"):
                         loader = PyPDFLoader(file_path)
-                        documents.extend(loader.load_and_split())
+                        docs = loader.load_and_split()
                         self.logger.info(f"Successfully loaded and split {filename}")
                     elif filename.endswith(".md"):
                         loader = UnstructuredMarkdownLoader(file_path)
-                        documents.extend(loader.load())
+                        docs = loader.load()
                         self.logger.info(f"Successfully loaded {filename}")
+                    else:
+                        continue
+                    source_type = self._source_type(directory_path, file_path)
+                    for doc in docs:
+                        doc.metadata["source_type"] = source_type
+                    documents.extend(docs)
                 except Exception as e:
                     self.logger.error(f"Failed to load {filename}: {e}")
         return documents
@@ -0,0 +1,131 @@
+"""
+Candidate Pre-Ranking
+
+Embedding-based pre-ranking of resumes against a job description.
+
+Running the hiring pipeline (extraction, RAG evaluation, summary) on every
+applicant costs several LLM calls per resume. The pre-ranker embeds all
+resumes and the job description with a local HuggingFace model, scores them
+with a single matrix product of the normalized embeddings (cosine
+similarity), and keeps only the top-K resumes and/or those above a minimum
+similarity, so the LLM workload grows with K instead of the applicant pool.
+
+Sentence-transformer models only embed the beginning of long inputs (e.g.
+256 word pieces for all-MiniLM-L6-v2), so the score reflects the first part
+of each resume; it is meant as a coarse filter ahead of the full evaluation.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config.config import HF_EMBEDDING_BACKEND, PRERANK_MODEL
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CandidateRanker:
+    """Ranks resumes by the cosine similarity of their embedding to the job description."""
+
+    def __init__(
+        self,
+        model_name: str = PRERANK_MODEL,
+        backend: str = HF_EMBEDDING_BACKEND,
+        embeddings: Optional[object] = None,
+    ):
+        """
+        Initialize the ranker.
+
+        Args:
+            model_name: HuggingFace embedding model
+            backend: "torch" or "onnx" (see HFEmbeddingsWrapper)
+            embeddings: Optional LangChain embeddings to use instead of loading
+                        `model_name` (e.g. HFEmbeddingsWrapper(...).embeddings)
+        """
+        self.model_name = model_name
+        self.backend = backend
+        self._embeddings = embeddings
+
+    @property
+    def embeddings(self):
+        """The embedding model, loaded on first use."""
+        if self._embeddings is None:
+            from src.rag_loader.hf_embeddings import HFEmbeddingsWrapper
+
+            logger.info(f"Loading pre-ranking embedding model {self.model_name}...")
+            self._embeddings = HFEmbeddingsWrapper(
+                model_name=self.model_name, backend=self.backend
+            ).embeddings
+        return self._embeddings
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """Scale rows to unit length (zero rows stay zero)."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def score(self, resume_texts: List[str], job_description: str) -> np.ndarray:
+        """
+        Compute the cosine similarity of every resume to the job description.
+
+        Args:
+            resume_texts: Resume texts
+            job_description: The job description
+
+        Returns:
+            Array with one similarity per resume
+        """
+        if not resume_texts:
+            return np.zeros(0, dtype=np.float32)
+        resume_vectors = np.asarray(
+            self.embeddings.embed_documents(list(resume_texts)), dtype=np.float32
+        )
+        job_vector = np.asarray(
+            self.embeddings.embed_query(job_description), dtype=np.float32
+        )
+        return self._normalize(resume_vectors) @ self._normalize(job_vector)
+
+    def rank(
+        self,
+        resumes: List[Dict[str, str]],
+        job_description: str,
+        top_k: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Dict[str, float]]]:
+        """
+        Select the resumes to forward to the full pipeline.
+
+        Args:
+            resumes: List of dictionaries containing resume_id and resume_text
+            job_description: The job description to rank against
+            top_k: Keep at most this many of the best-scoring resumes
+            min_score: Keep only resumes with at least this similarity
+
+        Returns:
+            Tuple of (the selected resumes, best first, ranking by resume_id
+            with the "prerank_score", the 1-based "prerank_position" and
+            whether the resume was "forwarded")
+        """
+        scores = self.score(
+            [resume["resume_text"] for resume in resumes], job_description
+        )
+        order = np.argsort(-scores, kind="stable")
+        keep = np.ones(len(order), dtype=bool)
+        if min_score is not None:
+            keep &= scores[order] >= min_score
+        if top_k is not None:
+            keep[top_k:] = False
+
+        selected, ranking = [], {}
+        for position, (idx, forwarded) in enumerate(zip(order, keep), start=1):
+            resume = resumes[idx]
+            ranking[resume["resume_id"]] = {
+                "prerank_score": float(scores[idx]),
+                "prerank_position": position,
+                "forwarded": bool(forwarded),
+            }
+            if forwarded:
+                selected.append(resume)
+        logger.info(f"Pre-ranking forwarded {len(selected)} of {len(resumes)} resumes.")
+        return selected, ranking
@@ -0,0 +1,128 @@
+"""
+Cascade Calibration
+
+Offline calibration of the cascaded resume evaluation. A labelled sample is
+scored by both the cheap screener and the full RAG evaluation; the report
+then shows, for a grid of screening thresholds, how many resumes would
+escalate to the full evaluation and how often the screener's own decisions
+disagree with it.
+"""
+
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..agents.resume import ResumeEvaluatorAgent
+from ..config.config import CASCADE_PASS_SCORE
+
+SCORE_KEYS = (
+    "self_evaluation_score",
+    "skills_score",
+    "experience_score",
+    "basic_info_score",
+    "education_score",
+)
+
+
+def total_score(evaluation: str) -> Optional[float]:
+    """
+    Total score (0-10) of a full evaluation.
+
+    Args:
+        evaluation: JSON string returned by the full evaluation
+
+    Returns:
+        The sum of the criterion scores, or None for error or unparsable
+        evaluations
+    """
+    try:
+        evaluation_json = json.loads(evaluation)
+        if "error" in evaluation_json:
+            return None
+        return float(sum(float(evaluation_json[key]) for key in SCORE_KEYS))
+    except (json.JSONDecodeError, TypeError, KeyError, ValueError):
+        return None
+
+
+def calibrate_cascade(
+    evaluator: ResumeEvaluatorAgent,
+    items: List[Dict[str, str]],
+    pass_score: float = CASCADE_PASS_SCORE,
+    reject_grid: Sequence[float] = (2.0, 3.0, 4.0, 5.0, 6.0),
+    accept_grid: Sequence[float] = (6.0, 7.0, 8.0, 9.0, 10.01),
+    min_confidence: Optional[float] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Score a sample with the screener and the full evaluation and sweep thresholds.
+
+    Args:
+        evaluator: The evaluator whose screener is calibrated
+        items: List of dictionaries containing resume_id, resume_details and
+               job_description
+        pass_score: Full-evaluation total counted as a pass
+        reject_grid: Candidate rejection thresholds
+        accept_grid: Candidate acceptance thresholds (above 10: never accept)
+        min_confidence: Minimum screener confidence (default: the evaluator's)
+
+    Returns:
+        Tuple of (per-resume DataFrame with the screening score, confidence
+        and full score, sweep DataFrame with one row per threshold pair:
+        the share of resumes escalated, wrongly rejected and wrongly
+        accepted by the screener, and the agreement of the cascade's verdicts
+        with the full evaluation)
+    """
+    screenings = evaluator.screen_batch(items)
+    evaluations = evaluator.batch(items, cascade=False)
+    results = pd.DataFrame(
+        [
+            {
+                "resume_id": item["resume_id"],
+                "screening_score": screening["score"],
+                "confidence": screening["confidence"],
+                "full_score": total_score(evaluation["evaluation_scores_json"]),
+            }
+            for item, screening, evaluation in zip(items, screenings, evaluations)
+        ]
+    )
+    results["full_pass"] = results["full_score"] >= pass_score
+    labelled = [
+        (screening, score >= pass_score)
+        for screening, score in zip(screenings, results["full_score"])
+        if not pd.isna(score)
+    ]
+    if not labelled:
+        raise ValueError("No resume in the sample received a full evaluation score")
+    passed = np.array([full_pass for _, full_pass in labelled])
+
+    rows = []
+    # The evaluator's current thresholds are always part of the sweep
+    for reject_below in sorted({*reject_grid, evaluator.reject_below}):
+        for accept_above in sorted({*accept_grid, evaluator.accept_above}):
+            if accept_above < reject_below:
+                continue
+            decisions = np.array(
+                [
+                    evaluator.decide(
+                        screening, reject_below, accept_above, min_confidence
+                    )
+                    for screening, _ in labelled
+                ]
+            )
+            rejected, accepted = decisions == "reject", decisions == "accept"
+            # Escalated resumes get the full evaluation's verdict
+            final_pass = np.where(decisions == "escalate", passed, accepted)
+            rows.append(
+                {
+                    "reject_below": reject_below,
+                    "accept_above": accept_above,
+                    "escalation_rate": float((decisions == "escalate").mean()),
+                    "false_reject_rate": float((rejected & passed).mean()),
+                    "false_accept_rate": float((accepted & ~passed).mean()),
+                    "agreement": float((final_pass == passed).mean()),
+                    "current": reject_below == evaluator.reject_below
+                    and accept_above == evaluator.accept_above,
+                }
+            )
+    return results, pd.DataFrame(rows)
@@ -0,0 +1,196 @@
+"""
+Columnar Output
+
+Arrow/Parquet output for the batch helpers in `pipeline_utils`.
+
+Instead of a dictionary of result dictionaries, the items are processed in
+row groups of `row_group_size`; every row group becomes an Arrow record
+batch with one column per stage output, which is appended to a Parquet file
+as soon as it is done (so an interrupted run keeps the finished row groups)
+and/or collected into an Arrow table. `table.to_pandas()` turns the result
+into a DataFrame without any row-wise assignment.
+
+Token usage and latency are measured per row group, since the agents batch
+their LLM calls: every row carries its row group's wall-clock time, LLM
+calls and input/output tokens.
+
+pyarrow is an optional dependency, imported on first use.
+"""
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from src.config.config import OUTPUT_ROW_GROUP_SIZE
+from src.models import get_usage_report
+from src.utils.input_readers import chunked
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Columns added to every row, describing the row group it was processed in
+ROW_GROUP_COLUMNS = {
+    "row_group": "int",
+    "row_group_latency_s": "float",
+    "row_group_calls": "int",
+    "row_group_input_tokens": "int",
+    "row_group_output_tokens": "int",
+}
+
+
+def _pyarrow():
+    """Import pyarrow and pyarrow.parquet."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Arrow/Parquet output not available. "
+            "Install it with `pip install pyarrow`."
+        ) from e
+    return pa, pq
+
+
+def _to_text(value: Any) -> Optional[str]:
+    """Store strings as-is and other non-null values as JSON."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class ColumnarResultWriter:
+    """Converts result dictionaries to Arrow record batches with a fixed schema."""
+
+    def __init__(
+        self,
+        id_key: str,
+        columns: Mapping[str, str],
+        path: Optional[str] = None,
+        keep: bool = True,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            id_key: Key of the item id; its type is inferred from the first
+                    row group
+            columns: Output column -> type ("string", "float", "int" or
+                     "bool"); "string" columns store other values as JSON
+                     and keys not listed are dropped
+            path: Parquet file to write row groups to
+            keep: Whether to keep the record batches for `table()`
+        """
+        self.pa, self.pq = _pyarrow()
+        self.id_key = id_key
+        self.columns = {**columns, **ROW_GROUP_COLUMNS}
+        self.path = path
+        self.keep = keep
+        self.schema = None
+        self.batches = []
+        self._writer = None
+        self._types = {
+            "string": self.pa.string(),
+            "float": self.pa.float64(),
+            "int": self.pa.int64(),
+            "bool": self.pa.bool_(),
+        }
+
+    def write(self, rows: List[Dict[str, Any]], metrics: Dict[str, Any]) -> None:
+        """
+        Append one row group.
+
+        Args:
+            rows: Result dictionaries of the row group
+            metrics: Values of the row group columns
+        """
+        if not rows:
+            return
+        if self.schema is None:
+            id_type = self.pa.array([row[self.id_key] for row in rows]).type
+            self.schema = self.pa.schema(
+                [(self.id_key, id_type)]
+                + [(name, self._types[kind]) for name, kind in self.columns.items()]
+            )
+        arrays = [
+            self.pa.array(
+                [row[self.id_key] for row in rows], type=self.schema.field(0).type
+            )
+        ]
+        for name, kind in self.columns.items():
+            values = [metrics.get(name, row.get(name)) for row in rows]
+            if kind == "string":
+                values = [_to_text(value) for value in values]
+            arrays.append(self.pa.array(values, type=self._types[kind]))
+        batch = self.pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+        if self.path:
+            if self._writer is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._writer = self.pq.ParquetWriter(self.path, self.schema)
+            self._writer.write_batch(batch)
+        if self.keep:
+            self.batches.append(batch)
+
+    def close(self) -> None:
+        """Finish the Parquet file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def table(self):
+        """Return the kept row groups as one Arrow table."""
+        if self.schema is None:
+            return self.pa.table({self.id_key: []})
+        return self.pa.Table.from_batches(self.batches, schema=self.schema)
+
+
+def batch_to_arrow(
+    items: Iterable[Dict[str, Any]],
+    process: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+    id_key: str,
+    columns: Mapping[str, str],
+    path: Optional[str] = None,
+    row_group_size: int = OUTPUT_ROW_GROUP_SIZE,
+):
+    """
+    Process items in row groups and collect the results as Arrow data.
+
+    Args:
+        items: Input dictionaries, each with `id_key` (any iterable; only one
+               row group is held in memory at a time)
+        process: Batch function returning one dictionary with `id_key` per item
+        id_key: Key of the item id
+        columns: Output columns and their types (see ColumnarResultWriter)
+        path: Parquet file written row group by row group
+        row_group_size: Items per row group
+
+    Returns:
+        Arrow table of all results, or None if they were written to `path`
+    """
+    writer = ColumnarResultWriter(id_key, columns, path=path, keep=path is None)
+    try:
+        for row_group, chunk in enumerate(chunked(items, row_group_size)):
+            usage_before = get_usage_report()
+            started = time.perf_counter()
+            rows = process(chunk)
+            latency = time.perf_counter() - started
+            usage_after = get_usage_report()
+            writer.write(
+                rows,
+                {
+                    "row_group": row_group,
+                    "row_group_latency_s": latency,
+                    "row_group_calls": usage_after["calls"] - usage_before["calls"],
+                    "row_group_input_tokens": usage_after["input_tokens"]
+                    - usage_before["input_tokens"],
+                    "row_group_output_tokens": usage_after["output_tokens"]
+                    - usage_before["output_tokens"],
+                },
+            )
+            logger.info(f"Row group {row_group}: {len(rows)} results in {latency:.1f}s")
+    finally:
+        writer.close()
+    return None if path else writer.table()
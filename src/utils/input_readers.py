@@ -0,0 +1,120 @@
+"""
+Input Readers
+
+Lazy, chunked readers for resume and job description datasets.
+
+The `pipeline_utils` batch helpers accept a pandas Series/DataFrame, the
+path of a CSV, JSONL or Parquet file, or any iterable. Files are read
+`chunk_size` rows at a time (pandas chunked readers for CSV/JSONL, Parquet
+record batches via pyarrow), so together with row-group processing (see
+`columnar_output`) the memory used stays bounded by the chunk size rather
+than the dataset size.
+"""
+
+import os
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+
+from src.config.config import INPUT_CHUNK_SIZE
+
+Source = Union[str, "os.PathLike[str]", pd.Series, pd.DataFrame, Iterable[Any]]
+
+
+def read_records(
+    source: Source,
+    columns: Optional[Sequence[str]] = None,
+    chunk_size: int = INPUT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows of a dataset as dictionaries.
+
+    Args:
+        source: DataFrame, path of a .csv, .jsonl/.ndjson or .parquet file, or
+                an iterable of dictionaries
+        columns: Columns to read (default: all)
+        chunk_size: Rows read from a file at a time
+
+    Yields:
+        One dictionary per row
+    """
+    if isinstance(source, pd.DataFrame):
+        frame = source if columns is None else source[list(columns)]
+        yield from frame.to_dict(orient="records")
+        return
+    if not isinstance(source, (str, os.PathLike)):
+        yield from source
+        return
+
+    path = os.fspath(source)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Parquet input not available. Install it with `pip install pyarrow`."
+            ) from e
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(
+            batch_size=chunk_size, columns=list(columns) if columns else None
+        ):
+            yield from batch.to_pylist()
+        return
+    if extension == ".csv":
+        chunks = pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+    elif extension in (".jsonl", ".ndjson"):
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_size)
+    else:
+        raise ValueError(f"Unsupported input file type: {path}")
+    with chunks as reader:
+        for chunk in reader:
+            if columns is not None:
+                chunk = chunk[list(columns)]
+            yield from chunk.to_dict(orient="records")
+
+
+def read_texts(
+    source: Source,
+    text_column: str,
+    id_column: Optional[str] = None,
+    id_key: str = "resume_id",
+    text_key: str = "resume_text",
+    chunk_size: int = INPUT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the texts of a dataset as pipeline items.
+
+    Args:
+        source: Series of texts indexed by id, iterable of texts, or any
+                source of `read_records`
+        text_column: Column holding the text (ignored for Series and texts)
+        id_column: Column holding the id (default: the row position)
+        id_key: Key of the id in the items
+        text_key: Key of the text in the items
+        chunk_size: Rows read from a file at a time
+
+    Yields:
+        Dictionaries with the id and the text
+    """
+    if isinstance(source, pd.Series):
+        for idx, text in source.items():
+            yield {id_key: idx, text_key: text}
+        return
+    columns = None
+    if isinstance(source, (str, os.PathLike, pd.DataFrame)):
+        columns = [text_column] + ([id_column] if id_column else [])
+    for position, record in enumerate(read_records(source, columns, chunk_size)):
+        if isinstance(record, str):
+            yield {id_key: position, text_key: record}
+            continue
+        idx = record[id_column] if id_column else position
+        yield {id_key: idx, text_key: record[text_column]}
+
+
+def chunked(items: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most `chunk_size` items."""
+    items = iter(items)
+    while chunk := list(islice(items, chunk_size)):
+        yield chunk
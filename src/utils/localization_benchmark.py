@@ -0,0 +1,143 @@
+"""
+Localization Benchmark
+
+Compares the fused single-call localization mode with the three-step
+(anonymize, reformat, localize) path on a sample of resumes: latency, token
+usage, leftover PII and placeholders, and agreement between the two outputs.
+"""
+
+import difflib
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..models import get_usage_report
+from ..pipeline import LocalizationPipeline
+
+# Contact details that should never survive anonymization
+PII_PATTERNS = {
+    "email": re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"),
+    "phone": re.compile(r"(?<!\w)\+?\d[\d\s().-]{7,}\d(?!\w)"),
+    "url": re.compile(r"https?://\S+|www\.\S+|linkedin\.com/\S+", re.IGNORECASE),
+}
+# Placeholders left behind by anonymization; only the candidate name may remain
+PLACEHOLDER_PATTERN = re.compile(r"\[(?!candidate name\])[A-Z][A-Z0-9 /&.-]*\]", re.I)
+
+
+def _quality_metrics(text: str) -> Dict[str, int]:
+    text = text or ""
+    metrics = {
+        f"{name}_leaks": len(pattern.findall(text))
+        for name, pattern in PII_PATTERNS.items()
+    }
+    metrics["placeholders_left"] = len(PLACEHOLDER_PATTERN.findall(text))
+    metrics["output_chars"] = len(text)
+    return metrics
+
+
+def _timed_run(pipeline: LocalizationPipeline, resume_text: str) -> Dict[str, float]:
+    usage_before = get_usage_report()
+    start = time.perf_counter()
+    localized = pipeline.run(resume_text)
+    latency = time.perf_counter() - start
+    usage_after = get_usage_report()
+    return {
+        "localized": localized,
+        "latency_s": latency,
+        "calls": usage_after["calls"] - usage_before["calls"],
+        "input_tokens": usage_after["input_tokens"] - usage_before["input_tokens"],
+        "output_tokens": usage_after["output_tokens"] - usage_before["output_tokens"],
+    }
+
+
+def compare_localization_modes(
+    resumes: pd.Series,
+    country: str = "Singapore",
+    embeddings: Optional[object] = None,
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Run the three-step and fused localization paths on the same resumes.
+
+    Resumes are processed one at a time so latencies and token counts can be
+    attributed to each resume and mode.
+
+    Args:
+        resumes: Pandas Series of resume contents, indexed by resume_id
+        country: Target country for localization
+        embeddings: Optional LangChain embeddings (e.g.
+                    HFEmbeddingsWrapper(...).embeddings) used to report the
+                    cosine similarity between the two localized outputs
+
+    Returns:
+        Tuple of (per-resume DataFrame with one row per resume and mode,
+        summary dictionary with mean latency, token and quality figures and
+        the fused/three-step ratios)
+    """
+    pipelines = {
+        "three_step": LocalizationPipeline(target_country=country),
+        "fused": LocalizationPipeline(target_country=country, fused=True),
+    }
+
+    rows = []
+    for resume_id, resume_text in resumes.items():
+        outputs = {}
+        for mode, pipeline in pipelines.items():
+            try:
+                outputs[mode] = _timed_run(pipeline, resume_text)
+            except RuntimeError as e:
+                outputs[mode] = {"localized": None, "error": str(e)}
+
+        reference = outputs["three_step"].get("localized") or ""
+        candidate = outputs["fused"].get("localized") or ""
+        agreement = difflib.SequenceMatcher(
+            None, reference.split(), candidate.split(), autojunk=False
+        ).ratio()
+        cosine = float("nan")
+        if embeddings is not None and reference and candidate:
+            vectors = np.asarray(embeddings.embed_documents([reference, candidate]))
+            cosine = float(
+                vectors[0]
+                @ vectors[1]
+                / (np.linalg.norm(vectors[0]) * np.linalg.norm(vectors[1]))
+            )
+
+        for mode, output in outputs.items():
+            rows.append(
+                {
+                    "resume_id": resume_id,
+                    "mode": mode,
+                    **{k: v for k, v in output.items() if k != "localized"},
+                    **_quality_metrics(output.get("localized")),
+                    "token_agreement": agreement,
+                    "embedding_cosine": cosine,
+                }
+            )
+
+    results = pd.DataFrame(rows)
+    means = results.groupby("mode").mean(numeric_only=True)
+    summary = {
+        f"{mode}_{column}": float(means.loc[mode, column])
+        for mode in means.index
+        for column in (
+            "latency_s",
+            "input_tokens",
+            "output_tokens",
+            "placeholders_left",
+            "email_leaks",
+            "phone_leaks",
+            "url_leaks",
+        )
+        if column in means.columns
+    }
+    for column in ("latency_s", "input_tokens", "output_tokens"):
+        if column in means.columns and means.loc["three_step", column]:
+            summary[f"fused_to_three_step_{column}"] = float(
+                means.loc["fused", column] / means.loc["three_step", column]
+            )
+    summary["mean_token_agreement"] = float(results["token_agreement"].mean())
+    if results["embedding_cosine"].notna().any():
+        summary["mean_embedding_cosine"] = float(results["embedding_cosine"].mean())
+    return results, summary
@@ -0,0 +1,103 @@
+"""
+Name Label Table
+
+Persistent name -> label counts for the demographic name agents.
+
+`OneShotNameAgent` labels a name with its ethnicity or gender at a high
+temperature. Generated names repeat heavily within a sector, so the labels
+are stored per normalized name (case and whitespace folded) and reused
+instead of asking the LLM again. Every label generated for a name is
+counted; a lookup returns either the most common label or, with sampling,
+a label drawn from the stored counts with a seeded generator, so repeated
+analysis runs reproduce the same labels.
+
+The table is a JSON file of `{mode: {normalized name: {label: count}}}`.
+"""
+
+import json
+import os
+import random
+from typing import Dict, Optional
+
+from src.config.config import NAME_LABEL_SEED, NAME_LABEL_TABLE_PATH
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_name(name: str) -> str:
+    """Fold case and collapse whitespace, so "JOHN  Smith " matches "john smith"."""
+    return " ".join(name.split()).casefold()
+
+
+class NameLabelTable:
+    """Label counts per normalized name, stored as JSON."""
+
+    def __init__(self, path: Optional[str] = NAME_LABEL_TABLE_PATH):
+        """
+        Initialize the table, loading the stored counts if the file exists.
+
+        Args:
+            path: JSON file holding the table; None keeps it in memory only
+        """
+        self.path = path
+        self.labels: Dict[str, Dict[str, Dict[str, int]]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.labels = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring unreadable name label table {path}: {e}")
+
+    def counts(self, mode: str, name: str) -> Dict[str, int]:
+        """Return the stored label counts of a name (empty if unseen)."""
+        return self.labels.get(mode, {}).get(normalize_name(name), {})
+
+    def add(self, mode: str, name: str, label: str) -> None:
+        """Count one generated label for a name."""
+        counts = self.labels.setdefault(mode, {}).setdefault(normalize_name(name), {})
+        counts[label] = counts.get(label, 0) + 1
+
+    def lookup(
+        self,
+        mode: str,
+        name: str,
+        sample: bool = False,
+        key: str = "",
+        seed: int = NAME_LABEL_SEED,
+    ) -> Optional[str]:
+        """
+        Return a stored label for a name.
+
+        Args:
+            mode: "ethnicity" or "gender"
+            name: The name
+            sample: Draw a label in proportion to the stored counts instead of
+                    returning the most common one
+            key: Extra seed material (e.g. the resume_id), so equal names on
+                 different resumes can receive different samples
+            seed: Seed of the sampling generator
+
+        Returns:
+            The label, or None if the name has not been labelled yet
+        """
+        counts = self.counts(mode, name)
+        if not counts:
+            return None
+        if not sample:
+            return max(counts, key=counts.get)
+        labels = sorted(counts)
+        rng = random.Random(f"{seed}:{mode}:{normalize_name(name)}:{key}")
+        return rng.choices(labels, weights=[counts[label] for label in labels])[0]
+
+    def save(self) -> None:
+        """Write the table to its file, replacing it atomically."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.labels, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
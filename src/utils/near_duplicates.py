@@ -0,0 +1,297 @@
+"""
+Near-Duplicate Resumes
+
+Detection of duplicate and near-duplicate resumes so batch pipelines process
+each distinct resume only once.
+
+Resumes are normalized (hyperlinks, non-ASCII characters, case and
+whitespace removed, see `normalize_text`) and split into word shingles.
+Exact duplicates are found by a hash of the normalized text. Near
+duplicates (re-submissions, templated CVs) are found with MinHash
+signatures and LSH banding: resumes sharing a band bucket are candidates,
+and a candidate is a near duplicate if the Jaccard similarity of the
+shingle sets is at least the threshold.
+
+`batch_without_duplicates` wraps a batch function: only the first resume of
+every group of duplicates is processed, exact duplicates receive a copy of
+its result and near duplicates are either processed as well or, with
+`reuse_near`, also receive a copy. Copied and flagged results name the
+resume they duplicate.
+"""
+
+import copy
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.config.config import (
+    RESUME_DEDUP_NUM_PERM,
+    RESUME_DEDUP_SHINGLE_SIZE,
+    RESUME_DEDUP_THRESHOLD,
+)
+from src.utils.logger import get_logger
+from src.utils.text_normalization import normalize_text
+
+logger = get_logger(__name__)
+
+# Fixed seed, so signatures are comparable across runs
+MINHASH_SEED = 1
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    """
+    The resume a new resume duplicates.
+
+    Attributes:
+        key: Key of the earlier resume
+        similarity: Jaccard similarity of the shingle sets (1.0 if exact)
+        exact: Whether the normalized texts are identical
+    """
+
+    key: Hashable
+    similarity: float
+    exact: bool
+
+
+def shingles(text: str, size: int = RESUME_DEDUP_SHINGLE_SIZE) -> Set[str]:
+    """
+    Split a normalized text into overlapping word n-grams.
+
+    Args:
+        text: Normalized text
+        size: Words per shingle
+
+    Returns:
+        Set of shingles (the whole text for texts shorter than `size` words)
+    """
+    words = text.split()
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _lsh_shape(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Choose (bands, rows per band) for a signature length.
+
+    The LSH threshold (1/bands)^(1/rows) is kept about 0.1 below the
+    similarity threshold, so near duplicates are almost always candidates;
+    false candidates are removed by the exact Jaccard check.
+    """
+    shapes = [
+        (num_perm // rows, rows)
+        for rows in range(1, num_perm + 1)
+        if num_perm % rows == 0
+    ]
+    below = [
+        (bands, rows)
+        for bands, rows in shapes
+        if (1 / bands) ** (1 / rows) <= threshold - 0.1
+    ]
+    return max(below, key=lambda shape: shape[1]) if below else (num_perm, 1)
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index of resume texts."""
+
+    def __init__(
+        self,
+        threshold: float = RESUME_DEDUP_THRESHOLD,
+        num_perm: int = RESUME_DEDUP_NUM_PERM,
+        shingle_size: int = RESUME_DEDUP_SHINGLE_SIZE,
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            threshold: Minimum Jaccard similarity of near duplicates
+            num_perm: Number of MinHash functions per signature
+            shingle_size: Words per shingle
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _lsh_shape(num_perm, threshold)
+        rng = np.random.default_rng(MINHASH_SEED)
+        # Multiply-shift hashing: odd multipliers, arithmetic modulo 2^64
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | 1
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self._exact: Dict[str, Hashable] = {}
+        self._shingles: Dict[Hashable, Set[str]] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize a resume for comparison."""
+        return normalize_text(text).casefold()
+
+    def signature(self, shingle_set: Set[str]) -> np.ndarray:
+        """Compute the MinHash signature of a shingle set."""
+        hashes = np.fromiter(
+            (
+                int.from_bytes(
+                    hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(),
+                    "little",
+                )
+                for shingle in shingle_set
+            ),
+            dtype=np.uint64,
+            count=len(shingle_set),
+        )
+        with np.errstate(over="ignore"):
+            permuted = hashes[None, :] * self._a[:, None] + self._b[:, None]
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows : (band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def query(self, text: str) -> Optional[DuplicateMatch]:
+        """
+        Find an indexed resume that a text duplicates.
+
+        Args:
+            text: The resume text
+
+        Returns:
+            The exact duplicate if there is one, else the most similar near
+            duplicate, or None
+        """
+        match, _ = self._query(self.normalize(text))
+        return match
+
+    def _query(self, normalized: str):
+        """Look up a normalized text; also return its digest and shingles."""
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        if digest in self._exact:
+            return DuplicateMatch(self._exact[digest], 1.0, True), (digest, None)
+        shingle_set = shingles(normalized, self.shingle_size)
+        signature = self.signature(shingle_set)
+        candidates = {
+            key
+            for band_key in self._band_keys(signature)
+            for key in self._buckets.get(band_key, [])
+        }
+        best = None
+        for key in candidates:
+            other = self._shingles[key]
+            similarity = len(shingle_set & other) / len(shingle_set | other)
+            if similarity >= self.threshold and (
+                best is None or similarity > best.similarity
+            ):
+                best = DuplicateMatch(key, similarity, False)
+        return best, (digest, (shingle_set, signature))
+
+    def add(self, key: Hashable, text: str) -> Optional[DuplicateMatch]:
+        """
+        Look up a resume and index it if it is not an exact duplicate.
+
+        Args:
+            key: Key of the resume (e.g. its resume_id)
+            text: The resume text
+
+        Returns:
+            The match found before indexing, or None
+        """
+        match, (digest, computed) = self._query(self.normalize(text))
+        if match is not None and match.exact:
+            return match
+        shingle_set, signature = computed
+        self._exact[digest] = key
+        self._shingles[key] = shingle_set
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+        return match
+
+
+def _reusable_fields(output: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of an output that are copied to its duplicates."""
+    return {
+        key: value
+        for key, value in output.items()
+        if key != "resume_id" and not key.startswith("duplicate_")
+    }
+
+
+def batch_without_duplicates(
+    resumes: List[Dict[str, Any]],
+    process: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+    reuse_near: bool = False,
+    index: Optional[NearDuplicateIndex] = None,
+    outputs: Optional[Dict[Hashable, Dict[str, Any]]] = None,
+    text_key: str = "resume_text",
+) -> List[Dict[str, Any]]:
+    """
+    Run a batch function on the distinct resumes of a batch only.
+
+    Args:
+        resumes: List of dictionaries containing resume_id and the text
+        process: Batch function returning one dictionary with resume_id per
+                 processed resume
+        reuse_near: Whether near duplicates also reuse the result of the
+                    resume they duplicate instead of being processed
+        index: Index to use (e.g. one shared across batches); default: a new one
+        outputs: Reusable fields of the outputs of the indexed resumes by
+                 resume_id, updated with the outputs of this batch; share it
+                 together with `index` so duplicates of resumes from earlier
+                 batches are reused
+        text_key: Key of the resume text
+
+    Returns:
+        The outputs of `process`, plus a copy of the matched output for every
+        reused duplicate (or an "error" if `process` returned no output for
+        the resume it duplicates). Outputs of duplicates (reused or
+        processed) carry "duplicate_of" (resume_id), "duplicate_similarity"
+        and "duplicate_reused".
+    """
+    index = index if index is not None else NearDuplicateIndex()
+    outputs = outputs if outputs is not None else {}
+    to_process, reused, matches = [], [], {}
+    for resume in resumes:
+        match = index.query(resume[text_key])
+        if match is not None and (match.exact or reuse_near):
+            reused.append((resume["resume_id"], match))
+            continue
+        index.add(resume["resume_id"], resume[text_key])
+        if match is not None:
+            matches[resume["resume_id"]] = match
+        to_process.append(resume)
+    if reused or matches:
+        logger.info(
+            f"Reusing results for {len(reused)} of {len(resumes)} duplicate resumes; "
+            f"{len(matches)} near duplicates are processed."
+        )
+
+    results = process(to_process) if to_process else []
+    for output in results:
+        match = matches.get(output["resume_id"])
+        if match is not None:
+            output.update(
+                duplicate_of=match.key,
+                duplicate_similarity=match.similarity,
+                duplicate_reused=False,
+            )
+        outputs[output["resume_id"]] = _reusable_fields(output)
+    for resume_id, match in reused:
+        source = outputs.get(match.key)
+        if source is None:
+            # The resume it duplicates was dropped, e.g. by a failed batch
+            output = {"resume_id": resume_id, "error": "No output for resume"}
+        else:
+            output = copy.deepcopy(source)
+        output.update(
+            resume_id=resume_id,
+            duplicate_of=match.key,
+            duplicate_similarity=match.similarity,
+            duplicate_reused=True,
+        )
+        results.append(output)
+    return results
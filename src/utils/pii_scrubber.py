@@ -0,0 +1,301 @@
+"""
+PII Scrubber
+
+Deterministic redaction of structured PII (emails, phone numbers, NRIC/FIN and
+other ID numbers, URLs, addresses, labelled name/date-of-birth fields) before
+resumes reach the anonymization LLM. Patterns are compiled once and applied in
+two passes; the replacements use the same placeholders as the anonymizer
+prompt, and every call reports how many values of each type were replaced.
+
+`find_residual_identifiers` flags possible free-text identifiers the regexes
+cannot redact (person names, companies, institutions). It errs towards
+flagging, apart from common resume vocabulary, so callers only skip the LLM
+for resumes where nothing fired.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Tuple, Union
+
+import pandas as pd
+
+# Labelled fields whose value is replaced, keeping the label
+_FIELD_PLACEHOLDERS = {
+    "name": "[CANDIDATE NAME]",
+    "address": "[ADDRESS]",
+    "dob": "[DOB]",
+    "id_number": "[ID NUMBER]",
+}
+FIELD_PATTERN = re.compile(
+    r"^(?P<label>[ \t]*(?:[-*\u2022][ \t]+)?\**(?:"
+    r"(?P<name>(?:full[ \t]+)?name)"
+    r"|(?P<address>(?:home[ \t]+|mailing[ \t]+)?address)"
+    r"|(?P<dob>date[ \t]+of[ \t]+birth|d\.?o\.?b\.?|birth[ \t]*date|born)"
+    r"|(?P<id_number>(?P<nric_label>nric|fin)|ic[ \t]+(?:no\.?|number)"
+    r"|passport(?:[ \t]+no\.?)?|ssn|social[ \t]+security[ \t]+number)"
+    r")\**[ \t]*[:\-]\**[ \t]*)(?P<value>\S.*?)[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Token patterns, tried left to right at each position
+_TOKEN_PLACEHOLDERS = {
+    "linkedin": "[LINKEDIN]",
+    "portfolio": "[PORTFOLIO]",
+    "email": "[EMAIL]",
+    "url": "",
+    "nric": "[ID NUMBER]",
+    "ssn": "[ID NUMBER]",
+    "phone": "[PHONE]",
+    "address": "[ADDRESS]",
+}
+_STREET_TYPES = (
+    r"Road|Rd|Street|St|Avenue|Ave|Drive|Dr|Lane|Ln|Boulevard|Blvd|Crescent|"
+    r"Cres|Close|Way|Walk|Place|Terrace|Court|Ct|Highway|Hwy"
+)
+# Phone numbers need a country code, a label or the exact Singapore shape;
+# a label is kept in front of the placeholder
+_PHONE_LABEL = r"\b(?i:tel|telephone|phone|mobile|mob|hp|handphone|cell|contact)\b"
+# Addresses need context: a block number, a unit number, a postal code, or a
+# street line standing on its own (line start, ending at a comma or line end)
+_POSTAL_CONTEXT = (
+    r"[ \t]*,?[ \t]*(?:#\d{1,3}-\d{1,5}|Singapore[ \t]*\(?\d{6}|\(?\d{6}\)?\b)"
+)
+_STREET = (
+    r"\d{1,5}[A-Z]?[ \t]+(?:[A-Z][\w'-]*[ \t]+){1,4}(?:" + _STREET_TYPES + r")\b\.?"
+)
+TOKEN_PATTERN = re.compile(
+    r"(?P<linkedin>(?:https?://)?(?:[\w-]+\.)?linkedin\.com/\S*)"
+    r"|(?P<portfolio>(?:https?://)?(?:www\.)?(?:github\.com|gitlab\.com|behance\.net"
+    r"|dribbble\.com|medium\.com/@)\S*)"
+    r"|(?P<email>\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b)"
+    r"|(?P<url>\bhttps?://\S+|\bwww\.\S+)"
+    r"|(?P<nric>\b[STFGM]\d{7}[A-Z]\b)"
+    r"|(?P<ssn>\b\d{3}-\d{2}-\d{4}\b)"
+    r"|(?P<phone>"
+    r"(?<![\w+])\+\d{1,3}[ .-]?(?:\(\d{1,4}\)[ .-]?)?\d{2,4}(?:[ .-]?\d{2,4}){1,3}\b"
+    r"|(?P<phone_label>" + _PHONE_LABEL + r"\.?(?:[ \t]*(?i:no)\.?)?[ \t]*[:.-]?[ \t]*)"
+    r"\(?\+?\d{2,4}\)?(?:[ .-]?\d{2,4}){1,3}\b"
+    r"|(?<![\w+$.,/-])[689]\d{3}-?\d{4}(?![\w/-]|[.,]\d|[ \t]\d)"
+    r")"
+    r"|(?P<address>"
+    r"\b(?:Blk|Block)[ \t]+\d{1,4}[A-Z]?(?:[ \t]+[A-Z][\w'-]*){0,4}"
+    r"(?:[ \t]+(?:" + _STREET_TYPES + r")\b\.?)?"
+    r"|(?<![^\n])[ \t]*" + _STREET + r"(?=[ \t]*(?:,|\n|$)|" + _POSTAL_CONTEXT + r")"
+    r"|\b" + _STREET + r"(?=" + _POSTAL_CONTEXT + r")"
+    r"|#\d{1,3}-\d{1,5}\b"
+    r"|\bSingapore[ \t]*\(?\d{6}\)?"
+    r"|\b[A-Z]{2}[ \t]+\d{5}(?:-\d{4})?\b"
+    r")"
+)
+
+# Shapes a field value must have to be redacted, so e.g. "Fin: managed
+# budgets" or "Address: the needs of stakeholders" are kept
+_NRIC_VALUE = re.compile(r"\b[STFGM]\d{7}[A-Z]\b", re.IGNORECASE)
+_FIELD_VALUES = {
+    "address": re.compile(
+        r"\b(?:Blk|Block)[ \t]+\d|" + _STREET + r"|#\d{1,3}-\d{1,5}\b"
+        r"|\b\d{6}\b|\b[A-Z]{2}[ \t]+\d{5}(?:-\d{4})?\b"
+    ),
+    "dob": re.compile(
+        r"\d|\b(?i:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b"
+    ),
+    "id_number": re.compile(r"\b[A-Z]{0,3}\d[\dA-Z-]{4,}\b", re.IGNORECASE),
+}
+
+# Free-text identifiers that only the LLM can anonymize. Any capitalized
+# phrase could be a name, employer or school, so every match counts unless
+# all of its words are common resume vocabulary (see `RESUME_VOCABULARY`).
+RESIDUAL_PATTERNS = {
+    "organization": re.compile(
+        r"\b(?!Company\b)[A-Z][\w&.'-]*(?:[ \t]+[A-Z][\w&.'-]*){0,4}[ \t]+"
+        r"(?:Inc|Ltd|LLC|LLP|Corp|Corporation|Pte|GmbH|PLC|Limited|Holdings|"
+        r"Technologies|Bank)\b\.?"
+    ),
+    "institution": re.compile(
+        r"\b(?:University|College|Institute|Polytechnic|Academy)[ \t]+of[ \t]+[A-Z]\w+"
+        r"|\b(?!University\b)[A-Z]\w+(?:[ \t]+[A-Z]\w+){0,4}[ \t]+"
+        r"(?:University|College|Institute|Polytechnic|Academy)\b"
+    ),
+    "handle": re.compile(r"(?<![\w.])@[A-Za-z_]\w{2,}"),
+    # "at Shopee", "from NTU", "joined Grab": employers, schools, places
+    "affiliation": re.compile(
+        r"\b(?:at|from|with|for|in|joined|by)[ \t]+(?:the[ \t]+)?[A-Z][\w&.'-]*"
+    ),
+    # Capitalized words inside a sentence ("reported to Tan Wei")
+    "capitalized": re.compile(r"(?<=[a-z0-9,;)][ \t])[A-Z][\w.'-]*"),
+    # Upper-case abbreviations ("NTU", "DBS")
+    "acronym": re.compile(r"\b[A-Z][A-Z0-9&]{1,}[a-z]?\b"),
+    # Unlabelled local phone numbers the scrubber leaves alone ("6512 3456")
+    "number": re.compile(
+        r"(?<![\w.,/-])[689]\d{3}[ \t.]\d{4}(?![\w/-]|[.,]\d)"
+        r"|\(\d{2,4}\)[ \t]?\d{3,4}[ \t.-]?\d{4}\b"
+    ),
+}
+# Header lines (all caps or title case, two to five words) anywhere in the
+# resume, or between "|" separators: names, employers, schools, and section
+# titles or job titles alike
+NAME_LINE_PATTERN = re.compile(
+    r"^[ \t]*(?:[A-Z][A-Za-z'-]*\.?)(?:[ \t]+[A-Z][A-Za-z'-]*\.?){1,4}[ \t]*$",
+    re.MULTILINE,
+)
+# Section headings, job titles, skills, degrees and dates, which do not
+# identify anyone; matches made up of these words only are not counted
+RESUME_VOCABULARY = frozenset("""
+    a about accomplishments achievements activities additional affiliations an
+    and applied awards background certificates certifications competencies
+    contact core career details education employment evaluation executive
+    experience highlights history honors honours information interests
+    languages licenses me objective of personal position profile projects
+    professional publications qualifications references self skills
+    specialties summary technical the to training volunteer work with in for
+    on at by
+
+    administrator analyst analytics architect assistant associate backend
+    business chief cloud consultant coordinator customer data designer
+    developer development devops director end engineer engineering finance
+    financial front frontend full graduate head human intern junior lead
+    learning machine manager marketing methodologies methodology mobile network officer operations
+    platform principal product program programme project qa quality
+    research researcher resources sales science scientist security senior
+    service software specialist stack staff support system systems team
+    technician test trainee web
+
+    agile airflow angular api apis aws azure bi c c# c++ cd ci css django
+    docker elasticsearch etl excel express figma flask gcp git golang go
+    graphql hadoop html java javascript jenkins jira json jupyter kafka keras
+    kotlin kubernetes linux matplotlib microservices ml ai mongodb mysql nlp
+    node node.js nosql numpy oop pandas php postgresql power python pytorch r
+    react redis rest restful ruby rust scala scikit-learn scrum seaborn spark
+    spring sql swift tableau tensorflow terraform typescript ui ux vue xml
+    s3 ec2 llm llms kpi cv gpa it hr ceo cto cfo coo pm pdf
+
+    b.sc b.s. b.eng ba bachelor bachelors bs bsc beng degree diploma doctorate
+    m.sc m.s. ma master masters mba ms msc phd class first second upper lower
+    computer information technology electrical mechanical mathematics
+    statistics physics economics
+
+    january february march april june july august september october november
+    december jan feb mar apr may jun jul aug sep sept oct nov dec present
+    current
+    """.split())
+# Labelled city/country fields, a coarse location the anonymizer only
+# standardizes; their values are not checked
+LOCATION_FIELD_PATTERN = re.compile(
+    r"^(?P<label>[ \t]*(?:[-*][ \t]*)?(?:location|city|country)[ \t]*:).*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Placeholders inserted by `scrub_pii` and the anonymizer
+PLACEHOLDER_PATTERN = re.compile(r"\[[A-Z ]+\]")
+
+
+def scrub_pii(text: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Redact structured PII from a resume.
+
+    Args:
+        text: The resume text
+
+    Returns:
+        Tuple of (scrubbed text, {pii_type: number of replacements})
+    """
+    counts = Counter()
+
+    def replace_field(match: re.Match) -> str:
+        field = next(
+            name for name in _FIELD_PLACEHOLDERS if match.group(name) is not None
+        )
+        shape = _NRIC_VALUE if match.group("nric_label") else _FIELD_VALUES.get(field)
+        if shape is not None and not shape.search(match.group("value")):
+            return match.group(0)
+        counts[field] += 1
+        return match.group("label") + _FIELD_PLACEHOLDERS[field]
+
+    def replace_token(match: re.Match) -> str:
+        counts[match.lastgroup] += 1
+        if match.lastgroup == "phone" and match.group("phone_label"):
+            return match.group("phone_label") + _TOKEN_PLACEHOLDERS["phone"]
+        return _TOKEN_PLACEHOLDERS[match.lastgroup]
+
+    text = FIELD_PATTERN.sub(replace_field, text)
+    text = TOKEN_PATTERN.sub(replace_token, text)
+    return text, dict(counts)
+
+
+def scrub_pii_batch(
+    texts: Union[pd.Series, List[str]],
+) -> Tuple[Union[pd.Series, List[str]], Union[pd.DataFrame, List[Dict[str, int]]]]:
+    """
+    Redact structured PII from many resumes.
+
+    Args:
+        texts: Pandas Series or list of resume texts
+
+    Returns:
+        For a Series: (Series of scrubbed texts, DataFrame of replacement
+        counts per PII type), both with the input index. For a list:
+        (list of scrubbed texts, list of replacement count dictionaries).
+    """
+    values = texts.tolist() if isinstance(texts, pd.Series) else list(texts)
+    scrubbed, reports = [], []
+    for text in values:
+        clean, report = scrub_pii(text)
+        scrubbed.append(clean)
+        reports.append(report)
+    if isinstance(texts, pd.Series):
+        return (
+            pd.Series(scrubbed, index=texts.index, name=texts.name),
+            pd.DataFrame(reports, index=texts.index).fillna(0).astype(int),
+        )
+    return scrubbed, reports
+
+
+def _is_common(phrase: str) -> bool:
+    """Whether every word of a phrase is common resume vocabulary."""
+    for word in re.findall(r"[A-Za-z][\w.+#'-]*", phrase):
+        word = word.casefold().rstrip(".'-").removesuffix("'s")
+        if word not in RESUME_VOCABULARY and word.removesuffix("s") not in (
+            RESUME_VOCABULARY
+        ):
+            return False
+    return True
+
+
+def find_residual_identifiers(text: str) -> Dict[str, int]:
+    """
+    Count free-text identifiers left after `scrub_pii`.
+
+    Flags header lines in all caps or title case (names, employers, schools),
+    organisation names with a legal suffix, educational institutions,
+    "at/from <Capitalized>" affiliations, capitalized words inside sentences,
+    upper-case abbreviations, social media handles and unlabelled local
+    phone numbers. Labelled city/country fields are not checked, and matches
+    made up of common resume words (section headings, job titles, skills,
+    degrees, months) are ignored, so a resume whose only identifiers were
+    structured fields comes back clean. Any other
+    capitalized phrase counts, and callers should only skip the LLM when the
+    result is empty. An empty result means none of these heuristics fired,
+    not that the text is proven free of identifiers (e.g. an all-lowercase
+    name is not detected).
+
+    Args:
+        text: The scrubbed resume text, with its line breaks
+
+    Returns:
+        Dictionary of {identifier_type: count}, empty if none were found
+    """
+    # Drop placeholders, markdown emphasis and location values; "|"
+    # separates header fields
+    text = PLACEHOLDER_PATTERN.sub("", text)
+    text = re.sub(r"[*_#`]+", "", text)
+    text = LOCATION_FIELD_PATTERN.sub(r"\g<label>", text)
+    found = {
+        name: sum(
+            name == "number" or not _is_common(match) for match in pattern.findall(text)
+        )
+        for name, pattern in RESIDUAL_PATTERNS.items()
+    }
+    found["name"] = sum(
+        not _is_common(match)
+        for match in NAME_LINE_PATTERN.findall(re.sub(r"[ \t]*\|[ \t]*", "\n", text))
+    )
+    return {name: count for name, count in found.items() if count}
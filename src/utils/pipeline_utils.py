@@ -7,7 +7,19 @@ using the pipeline components.
 # NOTE: Batch processing functions have not been tested
 """
 
-from typing import Dict, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Union,
+)
 from ..pipeline import (
     LocalizationPipeline,
     HiringPipeline,
@@ -15,119 +27,294 @@ from ..pipeline import (
     RaceAnalysisPipeline,
     JobAnalysisPipeline,
 )
-import pandas as pd
+from ..config.config import (
+    JOB_CRITERIA_GROUP_BY,
+    OUTPUT_ROW_GROUP_SIZE,
+    PRERANK_MIN_SCORE,
+    PRERANK_TOP_K,
+    RESUME_DEDUP,
+    RESUME_DEDUP_REUSE_NEAR,
+)
+from .columnar_output import batch_to_arrow
+from .input_readers import Source, chunked, read_records, read_texts
+from .name_label_table import NameLabelTable
+from .candidate_ranking import CandidateRanker
+from .near_duplicates import NearDuplicateIndex, batch_without_duplicates
+from .stage_cache import StageCache
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Results of the batch helpers: a dictionary of results by id ("dict"), a
+# generator of results ("stream"), an Arrow table ("arrow"), or None when
+# written to a Parquet file
+BatchResults = Union[
+    Dict[Any, Dict[str, Any]], Iterator[Dict[str, Any]], "pa.Table", None
+]
+
+# Arrow column types of the batch helpers' results
+DUPLICATE_COLUMNS = {
+    "duplicate_of": "string",
+    "duplicate_similarity": "float",
+    "duplicate_reused": "bool",
+}
+LOCALIZATION_COLUMNS = {
+    "anonymized": "string",
+    "reformatted": "string",
+    "localized": "string",
+    "error": "string",
+    **DUPLICATE_COLUMNS,
+}
+HIRING_COLUMNS = {
+    "extracted_details": "string",
+    "evaluation_scores_json": "string",
+    "final_summary": "string",
+    "error": "string",
+    "prerank_score": "float",
+    "prerank_position": "int",
+    "forwarded": "bool",
+    **DUPLICATE_COLUMNS,
+}
+JOB_COLUMNS = {
+    "company_criteria": "string",
+    "previous_hires": "string",
+    "error": "string",
+}
+
+
+def _collect(
+    items: Iterable[Dict[str, Any]],
+    process: Callable[[List[Dict[str, str]]], List[Dict[str, str]]],
+    id_key: str,
+    columns: Dict[str, str],
+    output_format: str,
+    output_path: Optional[str],
+    row_group_size: int,
+) -> BatchResults:
+    """
+    Run a batch function and return its results in the requested format.
+
+    Returns:
+        Dictionary of results by id for the "dict" format; a generator of
+        results processed chunk by chunk for "stream"; otherwise the results
+        are processed in row groups and returned as an Arrow table, or
+        written to `output_path` as Parquet (returning None)
+    """
+    if output_format == "stream":
+        return _stream(items, process, row_group_size)
+    if output_format == "dict" and output_path is None:
+        return {row[id_key]: row for row in process(list(items))}
+    if output_format not in ("dict", "arrow"):
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return batch_to_arrow(
+        items,
+        process,
+        id_key,
+        columns,
+        path=output_path,
+        row_group_size=row_group_size,
+    )
+
+
+def _stream(
+    items: Iterable[Dict[str, Any]],
+    process: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+    chunk_size: int,
+) -> Iterator[Dict[str, Any]]:
+    """Run a batch function chunk by chunk, yielding the results as they finish."""
+    for chunk in chunked(items, chunk_size):
+        yield from process(chunk)
+
+
+def _deduplicated(
+    process: Callable[[List[Dict[str, str]]], List[Dict[str, str]]],
+    dedupe: bool,
+    reuse_near_duplicates: bool,
+) -> Callable[[List[Dict[str, str]]], List[Dict[str, str]]]:
+    """
+    Wrap a batch function so duplicate resumes are processed once if requested.
+
+    The index and the outputs are shared by every call of the returned
+    function, so duplicates in different chunks of a run are reused as well.
+    Both keep one entry per distinct resume for the whole run, so with
+    deduplication memory grows with the number of distinct resumes.
+    """
+    if not dedupe:
+        return process
+    index, outputs = NearDuplicateIndex(), {}
+    return lambda batch: batch_without_duplicates(
+        batch,
+        process,
+        reuse_near=reuse_near_duplicates,
+        index=index,
+        outputs=outputs,
+    )
+
+
+def _preranked(
+    resumes: Iterable[Dict[str, str]],
+    job_description: str,
+    process: Callable[[List[Dict[str, str]]], List[Dict[str, str]]],
+    top_k: Optional[int],
+    min_score: Optional[float],
+):
+    """
+    Rank all resumes against the job description before any chunking.
+
+    Returns:
+        Tuple of (the resumes, forwarded ones first, and a batch function
+        that only processes the forwarded resumes and adds the ranking to
+        every result)
+    """
+    resumes = list(resumes)
+    selected, ranking = CandidateRanker().rank(
+        resumes, job_description, top_k=top_k, min_score=min_score
+    )
+
+    def process_ranked(batch: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        forwarded = [
+            resume for resume in batch if ranking[resume["resume_id"]]["forwarded"]
+        ]
+        outputs = process(forwarded) if forwarded else []
+        outputs += [
+            {
+                "resume_id": resume["resume_id"],
+                "extracted_details": None,
+                "evaluation_scores_json": None,
+                "final_summary": None,
+            }
+            for resume in batch
+            if not ranking[resume["resume_id"]]["forwarded"]
+        ]
+        for output in outputs:
+            output.update(ranking[output["resume_id"]])
+        return outputs
+
+    rest = [
+        resume for resume in resumes if not ranking[resume["resume_id"]]["forwarded"]
+    ]
+    return selected + rest, process_ranked
 
 
 def process_resume_pipeline(
     resume_text: str,
     country: str = "Singapore",
+    fused: bool = False,
+    return_intermediates: bool = True,
+    use_cache: bool = False,
 ) -> Dict[str, str]:
     """
     Run the complete resume processing pipeline (anonymization + localization).
 
     Args:
         resume_text: The original resume content
-        **pipeline_kwargs: Additional arguments to pass to both steps
-                           (e.g., education_level, experience_level, etc.)
+        country: Target country for localization
+        fused: Whether to run all three steps as a single LLM call
+        return_intermediates: Whether to return the anonymized and reformatted
+                              resumes as well. With fused=True, leaving this
+                              off avoids generating them at all.
+        use_cache: Whether to reuse the stored output of steps whose inputs
+                   (resume, prompts, model, country) are unchanged
 
     Returns:
         Dictionary containing:
-        - 'anonymized': Anonymized resume content
-        - 'reformatted': Reformatted resume content
+        - 'anonymized': Anonymized resume content (if return_intermediates)
+        - 'reformatted': Reformatted resume content (if return_intermediates)
         - 'localized': Localized resume content
     """
     # Initialize the pipeline
-    pipeline = LocalizationPipeline(target_country=country)
-    # Step 1: Anonymize the resume
-    anonymized_text = pipeline.run(
-        resume_text, anonymize=True, reformat=False, localize=False
-    )
-    # Step 2: Reformat the anonymized resume
-    reformatted_text = pipeline.run(
-        anonymized_text, anonymize=False, reformat=True, localize=False
-    )
-    # Step 3: Localize the reformatted resume
-    localized_text = pipeline.run(
-        reformatted_text, anonymize=False, reformat=False, localize=True
+    pipeline = LocalizationPipeline(
+        target_country=country,
+        fused=fused,
+        stage_cache=StageCache() if use_cache else None,
     )
-
-    return {
-        "anonymized": anonymized_text,
-        "reformatted": reformatted_text,
-        "localized": localized_text,
-    }
+    if not return_intermediates:
+        return {"localized": pipeline.run(resume_text)}
+    return pipeline.run(resume_text, return_intermediates=True)
 
 
 def batch_process_resumes(
-    resumes: pd.Series,
+    resumes: Source,
     country: str = "Singapore",
-) -> Dict[str, Dict[str, str]]:
+    fused: bool = False,
+    return_intermediates: bool = True,
+    dedupe: bool = RESUME_DEDUP,
+    reuse_near_duplicates: bool = RESUME_DEDUP_REUSE_NEAR,
+    text_column: str = "resume",
+    id_column: Optional[str] = None,
+    output_format: Literal["dict", "stream", "arrow"] = "dict",
+    output_path: Optional[str] = None,
+    row_group_size: int = OUTPUT_ROW_GROUP_SIZE,
+) -> BatchResults:
     """
     Process multiple resumes in batch through the complete pipeline.
 
     Args:
-        resumes: Pandas Series of resume contents, indexed by resume_id
+        resumes: Pandas Series of resume contents, indexed by resume_id, the
+                 path of a CSV, JSONL or Parquet file, or an iterable of
+                 texts or records (read lazily, see read_texts)
+        country: Target country for localization
+        fused: Whether to run all three steps as a single LLM call per resume
+        return_intermediates: Whether to return the anonymized and reformatted
+                              resumes as well
+        dedupe: Whether duplicate resumes reuse the results of the first copy
+                (near duplicates are flagged with "duplicate_of")
+        reuse_near_duplicates: Whether near duplicates reuse them as well
+        text_column: Column holding the resume text when reading a file,
+                     DataFrame or records
+        id_column: Column holding the resume_id (default: the row position)
+        output_format: "dict" for a dictionary of results, "stream" for a
+                       generator of results processed chunk by chunk, or
+                       "arrow" for an Arrow table with one column per output
+                       plus row group token and latency columns
+        output_path: Parquet file to write the results to, one row group at
+                     a time (returns None)
+        row_group_size: Items per row group (or chunk) for stream, Arrow and
+                        Parquet output
 
     Returns:
         Dictionary containing the processed results for each resume
+        ("dict"), a generator of results ("stream"), an Arrow table
+        ("arrow"), or None if written to output_path
     """
-    pipeline = LocalizationPipeline(target_country=country)
-    # Convert pandas Series to list of dicts for batch processing
-    resume_list = [
-        {"resume_id": idx, "resume_text": text} for idx, text in resumes.items()
-    ]
-    # Step 1: Anonymize the resumes
-    anonymized = pipeline.batch(
-        resume_list, anonymize=True, reformat=False, localize=False
-    )
-    # Step 2: Reformat the anonymized resumes
-    reformatted = pipeline.batch(
-        [
-            {"resume_id": r["resume_id"], "resume_text": r["anonymized_text"]}
-            for r in anonymized
-        ],
-        anonymize=False,
-        reformat=True,
-        localize=False,
-    )
-    # Step 3: Localize the reformatted resumes
-    localized = pipeline.batch(
-        [
-            {"resume_id": r["resume_id"], "resume_text": r["reformatted_text"]}
-            for r in reformatted
-        ],
-        anonymize=False,
-        reformat=False,
-        localize=True,
+    pipeline = LocalizationPipeline(target_country=country, fused=fused)
+    resume_list = read_texts(resumes, text_column, id_column)
+    localize = _deduplicated(
+        lambda batch: pipeline.batch(batch, return_intermediates=return_intermediates),
+        dedupe,
+        reuse_near_duplicates,
     )
 
-    # Combine results by resume_id
-    results = {}
-    for r in resume_list:
-        resume_id = r["resume_id"]
-        results[resume_id] = {
-            "anonymized": next(
-                (
-                    x["anonymized_text"]
-                    for x in anonymized
-                    if x["resume_id"] == resume_id
-                ),
-                None,
-            ),
-            "reformatted": next(
-                (
-                    x["reformatted_text"]
-                    for x in reformatted
-                    if x["resume_id"] == resume_id
-                ),
-                None,
-            ),
-            "localized": next(
-                (x["localized_text"] for x in localized if x["resume_id"] == resume_id),
-                None,
-            ),
-        }
-    return results
+    def process(batch: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        outputs = localize(batch)
+        # Rename the outputs
+        results = []
+        for output in outputs:
+            result = {
+                "resume_id": output["resume_id"],
+                "localized": output.get("localized_text"),
+            }
+            if return_intermediates:
+                result["anonymized"] = output.get("anonymized_text")
+                result["reformatted"] = output.get("reformatted_text")
+            if "error" in output:
+                result["error"] = output["error"]
+            if "duplicate_of" in output:
+                result["duplicate_of"] = output["duplicate_of"]
+                result["duplicate_similarity"] = output["duplicate_similarity"]
+                result["duplicate_reused"] = output["duplicate_reused"]
+            results.append(result)
+        return results
+
+    return _collect(
+        resume_list,
+        process,
+        "resume_id",
+        LOCALIZATION_COLUMNS,
+        output_format,
+        output_path,
+        row_group_size,
+    )
 
 
 def hiring_pipeline(
@@ -135,6 +322,7 @@ def hiring_pipeline(
     job_description: str,
     embedding_type: str = "openai",
     embedding_model_name: Optional[str] = None,
+    use_cache: bool = False,
 ) -> Dict[str, str]:
     """
     Run the complete hiring pipeline (extraction + evaluation + summarization).
@@ -145,6 +333,8 @@ def hiring_pipeline(
         embedding_model_name: Name of the model to use for embeddings (only for HuggingFace
                               or custom OpenAI models)
         job_description: The job description to evaluate against
+        use_cache: Whether to reuse the stored output of stages whose inputs
+                   (texts, prompts, model, RAG index version) are unchanged
     Returns:
         Dictionary containing:
         - 'extracted_info': Extracted information from the resume
@@ -153,13 +343,96 @@ def hiring_pipeline(
     """
     # Initialize the pipeline
     pipeline = HiringPipeline(
-        embedding_type=embedding_type, embedding_model_name=embedding_model_name
+        embedding_type=embedding_type,
+        embedding_model_name=embedding_model_name,
+        stage_cache=StageCache() if use_cache else None,
     )
     return pipeline.run(resume_text, job_description)
 
 
+def batch_hiring_pipeline(
+    resumes: Source,
+    job_description: str,
+    embedding_type: str = "openai",
+    embedding_model_name: Optional[str] = None,
+    top_k: Optional[int] = PRERANK_TOP_K,
+    min_score: Optional[float] = PRERANK_MIN_SCORE,
+    dedupe: bool = RESUME_DEDUP,
+    reuse_near_duplicates: bool = RESUME_DEDUP_REUSE_NEAR,
+    text_column: str = "resume",
+    id_column: Optional[str] = None,
+    output_format: Literal["dict", "stream", "arrow"] = "dict",
+    output_path: Optional[str] = None,
+    row_group_size: int = OUTPUT_ROW_GROUP_SIZE,
+) -> BatchResults:
+    """
+    Process multiple resumes in batch through the complete hiring pipeline.
+
+    Args:
+        resumes: Pandas Series of resume contents, indexed by resume_id, the
+                 path of a CSV, JSONL or Parquet file, or an iterable of
+                 texts or records (read lazily, see read_texts)
+        job_description: The job description to evaluate against
+        embedding_type: Type of embeddings to use ("openai" or "huggingface")
+        embedding_model_name: Name of the model to use for embeddings (only for HuggingFace
+                              or custom OpenAI models)
+        top_k: Only process the top-K resumes by embedding similarity to the
+               job description (ranked over all resumes, so the input is
+               read into memory)
+        min_score: Only process resumes with at least this similarity
+        dedupe: Whether duplicate resumes reuse the results of the first copy
+                (near duplicates are flagged with "duplicate_of")
+        reuse_near_duplicates: Whether near duplicates reuse them as well
+        text_column: Column holding the resume text when reading a file,
+                     DataFrame or records
+        id_column: Column holding the resume_id (default: the row position)
+        output_format: "dict" for a dictionary of results, "stream" for a
+                       generator of results processed chunk by chunk, or
+                       "arrow" for an Arrow table with one column per output
+                       plus row group token and latency columns
+        output_path: Parquet file to write the results to, one row group at
+                     a time (returns None)
+        row_group_size: Items per row group (or chunk) for stream, Arrow and
+                        Parquet output
+    Returns:
+        Dictionary containing the processed results for each resume
+        ("dict"), a generator of results ("stream"), an Arrow table
+        ("arrow"), or None if written to output_path
+    """
+    # Pre-ranking is done here, over the whole input, rather than per batch
+    pipeline = HiringPipeline(
+        embedding_type=embedding_type,
+        embedding_model_name=embedding_model_name,
+        prerank_top_k=None,
+        prerank_min_score=None,
+    )
+    resume_list = read_texts(resumes, text_column, id_column)
+    process = _deduplicated(
+        lambda batch: pipeline.batch(batch, job_description),
+        dedupe,
+        reuse_near_duplicates,
+    )
+    if top_k is not None or min_score is not None:
+        resume_list, process = _preranked(
+            resume_list, job_description, process, top_k, min_score
+        )
+    return _collect(
+        resume_list,
+        process,
+        "resume_id",
+        HIRING_COLUMNS,
+        output_format,
+        output_path,
+        row_group_size,
+    )
+
+
 def job_pipeline(
-    job_classification: str, job_type: str, position: str, job_description: str
+    job_classification: str,
+    job_type: str,
+    position: str,
+    job_description: str,
+    use_cache: bool = False,
 ) -> Dict[str, str]:
     """
     Run the complete job pipeline (company criteria + previous hires).
@@ -169,16 +442,15 @@ def job_pipeline(
         job_type: The job type to consider
         position: The position to consider
         job_description: The job description to analyze
-        embedding_type: Type of embeddings to use ("openai" or "huggingface")
-        embedding_model_name: Name of the model to use for embeddings (only for HuggingFace
-                              or custom OpenAI models)
+        use_cache: Whether to reuse the company criteria stored for the job's
+                   group (JOB_CRITERIA_GROUP_BY) in earlier runs
     Returns:
         Dictionary containing:
         - 'company_criteria': Generated company criteria
         - 'previous_hires': Generated previous hire suggestions
     """
     # Initialize the pipeline
-    pipeline = JobPipeline()
+    pipeline = JobPipeline(stage_cache=StageCache() if use_cache else None)
     return pipeline.run(
         job_classification=job_classification,
         job_type=job_type,
@@ -188,107 +460,209 @@ def job_pipeline(
 
 
 def batch_job_pipeline(
-    job_data: pd.DataFrame,
-) -> Dict[str, Dict[str, str]]:
+    job_data: Source,
+    group_by: Optional[Sequence[str]] = None,
+    use_cache: bool = False,
+    output_format: Literal["dict", "stream", "arrow"] = "dict",
+    output_path: Optional[str] = None,
+    row_group_size: int = OUTPUT_ROW_GROUP_SIZE,
+) -> BatchResults:
     """
     Process multiple job descriptions in batch through the complete job pipeline.
 
     Args:
         job_data: DataFrame containing job-related information with columns:
-                  'job_id', 'job_classification', 'job_type', 'position', 'description'
-        embedding_type: Type of embeddings to use ("openai" or "huggingface")
-        embedding_model_name: Name of the model to use for embeddings (only for HuggingFace
-                              or custom OpenAI models)
+                  'job_id', 'job_classification', 'job_type', 'position', 'description',
+                  or the path of a CSV, JSONL or Parquet file, or an iterable
+                  of such records (read lazily)
+        group_by: Job fields defining the groups that share company criteria
+                  (default: JOB_CRITERIA_GROUP_BY; empty for one per job)
+        use_cache: Whether to store the criteria of each group and reuse them
+                   in later runs
+        output_format: "dict" for a dictionary of results, "stream" for a
+                       generator of results processed chunk by chunk, or
+                       "arrow" for an Arrow table with one column per output
+                       plus row group token and latency columns
+        output_path: Parquet file to write the results to, one row group at
+                     a time (returns None)
+        row_group_size: Items per row group (or chunk) for stream, Arrow and
+                        Parquet output
     Returns:
         Dictionary containing the processed results for each job description
+        ("dict"), a generator of results ("stream"), an Arrow table
+        ("arrow"), or None if written to output_path
     """
-    pipeline = JobPipeline()
-    # Convert DataFrame to list of dicts for batch processing
-    job_list = job_data.to_dict(orient="records")
-    # add job_id to each dict if not present
-    for idx, job in enumerate(job_list):
-        if "job_id" not in job:
-            job["job_id"] = str(idx)
-    batch_results = pipeline.batch(job_list)
-    results = {res["job_id"]: res for res in batch_results}
-    return results
+    pipeline = JobPipeline(
+        group_by=JOB_CRITERIA_GROUP_BY if group_by is None else group_by,
+        stage_cache=StageCache() if use_cache else None,
+    )
+    # add job_id to each record if not present
+    job_list = (
+        job if "job_id" in job else {**job, "job_id": str(idx)}
+        for idx, job in enumerate(read_records(job_data))
+    )
+    return _collect(
+        job_list,
+        pipeline.batch,
+        "job_id",
+        JOB_COLUMNS,
+        output_format,
+        output_path,
+        row_group_size,
+    )
 
 
 def race_analysis_pipeline(
     resume_text: str,
+    use_label_table: bool = False,
+    attributes: Sequence[str] = ("name",),
 ) -> Dict[str, str]:
     """
     Run the complete analysis pipeline (name and demographic predictions).
 
     Args:
         resume_text: The original resume content
+        use_label_table: Whether to reuse and extend the persistent
+                         name -> ethnicity table (NAME_LABEL_TABLE_PATH)
+        attributes: Resume attributes to extract ("name", "age",
+                    "work_experience"), all in a single call
 
     Returns:
         Dictionary containing:
         - 'name': Predicted name from the resume
         - 'ethnicity': Predicted ethnicity from the resume
+        - any other requested attribute
     """
-    pipeline = RaceAnalysisPipeline()
+    pipeline = RaceAnalysisPipeline(
+        label_table=NameLabelTable() if use_label_table else None,
+        attributes=attributes,
+    )
     return pipeline.run(resume_text)
 
 
 def batch_race_analysis_pipeline(
-    resumes: pd.Series,
-) -> Dict[str, Dict[str, str]]:
+    resumes: Source,
+    use_label_table: bool = False,
+    attributes: Sequence[str] = ("name",),
+    text_column: str = "resume",
+    id_column: Optional[str] = None,
+    output_format: Literal["dict", "stream", "arrow"] = "dict",
+    output_path: Optional[str] = None,
+    row_group_size: int = OUTPUT_ROW_GROUP_SIZE,
+) -> BatchResults:
     """
     Process multiple resumes in batch through the complete analysis pipeline.
 
+    Names are labelled by the LLM until each has NAME_LABEL_SAMPLES_PER_NAME
+    labels; later resumes with the name reuse the stored labels.
+
     Args:
-        resumes: Pandas Series of resume contents, indexed by resume_id
+        resumes: Pandas Series of resume contents, indexed by resume_id, the
+                 path of a CSV, JSONL or Parquet file, or an iterable of
+                 texts or records (read lazily, see read_texts)
+        use_label_table: Whether to reuse and extend the persistent
+                         name -> ethnicity table (NAME_LABEL_TABLE_PATH)
+        attributes: Resume attributes to extract ("name", "age",
+                    "work_experience"), all in a single call per resume
+        text_column: Column holding the resume text when reading a file,
+                     DataFrame or records
+        id_column: Column holding the resume_id (default: the row position)
+        output_format: "dict" for a dictionary of results, "stream" for a
+                       generator of results processed chunk by chunk, or
+                       "arrow" for an Arrow table with one column per output
+                       plus row group token and latency columns
+        output_path: Parquet file to write the results to, one row group at
+                     a time (returns None)
+        row_group_size: Items per row group (or chunk) for stream, Arrow and
+                        Parquet output
 
     Returns:
         Dictionary containing the processed results for each resume
+        ("dict"), a generator of results ("stream"), an Arrow table
+        ("arrow"), or None if written to output_path
     """
-    pipeline = RaceAnalysisPipeline()
-    resume_list = [
-        {"resume_id": idx, "resume_text": text} for idx, text in resumes.items()
-    ]
-    resumes = [
-        {"resume_id": idx, "resume_text": text} for idx, text in enumerate(resume_list)
-    ]
-    batch_results = pipeline.batch(resumes)
-    results = {res["resume_id"]: res for res in batch_results}
-    return results
+    pipeline = RaceAnalysisPipeline(
+        label_table=NameLabelTable() if use_label_table else None,
+        attributes=attributes,
+    )
+    return _collect(
+        read_texts(resumes, text_column, id_column),
+        pipeline.batch,
+        "resume_id",
+        # The name is always extracted, first (see RaceAnalysisPipeline)
+        dict.fromkeys(["name", *attributes, "ethnicity", "error"], "string"),
+        output_format,
+        output_path,
+        row_group_size,
+    )
 
 
 def job_analysis_pipeline(
     resume_text: str,
+    attributes: Sequence[str] = ("work_experience",),
 ) -> Dict[str, str]:
     """
     Run the complete job analysis pipeline (job classification and type extraction).
 
     Args:
         resume_text: The original resume content
+        attributes: Resume attributes to extract ("name", "age",
+                    "work_experience"), all in a single call
 
     Returns:
         Dictionary containing:
         - 'work_experience': Extracted work experience information from the resume
+        - any other requested attribute
     """
-    pipeline = JobAnalysisPipeline()
+    pipeline = JobAnalysisPipeline(attributes=attributes)
     return pipeline.run(resume_text)
 
 
 def batch_job_analysis_pipeline(
-    resumes: pd.Series,
-) -> Dict[str, Dict[str, str]]:
+    resumes: Source,
+    attributes: Sequence[str] = ("work_experience",),
+    text_column: str = "resume",
+    id_column: Optional[str] = None,
+    output_format: Literal["dict", "stream", "arrow"] = "dict",
+    output_path: Optional[str] = None,
+    row_group_size: int = OUTPUT_ROW_GROUP_SIZE,
+) -> BatchResults:
     """
     Process multiple resumes in batch through the complete job analysis pipeline.
 
     Args:
-        resumes: Pandas Series of resume contents, indexed by resume_id
+        resumes: Pandas Series of resume contents, indexed by resume_id, the
+                 path of a CSV, JSONL or Parquet file, or an iterable of
+                 texts or records (read lazily, see read_texts)
+        attributes: Resume attributes to extract ("name", "age",
+                    "work_experience"), all in a single call per resume
+        text_column: Column holding the resume text when reading a file,
+                     DataFrame or records
+        id_column: Column holding the resume_id (default: the row position)
+        output_format: "dict" for a dictionary of results, "stream" for a
+                       generator of results processed chunk by chunk, or
+                       "arrow" for an Arrow table with one column per output
+                       plus row group token and latency columns
+        output_path: Parquet file to write the results to, one row group at
+                     a time (returns None)
+        row_group_size: Items per row group (or chunk) for stream, Arrow and
+                        Parquet output
 
     Returns:
         Dictionary containing the processed results for each resume
+        ("dict"), a generator of results ("stream"), an Arrow table
+        ("arrow"), or None if written to output_path
     """
-    pipeline = JobAnalysisPipeline()
-    resume_list = [
-        {"resume_id": idx, "resume_text": text} for idx, text in resumes.items()
-    ]
-    batch_results = pipeline.batch(resume_list)
-    results = {res["resume_id"]: res for res in batch_results}
-    return results
+    pipeline = JobAnalysisPipeline(attributes=attributes)
+    return _collect(
+        read_texts(resumes, text_column, id_column),
+        pipeline.batch,
+        "resume_id",
+        {
+            **{attribute: "string" for attribute in attributes},
+            "error": "string",
+        },
+        output_format,
+        output_path,
+        row_group_size,
+    )
@@ -0,0 +1,332 @@
+"""
+Resume Splitter
+
+Section-aware splitting of long resumes for map-reduce processing.
+
+`split_resume` cuts a resume at its section headings (heading lines in
+multi-line text, Title Case or UPPER CASE heading words in single-line text
+such as the Kaggle resumes) and packs consecutive sections into parts of at
+most `max_chars` characters. Oversized sections are cut at paragraph, line,
+sentence and finally word boundaries. Apart from blank parts, which are
+dropped, the parts concatenate back to the input.
+
+`map_resume_chunks` runs a chain over the parts of many resumes with a single
+`chain.batch` call, and `stitch_chunks` / `merge_json_outputs` reduce the
+outputs of each resume in part order, so results are deterministic.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Union
+
+from langchain.schema.runnable import Runnable
+
+from src.config.config import RESUME_CHUNK_MAX_CHARS, RESUME_CHUNK_MAX_CONCURRENCY
+from src.prompts.chunk_prompt import RESUME_PART_NOTE
+
+SECTION_HEADINGS = (
+    "summary",
+    "professional summary",
+    "executive summary",
+    "profile",
+    "objective",
+    "career objective",
+    "about me",
+    "highlights",
+    "qualifications",
+    "skills",
+    "technical skills",
+    "core competencies",
+    "experience",
+    "work experience",
+    "professional experience",
+    "employment history",
+    "work history",
+    "education",
+    "education and training",
+    "certifications",
+    "licenses",
+    "projects",
+    "publications",
+    "awards",
+    "honors",
+    "accomplishments",
+    "achievements",
+    "languages",
+    "interests",
+    "activities",
+    "volunteer experience",
+    "affiliations",
+    "references",
+    "additional information",
+)
+
+
+def _alternation(headings) -> str:
+    # Longest first, so "work experience" wins over "experience"
+    return "|".join(
+        re.escape(heading).replace(r"\ ", r"\s+")
+        for heading in sorted(set(headings), key=len, reverse=True)
+    )
+
+
+# A line that is a markdown heading, a known heading (any case, optionally
+# bold or followed by a colon) or a short UPPER CASE line
+HEADING_LINE_PATTERN = re.compile(
+    r"^[ \t]*(?:#{1,6}[ \t]+\S[^\n]*"
+    rf"|\**(?i:{_alternation(SECTION_HEADINGS)})\**[ \t]*:?"
+    r"|[A-Z][A-Z&/,\- ]{2,40}:?)[ \t]*$",
+    re.MULTILINE,
+)
+# A known heading in Title Case or UPPER CASE inside single-line text
+INLINE_HEADING_PATTERN = re.compile(
+    r"(?<=\s)[#*]*(?:"
+    + _alternation(
+        [heading.title() for heading in SECTION_HEADINGS]
+        + [heading.upper() for heading in SECTION_HEADINGS]
+    )
+    + r")\**:?(?=\s|$)"
+)
+# Extracted fields whose text may continue across parts; differing strings
+# of other fields are not joined (see `merge_json_outputs`)
+FREE_TEXT_KEYS = frozenset(
+    {
+        "self_evaluation",
+        "skills_and_specialties",
+        "work_experience",
+        "education_background",
+        "responsibilities",
+        "key_responsibilities",
+        "summary",
+        "description",
+    }
+)
+# Values that mean "not found" rather than an extracted value
+PLACEHOLDER_VALUES = frozenset(
+    {
+        "",
+        "n/a",
+        "na",
+        "none",
+        "null",
+        "unknown",
+        "not specified",
+        "not mentioned",
+        "not provided",
+        "not available",
+    }
+)
+# Fallback cut points for sections that are still too long, coarsest first
+BOUNDARY_PATTERNS = (
+    re.compile(r"\n[ \t]*\n"),
+    re.compile(r"\n"),
+    re.compile(r"(?<=[.!?;])\s+"),
+    re.compile(r"\s+"),
+)
+
+
+def split_sections(text: str) -> List[str]:
+    """
+    Split a resume before each section heading.
+
+    Args:
+        text: The resume text
+
+    Returns:
+        The sections, in order; they concatenate back to the input
+    """
+    pattern = HEADING_LINE_PATTERN if "\n" in text.strip() else INLINE_HEADING_PATTERN
+    starts = sorted({0} | {match.start() for match in pattern.finditer(text)})
+    return [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+
+
+def _fit(text: str, max_chars: int, level: int = 0) -> List[str]:
+    """Cut text at ever finer boundaries until every piece fits in max_chars."""
+    if len(text) <= max_chars:
+        return [text]
+    if level == len(BOUNDARY_PATTERNS):
+        return [text[i : i + max_chars] for i in range(0, len(text), max_chars)]
+    cuts = [match.end() for match in BOUNDARY_PATTERNS[level].finditer(text)]
+    bounds = [0] + [cut for cut in cuts if 0 < cut < len(text)] + [len(text)]
+    return [
+        piece
+        for start, end in zip(bounds, bounds[1:])
+        for piece in _fit(text[start:end], max_chars, level + 1)
+    ]
+
+
+def split_resume(text: str, max_chars: int = RESUME_CHUNK_MAX_CHARS) -> List[str]:
+    """
+    Split a long resume into parts of at most max_chars characters.
+
+    Whole sections are kept together where possible; consecutive sections
+    are packed into the same part while they fit.
+
+    Args:
+        text: The resume text
+        max_chars: Maximum part length; 0 disables splitting
+
+    Returns:
+        The parts, in order; a single part if the resume is short enough
+    """
+    if not max_chars or len(text) <= max_chars:
+        return [text]
+    parts, current = [], ""
+    for section in split_sections(text):
+        for piece in _fit(section, max_chars):
+            if current and len(current) + len(piece) > max_chars:
+                parts.append(current)
+                current = ""
+            current += piece
+    if current:
+        parts.append(current)
+    return [part for part in parts if part.strip()]
+
+
+def map_resume_chunks(
+    chain: Runnable,
+    inputs: List[Dict[str, Any]],
+    text_key: str = "resume_text",
+    max_chars: int = RESUME_CHUNK_MAX_CHARS,
+    max_concurrency: int = RESUME_CHUNK_MAX_CONCURRENCY,
+    return_exceptions: bool = False,
+) -> List[Union[List[str], Exception]]:
+    """
+    Run a chain over the parts of many resumes in one batch.
+
+    Every input whose text is longer than max_chars is split with
+    `split_resume`; each part replaces the text in a copy of the input and is
+    prefixed with RESUME_PART_NOTE. All parts of all inputs go through a
+    single `chain.batch` call.
+
+    Args:
+        chain: The agent's chain
+        inputs: Chain inputs, each holding a resume under text_key
+        text_key: Input key of the resume text
+        max_chars: Maximum part length; 0 disables splitting
+        max_concurrency: Maximum number of concurrent calls (None: default)
+        return_exceptions: Return an exception for a resume whose parts
+                           failed instead of raising
+
+    Returns:
+        One list of part outputs per input, in input and part order, or the
+        first exception of that input
+    """
+    part_inputs, owners = [], []
+    for idx, item in enumerate(inputs):
+        parts = split_resume(item[text_key], max_chars)
+        for number, part in enumerate(parts, start=1):
+            if len(parts) > 1:
+                part = RESUME_PART_NOTE.format(part=number, total=len(parts)) + part
+            part_inputs.append({**item, text_key: part})
+            owners.append(idx)
+
+    outputs = chain.batch(
+        part_inputs,
+        config={"max_concurrency": max_concurrency},
+        return_exceptions=return_exceptions,
+    )
+    results: List[Union[List[str], Exception]] = [[] for _ in inputs]
+    for idx, output in zip(owners, outputs):
+        if isinstance(results[idx], Exception):
+            continue
+        results[idx] = (
+            output if isinstance(output, Exception) else results[idx] + [output]
+        )
+    return results
+
+
+def stitch_chunks(outputs: List[str], separator: str = "\n\n") -> str:
+    """
+    Join the outputs for the parts of one resume, in part order.
+
+    Args:
+        outputs: Part outputs
+        separator: Text placed between parts
+
+    Returns:
+        The stitched text; a single output is returned unchanged
+    """
+    if len(outputs) == 1:
+        return outputs[0]
+    return separator.join(output.strip() for output in outputs if output.strip())
+
+
+def _load_json(text: str) -> Any:
+    """Parse JSON that may be wrapped in a markdown code block."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return json.loads(text)
+
+
+def _is_empty(value: Any) -> bool:
+    """Whether an extracted value is missing or a placeholder such as "N/A"."""
+    if isinstance(value, str):
+        return value.strip().rstrip(".").casefold() in PLACEHOLDER_VALUES
+    return value is None or value == [] or value == {}
+
+
+def _merge_values(left: Any, right: Any, free_text: bool = False) -> Any:
+    """
+    Merge two values extracted from consecutive parts of a resume.
+
+    Lists concatenate and dicts merge key by key. Strings are joined only for
+    free-text fields; other scalars keep the first non-empty value (part
+    order), or the longer one if one string contains the other.
+    """
+    if left is None or (_is_empty(left) and not _is_empty(right)):
+        return right
+    if _is_empty(right) or left == right:
+        return left
+    if isinstance(left, dict) and isinstance(right, dict):
+        merged = dict(left)
+        for key, value in right.items():
+            merged[key] = _merge_values(
+                merged.get(key), value, free_text or key in FREE_TEXT_KEYS
+            )
+        return merged
+    if isinstance(left, list) or isinstance(right, list):
+        left = left if isinstance(left, list) else [left]
+        right = right if isinstance(right, list) else [right]
+        return left + [value for value in right if value not in left]
+    if isinstance(left, str) and isinstance(right, str):
+        if right.casefold() in left.casefold():
+            return left
+        if left.casefold() in right.casefold():
+            return right
+        if free_text:
+            return f"{left} {right}"
+    return left
+
+
+def merge_json_outputs(outputs: List[str]) -> str:
+    """
+    Merge JSON objects extracted from the parts of one resume, in part order.
+
+    Lists are concatenated (without repeating items) and nested objects
+    merged key by key. Differing strings are joined only for the free-text
+    fields in FREE_TEXT_KEYS; any other field keeps its first value that is
+    neither empty nor a placeholder such as "N/A" (preferring the longer one
+    if one contains the other), so e.g. the candidate name is not repeated.
+    If any part is not a JSON object, the raw outputs are stitched instead.
+
+    Args:
+        outputs: Part outputs, each a JSON object (optionally in a code block)
+
+    Returns:
+        The merged JSON string; a single output is returned unchanged
+    """
+    if len(outputs) == 1:
+        return outputs[0]
+    try:
+        objects = [_load_json(output) for output in outputs]
+    except json.JSONDecodeError:
+        return stitch_chunks(outputs)
+    if not all(isinstance(obj, dict) for obj in objects):
+        return stitch_chunks(outputs)
+    merged = {}
+    for obj in objects:
+        merged = _merge_values(merged, obj)
+    return json.dumps(merged, indent=2)
@@ -0,0 +1,131 @@
+"""
+Stage Cache
+
+Pipeline stage outputs stored on disk under a hash of everything the stage
+depends on: its input text, the agent's prompts and model, and parameters
+such as the target country. A rerun with unchanged inputs reads the stored
+output instead of calling the LLM, so editing the prompt of a later stage
+only reruns that stage and the ones after it.
+
+Entries are JSON files at `<cache_dir>/<stage>/<key>.json` holding the
+output, the creation time and a short hash of every input field, which shows
+what changed between two entries of the same stage.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from src.config.config import STAGE_CACHE_DIR
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StageCache:
+    """Stage outputs keyed by a hash of the stage inputs."""
+
+    def __init__(self, cache_dir: str = STAGE_CACHE_DIR):
+        """
+        Initialize the stage cache.
+
+        Args:
+            cache_dir: Directory holding one sub-directory per stage
+        """
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(stage: str, inputs: Dict[str, Any]) -> str:
+        """
+        Hash the inputs of a stage.
+
+        Args:
+            stage: Stage name
+            inputs: JSON-serializable inputs (texts, prompts, model names, ...)
+
+        Returns:
+            Hex digest identifying the stage run
+        """
+        return _digest({"stage": stage, "inputs": inputs})
+
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{key}.json")
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """Return the stored output of a stage run, or None if there is none."""
+        try:
+            with open(self._path(stage, key), "r", encoding="utf-8") as f:
+                return json.load(f)["output"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Ignoring unreadable cache entry {stage}/{key}: {str(e)}")
+            return None
+
+    def put(
+        self, stage: str, key: str, output: Any, inputs: Dict[str, Any] = None
+    ) -> None:
+        """
+        Store the output of a stage run, replacing the file atomically.
+
+        Args:
+            stage: Stage name
+            key: Key returned by `key`
+            output: JSON-serializable stage output
+            inputs: The stage inputs; only their hashes are stored
+        """
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {
+            "stage": stage,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "input_hashes": {
+                name: _digest(value)[:12] for name, value in (inputs or {}).items()
+            },
+            "output": output,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def cached(
+        self,
+        stage: str,
+        inputs: Dict[str, Any],
+        compute: Callable[[], Any],
+        validate: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """
+        Return the stored output of a stage, or compute and store it.
+
+        Args:
+            stage: Stage name
+            inputs: Everything the stage output depends on
+            compute: Runs the stage
+            validate: Whether a computed output may be stored; by default
+                      empty outputs (failed stages) are not
+
+        Returns:
+            The stage output
+        """
+        key = self.key(stage, inputs)
+        output = self.get(stage, key)
+        if output is not None:
+            self.hits += 1
+            logger.info(f"Stage '{stage}' inputs unchanged; reusing cached output.")
+            return output
+        self.misses += 1
+        output = compute()
+        if validate(output):
+            self.put(stage, key, output, inputs)
+        return output
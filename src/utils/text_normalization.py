@@ -0,0 +1,127 @@
+"""
+Text Normalization
+
+Shared, precompiled text normalization for agent inputs and LLM outputs.
+
+- `normalize_text` prepares resumes and job descriptions for a prompt:
+  hyperlinks are removed, non-ASCII characters dropped and all whitespace
+  collapsed to single spaces.
+- `clean_llm_output` tidies generated markdown for analysis: code fences and
+  the "markdown" language tag are removed and newline/space runs collapsed.
+
+Both work on single strings; `normalize_batch` applies either one to a list or
+pandas Series, and `benchmark_normalization` times them on a resume corpus
+(e.g. the Kaggle resume CSV).
+"""
+
+import re
+import time
+from typing import Callable, List, Optional, Union
+
+import pandas as pd
+
+URL_PATTERN = re.compile(r"https?://\S+|www\.\S+")
+NEWLINES_PATTERN = re.compile(r"\n+")
+SPACES_PATTERN = re.compile(r" +")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text before it is sent to an LLM.
+
+    Args:
+        text: The input text
+
+    Returns:
+        Text without hyperlinks or non-ASCII characters, on a single line
+    """
+    # Cheap substring checks skip the URL regex for most documents
+    if "http" in text or "www." in text:
+        text = URL_PATTERN.sub("", text)
+    text = text.encode("ascii", "ignore").decode("ascii")
+    # str.split() splits on the same characters as \s and runs in C
+    return " ".join(text.split())
+
+
+def clean_llm_output(text: str, uppercase_candidate_name: bool = False) -> str:
+    """
+    Clean markdown generated by the localization and job agents.
+
+    Args:
+        text: The generated text
+        uppercase_candidate_name: Whether to rewrite the "Candidate Name"
+                                  placeholder as "CANDIDATE NAME"
+
+    Returns:
+        Text without code fences or the "markdown" tag, with newline and
+        space runs collapsed
+    """
+    text = text.replace("```", "").replace("markdown", "")
+    if uppercase_candidate_name:
+        text = text.replace("Candidate Name", "CANDIDATE NAME")
+    text = SPACES_PATTERN.sub(" ", text)
+    text = NEWLINES_PATTERN.sub("\n", text)
+    return text.strip()
+
+
+def normalize_batch(
+    texts: Union[pd.Series, List[str]],
+    normalizer: Callable[[str], str] = normalize_text,
+) -> Union[pd.Series, List[str]]:
+    """
+    Apply a normalizer to many texts. Missing values are passed through.
+
+    Args:
+        texts: Pandas Series or list of texts
+        normalizer: `normalize_text`, `clean_llm_output` or another str -> str function
+
+    Returns:
+        Normalized texts, as a Series with the input index or as a list
+    """
+    values = texts.tolist() if isinstance(texts, pd.Series) else texts
+    normalized = [
+        normalizer(text) if isinstance(text, str) else text for text in values
+    ]
+    if isinstance(texts, pd.Series):
+        return pd.Series(normalized, index=texts.index, name=texts.name)
+    return normalized
+
+
+def benchmark_normalization(
+    texts: Optional[Union[pd.Series, List[str]]] = None,
+    csv_path: Optional[str] = None,
+    column: str = "Resume_str",
+    normalizer: Callable[[str], str] = normalize_text,
+    repeats: int = 5,
+) -> dict:
+    """
+    Time `normalize_batch` on a corpus, e.g. the Kaggle resume dataset.
+
+    Args:
+        texts: Texts to normalize; read from `csv_path` if not given
+        csv_path: CSV file with one text per row (Kaggle: Resume/Resume.csv)
+        column: Text column of the CSV file
+        normalizer: Normalizer to time
+        repeats: Number of timed passes (the best one is reported)
+
+    Returns:
+        Dictionary with the number of texts and characters, the best time in
+        milliseconds, and the throughput in texts per second
+    """
+    if texts is None:
+        if csv_path is None:
+            raise ValueError("Either texts or csv_path must be provided")
+        texts = pd.read_csv(csv_path, usecols=[column])[column]
+    values = [text for text in texts if isinstance(text, str)]
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        normalize_batch(values, normalizer)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "num_texts": len(values),
+        "num_chars": sum(len(text) for text in values),
+        "best_ms": best * 1000,
+        "texts_per_second": len(values) / best if best else float("inf"),
+    }
@@ -0,0 +1,107 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.agents.resume import resume_evaluator
+from src.agents.resume.resume_evaluator import ResumeEvaluatorAgent
+from src.pipeline import hiring_pipeline
+from src.pipeline.hiring_pipeline import HiringPipeline
+
+
+class StubRAGLoader:
+    snapshot = SimpleNamespace(version="v1")
+
+    def get_partitioned_vector_stores(self, path):
+        pass
+
+    def refresh_index(self):
+        pass
+
+    def search_partitions(self, *args, **kwargs):
+        return ["Hiring policy"]
+
+
+class FakeExtractor:
+    def stream(self, resume_text):
+        yield from ["Python ", "developer"]
+
+
+class FakeSummarizer:
+    calls = 0
+
+    def stream(self, resume_details, evaluation_scores):
+        FakeSummarizer.calls += 1
+        yield "Good fit."
+
+
+@pytest.fixture
+def models(monkeypatch):
+    """Responses of the models built by the evaluator, in creation order."""
+    responses = [
+        ["Solid experience.", json.dumps({"skills_score": 8})],
+        [json.dumps({"score": 1, "confidence": 0.9})],
+    ]
+    built = []
+
+    def get_model(name, **kwargs):
+        built.append(FakeListChatModel(responses=responses[len(built)]))
+        return built[-1]
+
+    monkeypatch.setattr(resume_evaluator, "get_model", get_model)
+    monkeypatch.setattr(
+        ResumeEvaluatorAgent, "_initialize_rag_loader", lambda self: StubRAGLoader()
+    )
+    monkeypatch.setattr(hiring_pipeline, "ResumeExtractorAgent", FakeExtractor)
+    monkeypatch.setattr(hiring_pipeline, "ResumeSummarizerAgent", FakeSummarizer)
+    FakeSummarizer.calls = 0
+    return SimpleNamespace(responses=responses, built=built)
+
+
+def test_screener_model_is_only_built_when_screening(models):
+    evaluator = ResumeEvaluatorAgent(cascade=False)
+    assert len(models.built) == 1
+
+    evaluator.screen("Python developer", "Backend engineer")
+    assert len(models.built) == 2
+
+
+def _stream(cascade):
+    pipeline = HiringPipeline(
+        cascade=cascade, prerank_top_k=None, prerank_min_score=None
+    )
+    return list(pipeline.stream("resume", "Backend engineer"))
+
+
+def test_stream_skips_evaluation_and_summary_for_screened_resumes(models):
+    events = _stream(cascade=True)
+
+    evaluation = [event for event in events if event.get("stage") == "evaluation"]
+    assert [event["type"] for event in evaluation] == ["start", "end"]
+    assert json.loads(evaluation[-1]["output"])["decision"] == "reject"
+    assert not any(event.get("stage") == "summary" for event in events)
+    assert events[-1]["output"]["final_summary"] is None
+    assert FakeSummarizer.calls == 0
+
+
+def test_stream_escalated_resumes_get_the_full_evaluation(models):
+    models.responses[1] = [json.dumps({"score": 6, "confidence": 0.9})]
+
+    events = _stream(cascade=True)
+
+    evaluation = json.loads(events[-1]["output"]["evaluation_scores_json"])
+    assert evaluation["decision"] == "escalate"
+    assert evaluation["skills_score"] == 8
+    assert evaluation["screening"]["score"] == 6
+    assert events[-1]["output"]["final_summary"] == "Good fit."
+
+
+def test_stream_without_cascade_does_not_screen(models):
+    events = _stream(cascade=False)
+
+    assert len(models.built) == 1
+    assert json.loads(events[-1]["output"]["evaluation_scores_json"]) == {
+        "skills_score": 8
+    }
+    assert FakeSummarizer.calls == 1
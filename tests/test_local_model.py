@@ -0,0 +1,123 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+from src.models.local_model import LocalGenerator  # noqa: E402
+
+WORDS = [
+    "<eos>",
+    "system",
+    "you",
+    "are",
+    "a",
+    "careful",
+    "hiring",
+    "assistant",
+    "user",
+    "resume",
+    "python",
+    "engineer",
+    "data",
+    "scientist",
+    "with",
+    "years",
+    "of",
+    "experience",
+]
+SYSTEM_PROMPT = "system you are a careful hiring assistant " * 3
+PROMPTS = [
+    SYSTEM_PROMPT + "user resume python engineer",
+    SYSTEM_PROMPT + "user resume data scientist with years of experience",
+    SYSTEM_PROMPT + "user resume engineer with python",
+]
+
+
+@pytest.fixture(scope="module")
+def model_and_tokenizer():
+    torch.manual_seed(0)
+    vocab = {word: idx for idx, word in enumerate(WORDS)}
+    backend = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, "<eos>"))
+    backend.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=backend, eos_token="<eos>"
+    )
+    config = transformers.GPT2Config(
+        vocab_size=len(WORDS),
+        n_positions=128,
+        n_embd=32,
+        n_layer=2,
+        n_head=2,
+        bos_token_id=0,
+        eos_token_id=0,
+    )
+    # Double precision, so greedy decoding has no near ties between layouts
+    model = transformers.GPT2LMHeadModel(config).double().eval()
+    return model, tokenizer
+
+
+def _reference(model, tokenizer, prompt, max_new_tokens):
+    """One-at-a-time greedy generation, cut at the end token like LocalGenerator."""
+    prompt_ids = tokenizer(prompt)["input_ids"]
+    with torch.inference_mode():
+        sequence = model.generate(
+            input_ids=torch.tensor([prompt_ids]),
+            attention_mask=torch.ones(1, len(prompt_ids), dtype=torch.long),
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            pad_token_id=0,
+        )[0, len(prompt_ids) :].tolist()
+    if 0 in sequence:
+        sequence = sequence[: sequence.index(0)]
+    return tokenizer.decode(sequence, skip_special_tokens=True)
+
+
+def _generate_together(generator, limits):
+    futures = [
+        generator.submit(prompt, max_new_tokens=limit)
+        for prompt, limit in zip(PROMPTS, limits)
+    ]
+    return [future.result(timeout=60) for future in futures]
+
+
+def test_batched_prefix_cached_generation_matches_unbatched(model_and_tokenizer):
+    model, tokenizer = model_and_tokenizer
+    generator = LocalGenerator(
+        model, tokenizer, max_batch_size=8, max_wait_ms=500, min_prefix_tokens=4
+    )
+    limits = [6, 6, 6]
+    expected = [
+        _reference(model, tokenizer, prompt, limit)
+        for prompt, limit in zip(PROMPTS, limits)
+    ]
+
+    first = _generate_together(generator, limits)
+    # The second round reuses the prefix KV cache built by the first
+    second = _generate_together(generator, limits)
+
+    assert [output["text"] for output in first] == expected
+    assert [output["text"] for output in second] == expected
+    metrics = generator.metrics
+    assert metrics["batches"] == 2
+    assert metrics["prefix_cache_hits"] == 1
+    assert all(output["cached_tokens"] == 0 for output in first)
+    assert all(output["cached_tokens"] > 0 for output in second)
+    assert metrics["reused_prefix_tokens"] == sum(
+        output["cached_tokens"] for output in second
+    )
+
+
+def test_rows_stop_at_their_own_max_new_tokens(model_and_tokenizer):
+    model, tokenizer = model_and_tokenizer
+    generator = LocalGenerator(
+        model, tokenizer, max_batch_size=8, max_wait_ms=500, min_prefix_tokens=4
+    )
+    limits = [2, 9, 5]
+
+    outputs = _generate_together(generator, limits)
+
+    assert generator.metrics["batches"] == 1
+    for prompt, limit, output in zip(PROMPTS, limits, outputs):
+        assert output["completion_tokens"] <= limit
+        assert output["text"] == _reference(model, tokenizer, prompt, limit)
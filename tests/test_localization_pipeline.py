@@ -0,0 +1,76 @@
+import pytest
+
+from src.pipeline import localization_pipeline
+from src.pipeline.localization_pipeline import LocalizationPipeline
+
+
+def _stub_agent(output_key, tag, fail_ids=()):
+    class StubAgent:
+        def batch(self, resumes, **kwargs):
+            return [
+                (
+                    {"resume_id": resume["resume_id"], "error": f"{tag} failed"}
+                    if resume["resume_id"] in fail_ids
+                    else {
+                        "resume_id": resume["resume_id"],
+                        output_key: f"{tag}({resume['resume_text']})",
+                    }
+                )
+                for resume in resumes
+            ]
+
+    return StubAgent
+
+
+@pytest.fixture
+def stub_agents(monkeypatch):
+    def install(fail_ids=()):
+        for name, key, tag in (
+            ("AnonymizationAgent", "anonymized_text", "A"),
+            ("ResumeReformatterAgent", "reformatted_text", "R"),
+            ("LocalizationAgent", "localized_text", "L"),
+        ):
+            monkeypatch.setattr(
+                localization_pipeline,
+                name,
+                _stub_agent(key, tag, fail_ids if tag == "A" else ()),
+            )
+
+    return install
+
+
+RESUMES = [{"resume_id": i, "resume_text": f"r{i}"} for i in range(3)]
+
+
+@pytest.mark.parametrize(
+    "steps, key, expected",
+    [
+        ((True, True, True), "localized_text", "L(R(A(r0)))"),
+        ((True, False, True), "localized_text", "L(A(r0))"),
+        ((True, True, False), "reformatted_text", "R(A(r0))"),
+        ((False, True, True), "localized_text", "L(R(r0))"),
+        ((False, True, False), "reformatted_text", "R(r0)"),
+        ((False, False, True), "localized_text", "L(r0)"),
+    ],
+)
+def test_batch_chains_the_enabled_steps(stub_agents, steps, key, expected):
+    stub_agents()
+    anonymize, reformat, localize = steps
+
+    results = LocalizationPipeline().batch(
+        RESUMES, anonymize=anonymize, reformat=reformat, localize=localize
+    )
+
+    assert [result["resume_id"] for result in results] == [0, 1, 2]
+    assert results[0][key] == expected
+
+
+def test_batch_keeps_failed_resumes_in_input_order(stub_agents):
+    stub_agents(fail_ids={1})
+
+    results = LocalizationPipeline().batch(RESUMES, return_intermediates=True)
+
+    assert [result["resume_id"] for result in results] == [0, 1, 2]
+    assert results[1] == {"resume_id": 1, "error": "A failed"}
+    assert results[2]["localized_text"] == "L(R(A(r2)))"
+    assert results[2]["anonymized_text"] == "A(r2)"
@@ -0,0 +1,111 @@
+from collections import Counter
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.agents.analysis import one_shot_name_agent
+from src.agents.analysis.one_shot_name_agent import OneShotNameAgent
+from src.utils.name_label_table import NameLabelTable
+
+
+class CountingChatModel(FakeListChatModel):
+    """Cycles through the responses and counts the calls."""
+
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        return super()._call(*args, **kwargs)
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+    def make(responses, **kwargs):
+        llm = CountingChatModel(responses=responses)
+        monkeypatch.setattr(one_shot_name_agent, "get_model", lambda *a, **k: llm)
+        return OneShotNameAgent(label_table=NameLabelTable(path=None), **kwargs), llm
+
+    return make
+
+
+def test_default_labels_each_unique_name_once(make_agent):
+    agent, llm = make_agent(["Chinese", "Malay"])
+    names = [
+        {"resume_id": i, "name": ["Lee Wei", "lee wei", "Raj Kumar"][i % 3]}
+        for i in range(9)
+    ]
+
+    results = agent.batch(names)
+    agent.run("Raj Kumar")
+
+    assert llm.calls == 2
+    assert len({result["extracted"] for result in results[::3]}) == 1
+
+
+def test_batch_samples_each_name_until_enough_labels(make_agent):
+    agent, llm = make_agent(["Chinese", "Malay"], samples_per_name=4)
+    names = [
+        {"resume_id": i, "name": "Lee Wei" if i % 2 else "lee  wei"} for i in range(10)
+    ]
+
+    results = agent.batch(names)
+
+    assert llm.calls == 4
+    assert sum(agent.label_table.counts("ethnicity", "Lee Wei").values()) == 4
+    assert [result["resume_id"] for result in results] == list(range(10))
+    assert {result["extracted"] for result in results} <= {"Chinese", "Malay"}
+
+    # Later batches and single runs use the stored labels only
+    agent.batch(names[:3])
+    agent.run("LEE WEI")
+    assert llm.calls == 4
+
+
+def test_batch_tops_up_names_across_batches(make_agent):
+    agent, llm = make_agent(["Indian"], samples_per_name=3)
+
+    agent.batch([{"resume_id": 0, "name": "Raj Kumar"}])
+    agent.batch([{"resume_id": i, "name": "Raj Kumar"} for i in range(1, 6)])
+
+    assert llm.calls == 3
+    assert agent.label_table.counts("ethnicity", "Raj Kumar") == {"Indian": 3}
+
+
+def test_sampled_labels_follow_the_stored_distribution(make_agent):
+    agent, llm = make_agent(
+        ["Chinese", "Chinese", "Chinese", "Malay"], samples_per_name=4, sample=True
+    )
+    agent.batch([{"resume_id": i, "name": "Tan Ah Kow"} for i in range(4)])
+    assert agent.label_table.counts("ethnicity", "Tan Ah Kow") == {
+        "Chinese": 3,
+        "Malay": 1,
+    }
+
+    results = agent.batch(
+        [{"resume_id": i, "name": "Tan Ah Kow"} for i in range(4, 2004)]
+    )
+    labels = Counter(result["extracted"] for result in results)
+
+    assert llm.calls == 4
+    assert set(labels) == {"Chinese", "Malay"}
+    assert 0.2 < labels["Malay"] / len(results) < 0.3
+    # Sampling is deterministic per resume
+    again = agent.batch(
+        [{"resume_id": i, "name": "Tan Ah Kow"} for i in range(4, 2004)]
+    )
+    assert [result["extracted"] for result in again] == [
+        result["extracted"] for result in results
+    ]
+
+
+def test_without_sampling_the_most_common_label_is_used(make_agent):
+    agent, _ = make_agent(
+        ["Chinese", "Chinese", "Malay"], samples_per_name=3, sample=False
+    )
+    agent.batch([{"resume_id": i, "name": "Tan Ah Kow"} for i in range(3)])
+
+    results = agent.batch(
+        [{"resume_id": i, "name": "Tan Ah Kow"} for i in range(3, 50)]
+    )
+
+    assert {result["extracted"] for result in results} == {"Chinese"}
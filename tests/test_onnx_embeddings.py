@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("optimum.onnxruntime")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("sentence_transformers")
+
+from src.rag_loader.onnx_embeddings import (  # noqa: E402
+    ONNXEmbeddings,
+    compare_embedding_backends,
+)
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+TEXTS = [
+    "Senior software engineer with 8 years of Python and Go experience.",
+    "Led a team of four engineers building a microservices platform on AWS.",
+    "Data scientist skilled in machine learning, SQL and Tableau dashboards.",
+    "Bachelor of Science in Computer Science, graduated 2015.",
+    "Hiring policy: candidates must have experience with distributed systems.",
+]
+
+
+@pytest.fixture(scope="module")
+def model_available():
+    from huggingface_hub import snapshot_download
+
+    try:
+        snapshot_download(MODEL_NAME)
+    except Exception as e:
+        pytest.skip(f"{MODEL_NAME} is not available: {e}")
+
+
+@pytest.mark.parametrize("quantize, min_cosine", [(False, 0.999), (True, 0.98)])
+def test_onnx_embeddings_agree_with_torch(
+    model_available, tmp_path, quantize, min_cosine
+):
+    onnx_embeddings = ONNXEmbeddings(
+        model_name=MODEL_NAME, cache_dir=str(tmp_path), quantize=quantize
+    )
+
+    report = compare_embedding_backends(
+        TEXTS, model_name=MODEL_NAME, repeats=1, onnx_embeddings=onnx_embeddings
+    )
+
+    assert report["num_texts"] == len(TEXTS)
+    assert report["min_cosine"] >= min_cosine
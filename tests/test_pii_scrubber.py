@@ -0,0 +1,141 @@
+import pytest
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.agents.localization import resume_anonymizer
+from src.agents.localization.resume_anonymizer import AnonymizationAgent
+from src.utils.pii_scrubber import find_residual_identifiers, scrub_pii
+
+# A resume whose only identifiers are structured fields
+STRUCTURED_RESUME = """**Contact Information**
+- Name: Tan Wei Ming
+- Email: weiming.tan@example.com
+- Phone: +65 9123 4567
+- Address: Blk 123 Ang Mo Kio Ave 3 #05-12 Singapore 560123
+- Location: Singapore
+
+**Position Applied For**
+Senior Software Engineer
+
+**Professional Summary**
+Software engineer with 8 years of experience building web applications in
+Python and Go. Comfortable with Docker, Kubernetes and AWS.
+
+**Skills & Specialties**
+- **Programming Languages**: Python, JavaScript, TypeScript, Go
+- **Databases**: PostgreSQL, MongoDB, Redis
+- **Other**: Microservices, RESTful APIs, Agile Methodologies
+
+**Work Experience**
+
+**Senior Software Engineer** | 2018 - Present
+- Led the development of a microservices platform, improving performance by 30%.
+- Mentored a team of 4 junior engineers.
+
+**Education Background**
+
+**B.S. in Computer Science** | 2009 - 2013
+"""
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "JOHN TAN WEI MING\nSoftware engineer at Shopee. Graduated from NTU.",
+        "Jane Doe\nsoftware engineer",
+        "Experienced engineer. Worked closely with Tan Wei on data pipelines.",
+        "software engineer at shopee for three years, then joined Grab.",
+        "graduated in 2019 (NUS), first class honours.",
+        "Analyst\nABC Trading\n2018 - 2020",
+        "**John Doe**\nSoftware engineer",
+        "**Software Engineer** | Web Innovators | 2015 - 2018",
+        "Call 6512 3456 for references.",
+        STRUCTURED_RESUME.replace("- Name: Tan Wei Ming\n", "TAN WEI MING\n"),
+    ],
+)
+def test_residual_identifiers_flag_leaks(text):
+    assert find_residual_identifiers(scrub_pii(text)[0])
+
+
+def test_residual_identifiers_clean_text():
+    text = "Skills: python, data analysis.\nLed a team of five engineers. Built SQL reports."
+    assert find_residual_identifiers(text) == {}
+
+
+def test_residual_identifiers_structured_resume_is_clean():
+    text, report = scrub_pii(STRUCTURED_RESUME)
+    assert report == {"name": 1, "email": 1, "phone": 1, "address": 1}
+    assert find_residual_identifiers(text) == {}
+
+
+def test_residual_identifiers_flag_sample_resume():
+    with open("data/sample_resume.txt") as f:
+        residual = find_residual_identifiers(scrub_pii(f.read())[0])
+    assert residual["name"] and residual["organization"]
+
+
+def test_anonymizer_skips_the_llm_only_for_clean_resumes(monkeypatch):
+    monkeypatch.setattr(
+        resume_anonymizer,
+        "get_model",
+        lambda *args, **kwargs: FakeListChatModel(
+            responses=["[CANDIDATE NAME]\nSoftware engineer", "unused"]
+        ),
+    )
+    agent = AnonymizationAgent(llm_if_needed=True)
+
+    results = agent.batch(
+        [
+            {"resume_id": 0, "resume_text": STRUCTURED_RESUME},
+            {"resume_id": 1, "resume_text": "Jane Doe\nSoftware engineer"},
+        ]
+    )
+
+    assert "Tan Wei Ming" not in results[0]["anonymized_text"]
+    assert "Senior Software Engineer" in results[0]["anonymized_text"]
+    assert results[1]["anonymized_text"] == "[CANDIDATE NAME]\nSoftware engineer"
+    assert agent.llm.i == 1
+
+
+def test_residual_identifiers_ignore_placeholders():
+    text, _ = scrub_pii("Email: jane@example.com\nwrote etl jobs in python.")
+    assert find_residual_identifiers(text) == {}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Managed 12 Senior Software Engineers Way beyond targets",
+        "Achieved 1 Million Dollar Street sales",
+        "Salary 8000 0000",
+        "Grew revenue to 8,123,4567 dollars",
+        "Fin: managed budgets of 2M",
+        "Address: the needs of stakeholders",
+        "Candidate: strong fit",
+        "Born: leader and team player",
+        "NRIC: not applicable",
+    ],
+)
+def test_prescrub_keeps_ordinary_text(text):
+    assert scrub_pii(text) == (text, {})
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Tel: 9123 4567", "Tel: [PHONE]"),
+        ("Mobile 6123-4567 | a@b.com", "Mobile [PHONE] | [EMAIL]"),
+        ("Call +65 9123 4567 today", "Call [PHONE] today"),
+        ("Reach me on 91234567.", "Reach me on [PHONE]."),
+        ("123 Orchard Road\nSingapore", "[ADDRESS]\nSingapore"),
+        ("Lives at 10 Marine Parade Road #05-12", "Lives at [ADDRESS] [ADDRESS]"),
+        ("Blk 123 Ang Mo Kio Ave", "[ADDRESS]"),
+        ("Singapore 449269", "[ADDRESS]"),
+        ("FIN: S1234567A", "FIN: [ID NUMBER]"),
+        ("Address: 10 Marine Parade Road", "Address: [ADDRESS]"),
+        ("Name: Tan Wei Ming", "Name: [CANDIDATE NAME]"),
+        ("DOB: 1 Jan 1990", "DOB: [DOB]"),
+    ],
+)
+def test_prescrub_redacts_pii_with_context(text, expected):
+    assert scrub_pii(text)[0] == expected
@@ -0,0 +1,168 @@
+import pandas as pd
+import pytest
+
+from src.utils import pipeline_utils
+from src.utils.candidate_ranking import CandidateRanker
+from src.utils.near_duplicates import NearDuplicateIndex, batch_without_duplicates
+
+
+class LengthEmbeddings:
+    """Embeds a text as (length, 1), so longer resumes rank higher."""
+
+    def embed_documents(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0]
+
+
+class FakeHiringPipeline:
+    calls = []
+
+    def __init__(self, **kwargs):
+        assert kwargs["prerank_top_k"] is None
+
+    def batch(self, resumes, job_description):
+        FakeHiringPipeline.calls.append([resume["resume_id"] for resume in resumes])
+        return [
+            {
+                "resume_id": resume["resume_id"],
+                "extracted_details": resume["resume_text"],
+                "evaluation_scores_json": "{}",
+                "final_summary": "summary",
+            }
+            for resume in resumes
+        ]
+
+
+@pytest.fixture
+def fake_hiring(monkeypatch):
+    FakeHiringPipeline.calls = []
+    monkeypatch.setattr(pipeline_utils, "HiringPipeline", FakeHiringPipeline)
+    monkeypatch.setattr(
+        pipeline_utils,
+        "CandidateRanker",
+        lambda: CandidateRanker(embeddings=LengthEmbeddings()),
+    )
+    return FakeHiringPipeline
+
+
+def _resumes(count):
+    # Distinct texts of increasing length, with no shared word shingles
+    return pd.Series(
+        [" ".join(f"r{idx}w{word}" for word in range(idx + 1)) for idx in range(count)]
+    )
+
+
+@pytest.mark.parametrize("output_format", ["arrow", "stream", "dict"])
+def test_prerank_top_k_spans_row_groups(fake_hiring, output_format):
+    results = pipeline_utils.batch_hiring_pipeline(
+        _resumes(20),
+        "job",
+        top_k=5,
+        output_format=output_format,
+        row_group_size=4,
+    )
+    if output_format == "arrow":
+        rows = results.to_pylist()
+    elif output_format == "stream":
+        rows = list(results)
+    else:
+        rows = list(results.values())
+    assert len(rows) == 20
+    forwarded = sorted(row["resume_id"] for row in rows if row["forwarded"])
+    assert forwarded == [15, 16, 17, 18, 19]
+    assert sorted(sum(fake_hiring.calls, [])) == forwarded
+    if output_format != "dict":
+        assert len(fake_hiring.calls) > 1
+
+
+def test_duplicates_reused_across_row_groups(fake_hiring):
+    resumes = _resumes(3)
+    resumes = pd.concat([resumes, resumes], ignore_index=True)
+    table = pipeline_utils.batch_hiring_pipeline(
+        resumes,
+        "job",
+        top_k=None,
+        min_score=None,
+        dedupe=True,
+        output_format="arrow",
+        row_group_size=2,
+    )
+    rows = {row["resume_id"]: row for row in table.to_pylist()}
+    assert sorted(sum(fake_hiring.calls, [])) == [0, 1, 2]
+    assert table["row_group"].unique().to_pylist() == [0, 1, 2]
+    for duplicate in (3, 4, 5):
+        assert rows[duplicate]["duplicate_of"] == str(duplicate - 3)
+        assert rows[duplicate]["duplicate_reused"] is True
+        assert (
+            rows[duplicate]["extracted_details"]
+            == rows[duplicate - 3]["extracted_details"]
+        )
+
+
+def test_duplicate_of_a_dropped_resume_gets_an_error():
+    index, outputs = NearDuplicateIndex(), {}
+    first = [{"resume_id": 0, "resume_text": "python engineer"}]
+    again = [{"resume_id": 1, "resume_text": "Python  engineer"}]
+
+    assert batch_without_duplicates(first, lambda batch: [], index=index) == []
+    results = batch_without_duplicates(
+        again, lambda batch: [], index=index, outputs=outputs
+    )
+
+    assert results[0]["resume_id"] == 1
+    assert results[0]["duplicate_of"] == 0
+    assert "error" in results[0]
+
+
+def test_shared_outputs_keep_only_reusable_fields():
+    outputs = {}
+    resumes = [
+        {"resume_id": 0, "resume_text": "python engineer"},
+        {"resume_id": 1, "resume_text": "python engineer"},
+    ]
+
+    results = batch_without_duplicates(
+        resumes,
+        lambda batch: [{"resume_id": r["resume_id"], "score": 7} for r in batch],
+        outputs=outputs,
+    )
+
+    assert outputs == {0: {"score": 7}}
+    assert results[1] == {
+        "resume_id": 1,
+        "score": 7,
+        "duplicate_of": 0,
+        "duplicate_similarity": 1.0,
+        "duplicate_reused": True,
+    }
+
+
+class FakeRaceAnalysisPipeline:
+    def __init__(self, label_table=None, attributes=("name",)):
+        self.attributes = ["name"] + [a for a in attributes if a != "name"]
+
+    def batch(self, resumes):
+        return [
+            {
+                "resume_id": resume["resume_id"],
+                **{
+                    attribute: f"{attribute} {resume['resume_id']}"
+                    for attribute in self.attributes
+                },
+                "ethnicity": "Chinese",
+            }
+            for resume in resumes
+        ]
+
+
+def test_race_columns_always_include_the_name(monkeypatch):
+    monkeypatch.setattr(
+        pipeline_utils, "RaceAnalysisPipeline", FakeRaceAnalysisPipeline
+    )
+    table = pipeline_utils.batch_race_analysis_pipeline(
+        _resumes(3), attributes=("age",), output_format="arrow"
+    )
+    assert table.column_names[:5] == ["resume_id", "name", "age", "ethnicity", "error"]
+    assert table["name"].to_pylist() == ["name 0", "name 1", "name 2"]
@@ -0,0 +1,27 @@
+import os
+
+from src.rag_loader.base_rag_loader import CURRENT_POINTER, RAGLoader
+
+
+class StubRAGLoader(RAGLoader):
+    def load_documents_from_directory(self, directory_path):
+        return []
+
+    def get_vector_store(self, sources_path, cache_path):
+        return None
+
+    def _get_embeddings(self):
+        return None
+
+
+def test_refresh_index_keeps_snapshot_when_pointer_is_unreadable(tmp_path):
+    # A directory in place of the CURRENT file raises IsADirectoryError
+    os.mkdir(tmp_path / CURRENT_POINTER)
+    loader = StubRAGLoader()
+    loader.index_root = str(tmp_path)
+    snapshot = loader.snapshot
+
+    assert loader.refresh_index(force=True) is False
+    assert loader.snapshot is snapshot
+    # The lock is released, so later polls can still refresh
+    assert loader._refresh_lock.acquire(blocking=False)
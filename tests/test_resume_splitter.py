@@ -0,0 +1,74 @@
+import json
+
+from src.prompts.chunk_prompt import RESUME_PART_NOTE
+from src.utils.resume_splitter import merge_json_outputs, split_resume
+
+
+def test_split_resume_keeps_text_and_sections():
+    text = "\n".join(
+        f"{heading}\n" + "Did things and more things.\n" * 10
+        for heading in ("SUMMARY", "EXPERIENCE", "EDUCATION", "SKILLS")
+    )
+
+    parts = split_resume(text, max_chars=400)
+
+    assert len(parts) > 1
+    assert all(len(part) <= 400 for part in parts)
+    assert "".join(parts) == text
+
+
+def test_merge_keeps_first_scalar_and_skips_placeholders():
+    part_1 = {
+        "position_applied_for": "Data Engineer",
+        "basic_information": {"name": "Tan Ah Kow", "email": "N/A", "phone": ""},
+        "self_evaluation": "Builds pipelines.",
+        "skills_and_specialties": ["Python", "SQL"],
+    }
+    part_2 = {
+        "position_applied_for": "Senior Data Engineer",
+        "basic_information": {
+            "name": "Tan Ah Kow, PhD",
+            "email": "tan@example.com",
+            "location": "Not specified",
+        },
+        "self_evaluation": "Mentors juniors.",
+        "skills_and_specialties": ["SQL", "Spark"],
+    }
+
+    merged = json.loads(
+        merge_json_outputs([json.dumps(part_1), f"```json\n{json.dumps(part_2)}\n```"])
+    )
+
+    assert merged["position_applied_for"] == "Senior Data Engineer"
+    assert merged["basic_information"] == {
+        "name": "Tan Ah Kow, PhD",
+        "email": "tan@example.com",
+        "phone": "",
+        "location": "Not specified",
+    }
+    assert merged["self_evaluation"] == "Builds pipelines. Mentors juniors."
+    assert merged["skills_and_specialties"] == ["Python", "SQL", "Spark"]
+
+
+def test_merge_does_not_join_differing_scalars():
+    merged = json.loads(
+        merge_json_outputs(
+            [
+                json.dumps({"basic_information": {"name": "Tan Ah Kow"}}),
+                json.dumps({"basic_information": {"name": "Lee Wei"}}),
+            ]
+        )
+    )
+
+    assert merged["basic_information"]["name"] == "Tan Ah Kow"
+
+
+def test_merge_falls_back_to_stitching_non_json():
+    assert merge_json_outputs(["{}", "not json"]) == "{}\n\nnot json"
+
+
+def test_part_note_is_agent_neutral():
+    note = RESUME_PART_NOTE.format(part=2, total=3)
+
+    assert "part 2 of 3" in note
+    assert "placeholder" not in note and "name" not in note